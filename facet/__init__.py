@@ -3,6 +3,7 @@
 
 # NOTE: These imports are for CLI script
 from .configuration import Configuration
+from . import metrics
 from .helpers import (
     get_obj_map_key,
     parse_address,
@@ -14,19 +15,28 @@ from .network import (
     SocketServerHandler,
 )
 from .factory import FacetFactory
+from .records import (
+    MatchRecord,
+    MatchTable,
+)
 from .facets import (
     Facet,
+    FederatedFacet,
     ParallelFacet,
     UMLSFacet,
 )
 from .formatter import (
     XMLFormatter,
+    XMLStreamFormatter,
     CSVFormatter,
+    CSVStreamFormatter,
     NullFormatter,
     YAMLFormatter,
     JSONFormatter,
+    JSONLinesFormatter,
     PickleFormatter,
     CloudpickleFormatter,
+    ColumnarFormatter,
 )
 from .tokenizer import (
     NullTokenizer,
@@ -38,12 +48,14 @@ from .tokenizer import (
 )
 from .database import (
     DictDatabase,
+    LatencyDictDatabase,
     RedisDatabase,
     RediSearchDatabase,
     RediSearchAutoCompleterDatabase,
     SQLiteDatabase,
     MongoDatabase,
     ElasticsearchDatabase,
+    PrefixDatabase,
 )
 from .serializer import (
     NullSerializer,
@@ -68,6 +80,11 @@ from .matcher.ngram import (
     WordNgram,
     CharacterNgram,
 )
+from .profiler import (
+    CProfileProfiler,
+    TracemallocProfiler,
+    SamplingProfiler,
+)
 from .matcher.similarity import (
     DiceSimilarity,
     ExactSimilarity,
@@ -1,5 +1,12 @@
-from .base import BaseDatabase
-from .dict import DictDatabase
+from .base import (
+    get_async_executor,
+    BaseDatabase,
+    BaseKVDatabase,
+)
+from .dict import (
+    DictDatabase,
+    LatencyDictDatabase,
+)
 from .redis import RedisDatabase
 from .redisearch import (
     RediSearchDatabase,
@@ -8,18 +15,21 @@ from .redisearch import (
 from .mongo import MongoDatabase
 from .sqlite import SQLiteDatabase
 from .elasticsearch import ElasticsearchDatabase
+from .prefix import PrefixDatabase
 from typing import Union
 
 
 database_map = {
     # 'DictDatabase' is a factory class
     DictDatabase.NAME: DictDatabase(),
+    LatencyDictDatabase.NAME: LatencyDictDatabase,
     RedisDatabase.NAME: RedisDatabase,
     RediSearchDatabase.NAME: RediSearchDatabase,
     RediSearchAutoCompleterDatabase.NAME: RediSearchAutoCompleterDatabase,
     MongoDatabase.NAME: MongoDatabase,
     SQLiteDatabase.NAME: SQLiteDatabase,
     ElasticsearchDatabase.NAME: ElasticsearchDatabase,
+    # NOTE: 'PrefixDatabase' is not listed because it requires a database.
 }
 
 
@@ -1,7 +1,15 @@
+import asyncio
+import functools
+import concurrent.futures
 from abc import (
     ABC,
     abstractmethod,
 )
+from typing import (
+    Any,
+    List,
+    Iterable,
+)
 
 
 __all__ = [
@@ -10,6 +18,23 @@ __all__ = [
 ]
 
 
+# Max number of threads for asynchronous requests of databases with
+# blocking clients.
+ASYNC_MAX_WORKERS = 32
+
+_async_executor = None
+
+
+def get_async_executor() -> 'concurrent.futures.ThreadPoolExecutor':
+    """Thread pool shared by databases for asynchronous requests."""
+    global _async_executor
+    if _async_executor is None:
+        _async_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=ASYNC_MAX_WORKERS,
+        )
+    return _async_executor
+
+
 class BaseDatabase(ABC):
     """Interface with basic database commands.
 
@@ -36,6 +61,11 @@ class BaseDatabase(ABC):
               repeatedly without triggering exceptions.
 
             * Close operation performs a commit, then disconnects.
+
+        * Asynchronous requests, 'aget()', run blocking requests in a
+          thread pool, so several requests can be in flight at once.
+          Derived classes with non-thread-safe connections or without
+          network latency should override it.
     """
 
     def __enter__(self):
@@ -56,6 +86,14 @@ class BaseDatabase(ABC):
     def commit(self):
         pass
 
+    async def aget(self, *args, **kwargs):
+        """Asynchronous version of 'get()'."""
+        # NOTE: 'get_running_loop()' requires Python 3.7
+        return await asyncio.get_event_loop().run_in_executor(
+            get_async_executor(),
+            functools.partial(self.get, *args, **kwargs),
+        )
+
     @property
     @abstractmethod
     def backend(self):
@@ -115,6 +153,12 @@ class BaseKVDatabase(BaseDatabase):
         # NOTE: Derived databases might have direct methods to key/values.
         return (self.get(k) for k in self.keys())
 
+    def mget(self, keys: Iterable[Any]) -> List[Any]:
+        """Get values of multiple keys, None for missing keys."""
+        # NOTE: Derived databases might have direct methods to get multiple
+        # keys in a single round trip.
+        return [self.get(k) for k in keys]
+
     def update(self, data):
         if hasattr(data, 'keys'):
             for k in data.keys():
@@ -1,7 +1,10 @@
 import os
 import sys
+import time
 import shelve
 import pickle
+import asyncio
+import threading
 from .base import BaseKVDatabase
 from ..helpers import expand_envvars
 
@@ -9,6 +12,7 @@ from ..helpers import expand_envvars
 __all__ = [
     'FileDictDatabase',
     'MemoryDictDatabase',
+    'LatencyDictDatabase',
     'DictDatabase',
 ]
 
@@ -118,6 +122,9 @@ class FileDictDatabase(BaseKVDatabase):
     def get(self, key):
         return self._conn.get(key)
 
+    async def aget(self, key):
+        return self.get(key)
+
     def set(self, key, value):
         self._conn[key] = value
 
@@ -196,6 +203,9 @@ class MemoryDictDatabase(BaseKVDatabase):
     def get(self, key):
         return self._conn.get(key)
 
+    async def aget(self, key):
+        return self.get(key)
+
     def set(self, key, value):
         self._conn[key] = value
 
@@ -220,6 +230,62 @@ class MemoryDictDatabase(BaseKVDatabase):
         return self._conn is not None
 
 
+class LatencyDictDatabase(MemoryDictDatabase):
+    """In-memory key/value database with a simulated round trip latency
+    for 'get()' requests.
+
+    Stand-in for remote databases, useful for testing concurrent
+    requests without a server.
+
+    Args:
+        latency (float): Seconds per request.
+
+    Kwargs: Options forwarded to 'MemoryDictDatabase()'.
+
+    Notes:
+        * Peak number of concurrent requests is tracked in
+          'max_in_flight', see `reset_in_flight()`.
+    """
+
+    NAME = 'latency'
+
+    def __init__(self, latency: float = 0.001, **kwargs):
+        self.latency = latency
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def reset_in_flight(self):
+        with self._in_flight_lock:
+            self.max_in_flight = 0
+
+    def _begin_request(self):
+        with self._in_flight_lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def _end_request(self):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def get(self, key):
+        self._begin_request()
+        try:
+            time.sleep(self.latency)
+        finally:
+            self._end_request()
+        return super().get(key)
+
+    async def aget(self, key):
+        self._begin_request()
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self._end_request()
+        return super().get(key)
+
+
 class DictDatabase:
     """Factory class for dictionary-based database."""
 
@@ -8,6 +8,7 @@ from elasticsearch.helpers import (
     parallel_bulk,
     streaming_bulk,
 )
+from .. import metrics
 from .base import BaseDatabase
 from ..helpers import expand_envvars
 from typing import (
@@ -291,6 +292,7 @@ class ElasticsearchDatabase(BaseDatabase):
         """
         if self._use_pipeline and key is not None and key in self._pipeline:
             return self._pipeline[key]
+        metrics.incr('database.elasticsearch.round_trips')
         return self._conn.search(index=self._index, body=query, **kwargs)
 
     def set(self, document: Dict[str, Any], *, key=None, **kwargs):
@@ -302,6 +304,7 @@ class ElasticsearchDatabase(BaseDatabase):
         if self._use_pipeline and key is not None:
             self._pipeline[key] = document
         else:
+            metrics.incr('database.elasticsearch.round_trips')
             self._conn.index(index=self._index, body=document, **kwargs)
 
     def scan(self, **kwargs):
@@ -354,6 +357,7 @@ class ElasticsearchDatabase(BaseDatabase):
         if not self.ping():
             return
         if self._use_pipeline and self._pipeline:
+            metrics.incr('database.elasticsearch.round_trips')
             # NOTE: deque consumes streaming/parallel bulk generators
             # and discards its results.
             collections.deque(
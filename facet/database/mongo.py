@@ -1,6 +1,7 @@
 import sys
 import time
 import pymongo
+from .. import metrics
 from .base import BaseDatabase
 from ..helpers import (
     parse_address,
@@ -172,6 +173,7 @@ class MongoDatabase(BaseDatabase):
         """
         if self._use_pipeline and key is not None and key in self._pipeline:
             return self._pipeline[key]
+        metrics.incr('database.mongo.round_trips')
         return self._collection.find(query, **kwargs)
 
     def set(self, document: Dict[str, Any], *, key=None, **kwargs):
@@ -183,6 +185,7 @@ class MongoDatabase(BaseDatabase):
         if self._use_pipeline and key is not None:
             self._pipeline[key] = document
         else:
+            metrics.incr('database.mongo.round_trips')
             self._collection.insert_one(document, **kwargs)
 
     def delete(self, document, **kwargs):
@@ -218,6 +221,7 @@ class MongoDatabase(BaseDatabase):
         if not self.ping():
             return
         if self._use_pipeline and self._pipeline:
+            metrics.incr('database.mongo.round_trips')
             self._collection.insert_many(
                 self._pipeline.values(),
                 ordered=False,
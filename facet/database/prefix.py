@@ -0,0 +1,92 @@
+from .base import BaseKVDatabase
+
+
+__all__ = ['PrefixDatabase']
+
+
+class PrefixDatabase(BaseKVDatabase):
+    """View of the keys with a common prefix of a key/value database.
+
+    Args:
+        db (BaseKVDatabase): Database where items are stored.
+
+        prefix (str): Prefix prepended to keys.
+
+    Notes:
+        * Several views can share a database, so that independent
+          key spaces (e.g., matcher partitions) are stored together.
+
+        * Connection is owned by the underlying database, so disconnects
+          and close operations only commit data.
+
+        * Getting the length or keys of the view scans all the keys of
+          the underlying database.
+    """
+
+    NAME = 'prefix'
+
+    def __init__(self, db: 'BaseKVDatabase', *, prefix: str):
+        self._db = db
+        self._prefix = prefix
+
+    def __len__(self):
+        return sum(1 for _ in self.keys())
+
+    def __contains__(self, key):
+        return self._prefix + key in self._db
+
+    @property
+    def backend(self):
+        return self._db.backend
+
+    @property
+    def db(self):
+        return self._db
+
+    @property
+    def prefix(self):
+        return self._prefix
+
+    def configuration(self):
+        return {
+            'prefix': self._prefix,
+            'db': self._db.configuration(),
+        }
+
+    def get(self, key):
+        return self._db.get(self._prefix + key)
+
+    async def aget(self, key):
+        return await self._db.aget(self._prefix + key)
+
+    def mget(self, keys):
+        return self._db.mget([self._prefix + key for key in keys])
+
+    def set(self, key, value):
+        self._db.set(self._prefix + key, value)
+
+    def keys(self):
+        return [
+            key[len(self._prefix):]
+            for key in self._db.keys()
+            if key.startswith(self._prefix)
+        ]
+
+    def delete(self, key):
+        self._db.delete(self._prefix + key)
+
+    def commit(self):
+        self._db.commit()
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def clear(self):
+        for key in self.keys():
+            self.delete(key)
+
+    def ping(self):
+        return self._db.ping()
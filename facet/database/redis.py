@@ -1,6 +1,7 @@
 import sys
 import time
 import redis
+from .. import metrics
 from .base import BaseKVDatabase
 from ..serializer import (
     get_serializer,
@@ -10,7 +11,12 @@ from ..helpers import (
     parse_address,
     expand_envvars,
 )
-from typing import Union
+from typing import (
+    Any,
+    List,
+    Union,
+    Iterable,
+)
 
 
 __all__ = ['RedisDatabase']
@@ -148,12 +154,34 @@ class RedisDatabase(BaseKVDatabase):
     def get(self, key):
         if self._use_pipeline and key in self._pipeline:
             return self._pipeline[key]
+        metrics.incr('database.redis.round_trips')
         value = self._conn.get(key)
         return value if value is None else self._serializer.loads(value)
 
+    def mget(self, keys: Iterable[Any]) -> List[Any]:
+        """Get values of multiple keys, None for missing keys."""
+        keys = list(keys)
+        if self._use_pipeline:
+            query_keys = [key for key in keys if key not in self._pipeline]
+        else:
+            query_keys = keys
+        values = {}
+        if query_keys:
+            metrics.incr('database.redis.round_trips')
+            values.update(zip(query_keys, self._conn.mget(query_keys)))
+            for key, value in values.items():
+                if value is not None:
+                    values[key] = self._serializer.loads(value)
+        return [
+            values[key] if key in values else self._pipeline[key]
+            for key in keys
+        ]
+
     def set(self, key, value):
         if self._use_pipeline:
             self._pipeline[key] = value
+        else:
+            metrics.incr('database.redis.round_trips')
         self._conn_pipe.set(key, self._serializer.dumps(value))
 
     def keys(self):
@@ -200,6 +228,7 @@ class RedisDatabase(BaseKVDatabase):
         if not self.ping():
             return
         if self._use_pipeline and self._pipeline:
+            metrics.incr('database.redis.round_trips')
             self._conn_pipe.execute()
             self._pipeline = {}
 
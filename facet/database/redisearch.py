@@ -2,6 +2,7 @@ import sys
 import time
 import redis
 import redisearch
+from .. import metrics
 from .base import BaseDatabase
 from ..helpers import (
     parse_address,
@@ -176,6 +177,7 @@ class RediSearchDatabase(BaseDatabase):
               error: unpaired/empty brackets/quotes, paired quotes with less
               than 3 characters, and possibly others.
         """
+        metrics.incr('database.redisearch.round_trips')
         return self._conn.search(query, **kwargs)
 
     def set(self, id, document: Dict[str, Any], **kwargs):
@@ -221,6 +223,7 @@ class RediSearchDatabase(BaseDatabase):
 
     def commit(self):
         if self.ping() and self._use_pipeline:
+            metrics.incr('database.redisearch.round_trips')
             self._conn_pipe.commit()
 
     def disconnect(self):
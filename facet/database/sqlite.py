@@ -1,6 +1,7 @@
 import os
 import sqlite3
 import urllib.parse
+from .. import metrics
 from .base import BaseKVDatabase
 from ..serializer import (
     get_serializer,
@@ -13,6 +14,7 @@ from ..helpers import (
 )
 from typing import (
     Any,
+    List,
     Tuple,
     Union,
     Iterator,
@@ -248,6 +250,7 @@ class SQLiteDatabase(BaseKVDatabase):
     def get(self, key):
         if self._use_pipeline and key in self._pipeline:
             return self._pipeline[key]
+        metrics.incr('database.sqlite.round_trips')
         cur = self._conn.execute(
             f"SELECT value FROM {self._table} "
             "WHERE key=(?);", (key,)
@@ -255,10 +258,45 @@ class SQLiteDatabase(BaseKVDatabase):
         value = cur.fetchone()
         return value if value is None else self._serializer.loads(value[0])
 
+    async def aget(self, key):
+        # NOTE: SQLite connections cannot be shared across threads and
+        # requests are local, so they run in the event loop.
+        return self.get(key)
+
+    def mget(self, keys: Iterable[Any], *, bulk_size: int = 500) -> List[Any]:
+        """Get values of multiple keys, None for missing keys.
+
+        Args:
+            bulk_size (int): Max number of keys per query, SQLite limits the
+                number of parameters of a statement.
+        """
+        keys = list(keys)
+        values = {}
+        if self._use_pipeline:
+            values.update(
+                (key, self._pipeline[key])
+                for key in keys
+                if key in self._pipeline
+            )
+        query_keys = list({key for key in keys if key not in values})
+        for i in range(0, len(query_keys), bulk_size):
+            bulk_keys = query_keys[i:i + bulk_size]
+            metrics.incr('database.sqlite.round_trips')
+            cur = self._conn.execute(
+                f"SELECT key, value FROM {self._table} "
+                f"WHERE key IN ({', '.join('?' * len(bulk_keys))});",
+                bulk_keys,
+            )
+            values.update(
+                (key, self._serializer.loads(value)) for key, value in cur
+            )
+        return [values.get(key) for key in keys]
+
     def set(self, key, value):
         if self._use_pipeline:
             self._pipeline[key] = value
         else:
+            metrics.incr('database.sqlite.round_trips')
             _value = self._serializer.dumps(value)
             self._conn.execute(
                 f"INSERT INTO {self._table}(key, value) VALUES (?, ?) "
@@ -322,6 +360,7 @@ class SQLiteDatabase(BaseKVDatabase):
         if not self.ping():
             return
         if self._use_pipeline and self._pipeline:
+            metrics.incr('database.sqlite.round_trips')
             self.bulk_set(self._pipeline)
             self._pipeline = {}
         if self._conn.in_transaction:
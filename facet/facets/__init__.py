@@ -1,5 +1,9 @@
-from .base import BaseFacet
+from .base import (
+    BaseFacet,
+    MatchManifest,
+)
 from .facet import Facet
+from .federated import FederatedFacet
 from .parallel import ParallelFacet
 from .umls import UMLSFacet
 from typing import Union
@@ -7,6 +11,7 @@ from typing import Union
 
 facet_map = {
     Facet.NAME: Facet,
+    FederatedFacet.NAME: FederatedFacet,
     ParallelFacet.NAME: ParallelFacet,
     UMLSFacet.NAME: UMLSFacet,
     None: Facet,
@@ -1,29 +1,52 @@
+import os
+import json
 import time
+import asyncio
+import hashlib
+import functools
+import threading
+import contextlib
 import collections
 from abc import (
     ABC,
     abstractmethod,
 )
 from unidecode import unidecode
+from .. import metrics
+from ..pipeline import Pipeline
+from ..records import (
+    MatchRecord,
+    json_default,
+)
 from ..helpers import (
+    peak_memory,
+    is_iterable,
     corpus_generator,
     expand_envvars,
 )
 from ..matcher import (
     get_matcher,
     BaseMatcher,
+    BaseSimstring,
 )
 from ..tokenizer import (
     get_tokenizer,
+    get_normalizer,
     BaseTokenizer,
 )
 from ..formatter import (
     get_formatter,
     BaseFormatter,
+    BaseStreamFormatter,
 )
 from ..database import (
     get_database,
     BaseDatabase,
+    BaseKVDatabase,
+)
+from ..profiler import (
+    get_profiler,
+    BaseProfiler,
 )
 from typing import (
     Any,
@@ -32,19 +55,19 @@ from typing import (
     Tuple,
     Union,
     Iterable,
+    Iterator,
+    AsyncIterator,
 )
 
 
-__all__ = ['BaseFacet']
+__all__ = [
+    'BaseFacet',
+    'MatchManifest',
+]
 
 
 VERBOSE = True
 
-# Enable/disable profiling
-PROFILE = False
-if PROFILE:
-    import cProfile
-
 
 strcase_map = {
     'l': str.lower,
@@ -55,10 +78,247 @@ strcase_map = {
 }
 
 
+# Key in matcher's database for the max number of tokens of installed terms.
+MAX_TERM_TOKENS_KEY = '__MAX_TERM_TOKENS__'
+
+
+# Key in key/value databases for install checkpoints.
+CHECKPOINT_KEY = '__INSTALL_CHECKPOINT__'
+
+
+# Key in matcher's database for the version of installed data.
+INDEX_VERSION_KEY = '__INDEX_VERSION__'
+
+
 def create_proxy_db():
     return get_database('dict')
 
 
+class InstallCheckpoint:
+    """Progress of an install, stored in a key/value database or in a
+    sidecar JSON file.
+
+    Progress is the number of records committed by each dump stage,
+    stages are identified by their order of invocation during install.
+
+    Args:
+        filename (str): File with data to install. Checkpoints of other
+            files are ignored.
+
+        store (str, BaseKVDatabase): Sidecar filename or database.
+
+        resume (bool): If set, progress is loaded from an existing
+            checkpoint.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        store: Union[str, 'BaseKVDatabase'],
+        *,
+        resume: bool = True,
+    ):
+        self._filename = filename
+        self._store = store
+        self._stages = {}
+        self._stage = None
+        self._num_stages = 0
+
+        if resume:
+            state = self._load()
+            if state is not None and state.get('filename') == filename:
+                self._stages = state['stages']
+
+    @property
+    def stages(self) -> Dict[str, int]:
+        return dict(self._stages)
+
+    def next_stage(self, name: str) -> int:
+        """Start next stage, returns number of records already committed."""
+        self._stage = f'{self._num_stages}:{name}'
+        self._num_stages += 1
+        return self._stages.get(self._stage, 0)
+
+    def save(self, num_records: int):
+        """Stores number of records committed by current stage."""
+        self._stages[self._stage] = num_records
+        state = {'filename': self._filename, 'stages': self._stages}
+        if isinstance(self._store, BaseKVDatabase):
+            self._store.set(CHECKPOINT_KEY, state)
+            self._store.commit()
+        else:
+            # NOTE: Replace file atomically so that checkpoint is not
+            # corrupted if process dies while writing.
+            tmp_filename = self._store + '.tmp'
+            with open(tmp_filename, 'w') as fd:
+                json.dump(state, fd)
+            os.replace(tmp_filename, self._store)
+
+    def clear(self):
+        self._stages = {}
+        if isinstance(self._store, BaseKVDatabase):
+            if CHECKPOINT_KEY in self._store:
+                self._store.delete(CHECKPOINT_KEY)
+                self._store.commit()
+        elif os.path.exists(self._store):
+            os.remove(self._store)
+
+    def _load(self) -> Union[Dict[str, Any], None]:
+        if isinstance(self._store, BaseKVDatabase):
+            return self._store.get(CHECKPOINT_KEY)
+        if os.path.exists(self._store):
+            with open(self._store) as fd:
+                return json.load(fd)
+
+
+class MatchManifest:
+    """Record of matched documents for incremental matching, stored in a
+    sidecar JSON file.
+
+    Documents are identified by their source and content hash, and their
+    matches are stored so that unchanged documents are not matched again.
+    For files, size and modification time are checked first to avoid
+    hashing their content.
+
+    Args:
+        filename (str): Manifest filename.
+
+        fingerprint (str): Version of installed data and configuration.
+            Documents of a manifest with a different fingerprint are
+            discarded.
+
+    Notes:
+        * Documents not seen since the manifest was loaded are removed
+          when it is saved.
+    """
+
+    def __init__(self, filename: str, *, fingerprint: str = None):
+        self._filename = expand_envvars(filename)
+        self._fingerprint = fingerprint
+        self._documents = {}
+        self._seen = set()
+        # Content hashes computed by lookup, reused by update
+        self._hashes = {}
+
+        state = self._load()
+        if state is not None and state.get('fingerprint') == fingerprint:
+            self._documents = state['documents']
+            # NOTE: Matches are loaded as dictionaries.
+            for document in self._documents.values():
+                document['matches'] = [
+                    [
+                        list(map(MatchRecord.from_mapping, ngram_matches))
+                        for ngram_matches in matches
+                    ]
+                    for matches in document['matches']
+                ]
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def fingerprint(self):
+        return self._fingerprint
+
+    def __len__(self):
+        return len(self._documents)
+
+    def lookup(
+        self,
+        source: str,
+        *,
+        filename: str = None,
+        text: str = None,
+    ) -> Union[List[List[List[Dict[str, Any]]]], None]:
+        """Get stored matches of an unchanged document, else None.
+
+        Args:
+            source (str): Document identifier.
+
+            filename (str): Document file, for files read by the matcher.
+
+            text (str): Document content, for other documents.
+        """
+        self._seen.add(source)
+        document = self._documents.get(source)
+        if document is None:
+            return None
+
+        if filename is not None:
+            stat = os.stat(filename)
+            if (
+                document['size'] == stat.st_size
+                and document['mtime'] == stat.st_mtime_ns
+            ):
+                return document['matches']
+            if document['size'] != stat.st_size:
+                return None
+
+        digest = type(self)._hash(filename=filename, text=text)
+        if document['hash'] != digest:
+            self._hashes[source] = digest
+            return None
+
+        # NOTE: Content did not change, only its modification time.
+        if filename is not None:
+            document['mtime'] = stat.st_mtime_ns
+        return document['matches']
+
+    def update(
+        self,
+        source: str,
+        matches: List[List[List[Dict[str, Any]]]],
+        *,
+        filename: str = None,
+        text: str = None,
+    ):
+        """Stores matches of a document, see `lookup()`."""
+        self._seen.add(source)
+        digest = self._hashes.pop(source, None)
+        if digest is None:
+            digest = type(self)._hash(filename=filename, text=text)
+        document = {
+            'hash': digest,
+            'matches': matches,
+        }
+        if filename is not None:
+            stat = os.stat(filename)
+            document['size'] = stat.st_size
+            document['mtime'] = stat.st_mtime_ns
+        self._documents[source] = document
+
+    def save(self):
+        documents = {
+            source: document
+            for source, document in self._documents.items()
+            if source in self._seen
+        }
+        state = {'fingerprint': self._fingerprint, 'documents': documents}
+        # NOTE: Replace file atomically so that manifest is not corrupted
+        # if process dies while writing.
+        tmp_filename = self._filename + '.tmp'
+        with open(tmp_filename, 'w') as fd:
+            json.dump(state, fd, default=json_default)
+        os.replace(tmp_filename, self._filename)
+
+    @staticmethod
+    def _hash(*, filename: str = None, text: str = None) -> str:
+        digest = hashlib.sha1()
+        if filename is not None:
+            with open(filename, 'rb') as fd:
+                for block in iter(lambda: fd.read(2**20), b''):
+                    digest.update(block)
+        else:
+            digest.update(text.encode())
+        return digest.hexdigest()
+
+    def _load(self) -> Union[Dict[str, Any], None]:
+        if os.path.exists(self._filename):
+            with open(self._filename) as fd:
+                return json.load(fd)
+
+
 class BaseFacet(ABC):
     """Class supporting FACET installers and matchers.
 
@@ -74,6 +334,24 @@ class BaseFacet(ABC):
 
         use_proxy_install (bool): If set, an in-memory database will be used
             for installation, then data will be dumped into selected databases.
+
+        profile (str, BaseProfiler): Profiler instance or profiler name.
+            Valid profilers are: 'cprofile', 'tracemalloc', 'sampling'.
+
+        sentence_cache_size (int): Max number of sentence matches kept in
+            memory for repeated sentences. If 0, sentences are not cached
+            in memory.
+
+        sentence_cache_db (str, BaseKVDatabase): Handle to database instance
+            or database name for sharing sentence matches, checked after
+            the in-memory cache.
+
+    Notes:
+        * Sentence matches are cached by a hash of the normalized sentence
+          and the matcher/tokenizer configuration and match options, with
+          spans relative to the sentence. Sentence cache database is not
+          cleared by installs, but keys include the version of installed
+          data for key/value matcher databases.
     """
 
     def __init__(
@@ -83,11 +361,21 @@ class BaseFacet(ABC):
         tokenizer: Union[str, 'BaseTokenizer'] = 'alphanumeric',
         formatter: Union[str, 'BaseFormatter'] = None,
         use_proxy_install: bool = False,
+        profile: Union[str, 'BaseProfiler'] = None,
+        sentence_cache_size: int = 0,
+        sentence_cache_db: Union[str, 'BaseKVDatabase'] = None,
     ):
         self._matcher = get_matcher(matcher)
         self._tokenizer = get_tokenizer(tokenizer)
         self._formatter = get_formatter(formatter)
         self._use_proxy_install = use_proxy_install
+        self._profiler = get_profiler(profile)
+        self._checkpoint = None
+        self._sentence_cache_size = sentence_cache_size
+        self._sentence_cache_db = get_database(sentence_cache_db)
+        self._sentence_cache = collections.OrderedDict()
+        self._sentence_cache_stats = {'hits': 0, 'misses': 0}
+        self._sentence_cache_lock = threading.Lock()
 
     @property
     def matcher(self):
@@ -101,18 +389,48 @@ class BaseFacet(ABC):
     def formatter(self):
         return self._formatter
 
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @property
+    def sentence_cache_db(self):
+        return self._sentence_cache_db
+
+    def sentence_cache_info(self) -> Dict[str, int]:
+        """Hit statistics of sentence cache."""
+        return {
+            **self._sentence_cache_stats,
+            'size': len(self._sentence_cache),
+            'max_size': self._sentence_cache_size,
+        }
+
+    def clear_caches(self):
+        """Clear in-memory caches of matches."""
+        self._sentence_cache.clear()
+        self._sentence_cache_stats = {'hits': 0, 'misses': 0}
+
+    @property
+    def index_version(self) -> Union[str, None]:
+        """Version of installed data, None if unknown."""
+        if isinstance(self._matcher.db, BaseKVDatabase):
+            return self._matcher.db.get(INDEX_VERSION_KEY)
+
+    @property
+    def max_term_tokens(self) -> Union[int, None]:
+        """Max number of tokens of installed terms, None if unknown."""
+        if isinstance(self._matcher.db, BaseKVDatabase):
+            return self._matcher.db.get(MAX_TERM_TOKENS_KEY)
+
     def match(
         self,
         corpora: Union[str, Iterable[str]],
         *,
-        case: str = 'l',
-        normalize_unicode: bool = False,
         # NOTE: The following default values are based on the corresponding
         # function/method call using them.
         formatter: str = '',
-        tokenizer: str = '',
         output: str = None,
-        corpus_kwargs: Dict[str, Any] = None,
+        profile: Union[str, 'BaseProfiler'] = '',
         **kwargs,
     ) -> Dict[str, List[List[Dict[str, Any]]]]:
         """Match queries from corpora.
@@ -120,21 +438,15 @@ class BaseFacet(ABC):
         Args:
             corpora (Union[str, Iterable[str]]): Corpora items.
 
-            case (str, None): Controls string casing during insert/search.
-
-            normalize_unicode (bool): Enable Unicode normalization.
-
             formatter (str): Formatter name.
 
-            tokenizer (str): Tokenizer name.
-
             output (str): Output file for match results.
 
-            corpus_kwargs (Dict[str, Any]): Options passed directly to
-                `corpus_generator`.
+            profile (str, BaseProfiler): Profiler instance or profiler name.
+                If None, profiling is disabled for this call.
 
         Kwargs:
-            Options forwarded to `Matcher.search` via `_match`.
+            Options forwarded to `imatch()`.
 
         Examples:
 
@@ -154,70 +466,1290 @@ class BaseFacet(ABC):
             else get_formatter(formatter)
         )
 
+        with self._profile('match', profile):
+            t1 = time.time()
+            # NOTE: Stream formatters consume matches as they are generated.
+            if isinstance(formatter, BaseStreamFormatter):
+                formatted_matches = formatter(
+                    self.imatch(corpora, **kwargs),
+                    output=output,
+                )
+            else:
+                matches = collections.defaultdict(list)
+                for source, corpus_matches in self.imatch(corpora, **kwargs):
+                    # NOTE: Matches are not checked for duplication if placed
+                    # in the same key.
+                    if len(corpus_matches) > 0:
+                        matches[source].extend(corpus_matches)
+                formatted_matches = formatter(matches, output=output)
+            t2 = time.time()
+            metrics.observe('facet.match', t2 - t1)
+
+        return formatted_matches
+
+    async def amatch(
+        self,
+        corpora: Union[str, Iterable[str]],
+        *,
+        formatter: str = '',
+        output: str = None,
+        **kwargs,
+    ) -> Dict[str, List[List[Dict[str, Any]]]]:
+        """Asynchronous version of `match()`.
+
+        Kwargs:
+            Options forwarded to `aimatch()`.
+
+        Examples:
+
+        >>> matches = asyncio.run(Facet().amatch(['file1.txt', ...]))
+        """
+        formatter = (
+            self._formatter
+            if formatter == ''
+            else get_formatter(formatter)
+        )
+
+        t1 = time.time()
+        corpora_matches = [
+            source_matches
+            async for source_matches in self.aimatch(corpora, **kwargs)
+        ]
+        if isinstance(formatter, BaseStreamFormatter):
+            formatted_matches = formatter(
+                iter(corpora_matches),
+                output=output,
+            )
+        else:
+            matches = collections.defaultdict(list)
+            for source, corpus_matches in corpora_matches:
+                if len(corpus_matches) > 0:
+                    matches[source].extend(corpus_matches)
+            formatted_matches = formatter(matches, output=output)
+        t2 = time.time()
+        metrics.observe('facet.match', t2 - t1)
+
+        return formatted_matches
+
+    def imatch(
+        self,
+        corpora: Union[str, Iterable[str]],
+        *,
+        case: str = 'l',
+        normalize_unicode: bool = False,
+        by_sentence: bool = False,
+        window: Union[int, str] = None,
+        overlap: str = None,
+        memoize_searches: bool = True,
+        manifest: Union[str, 'MatchManifest'] = None,
+        pipeline: Dict[str, int] = None,
+        # NOTE: The following default values are based on the corresponding
+        # function/method call using them.
+        tokenizer: str = '',
+        corpus_kwargs: Dict[str, Any] = None,
+        **kwargs,
+    ) -> Iterator[Tuple[str, List[List[Dict[str, Any]]]]]:
+        """Generator of matches from corpora.
+
+        Matches are yielded as soon as a corpus (or sentence) is processed,
+        so only the matches of a single item are kept in memory.
+
+        Args:
+            corpora (Union[str, Iterable[str]]): Corpora items.
+
+            case (str, None): Controls string casing during insert/search.
+
+            normalize_unicode (bool): Enable Unicode normalization.
+
+            by_sentence (bool): If set, yield matches per sentence instead
+                of per corpus. Only sentences with matches are yielded.
+                Matches of a corpus read in chunks are yielded once all of
+                its chunks are processed, unless this option is set.
+
+            window (int, str): Max number of tokens per span. If 'auto',
+                the max number of tokens of installed terms is used. If None,
+                the tokenizer's window is used.
+
+            overlap (str): Resolution of overlapping matches within a
+                sentence. Valid values are: None = all matches are kept,
+                'longest' = spans are searched from longest to shortest and
+                spans overlapping a match are skipped, 'best' = matches with
+                highest similarity are kept (ties favor longer spans) and
+                spans overlapping an exact match are skipped.
+
+            memoize_searches (bool): If set, identical N-grams of a corpus
+                are searched once and their results are reused for every
+                span. Memoized results are discarded after each corpus.
+
+            manifest (str, MatchManifest): Manifest instance or filename
+                for incremental matching. Matches of corpora that did not
+                change since the manifest was saved are reused. Manifest is
+                invalidated if installed data or match options change.
+                Texts are identified by their position among texts.
+
+            pipeline (Dict[str, int]): If set, sentences are processed by a
+                pipeline of stages running concurrently, 'tokenize',
+                'search', and 'lookup' (matches and concept data), with the
+                given number of workers per stage (default is 1), and
+                'queue_size' for max number of sentences waiting per stage
+                (default is 64). Formatting of results overlaps with these
+                stages. See `_iter_pipeline_sentence_matches()`.
+
+            tokenizer (str): Tokenizer name.
+
+            corpus_kwargs (Dict[str, Any]): Options passed directly to
+                `corpus_generator`. Set 'chunk_size' to read large files
+                in chunks, span offsets remain relative to the corpus.
+
+        Kwargs:
+            Options forwarded to `Matcher.search` via `_match`.
+
+        Returns (Tuple[str, List[List[Dict[str, Any]]]]): Corpus source and
+            its matches grouped by N-gram. Every corpus is yielded, even if
+            it does not have matches.
+
+        Examples:
+
+        >>> for source, matches in Facet().imatch(['file1.txt', ...]):
+        >>>     for terms in matches:
+        >>>         for term in terms:
+        >>>             print(source, term)
+        """
+        if manifest is not None:
+            yield from self._imatch_incremental(
+                corpora,
+                manifest=manifest,
+                case=case,
+                normalize_unicode=normalize_unicode,
+                by_sentence=by_sentence,
+                window=window,
+                overlap=overlap,
+                memoize_searches=memoize_searches,
+                pipeline=pipeline,
+                tokenizer=tokenizer,
+                corpus_kwargs=corpus_kwargs,
+                **kwargs,
+            )
+            return
+
+        tokenizer, window, feature_bounds = self._match_params(
+            tokenizer=tokenizer,
+            window=window,
+            **kwargs,
+        )
+        cache_scope = self._sentence_cache_scope(
+            tokenizer=tokenizer,
+            window=window,
+            overlap=overlap,
+            **kwargs,
+        )
+
+        match_kwargs = {
+            'tokenizer': tokenizer,
+            'window': window,
+            'feature_bounds': feature_bounds,
+            'overlap': overlap,
+            'cache_scope': cache_scope,
+            'memoize_searches': memoize_searches,
+            'case': case,
+            'normalize_unicode': normalize_unicode,
+            'corpus_kwargs': corpus_kwargs,
+            **kwargs,
+        }
+        sentence_matches_items = (
+            self._iter_sentence_matches(corpora, **match_kwargs)
+            if pipeline is None
+            else self._iter_pipeline_sentence_matches(
+                corpora,
+                pipeline=pipeline,
+                **match_kwargs,
+            )
+        )
+
+        source = None
+        corpus_matches = None
+        for _source, sentence_matches in sentence_matches_items:
+            if sentence_matches is None:
+                if not by_sentence and corpus_matches is not None:
+                    yield source, corpus_matches
+                source = _source
+                corpus_matches = []
+                continue
+
+            if by_sentence:
+                if len(sentence_matches) > 0:
+                    yield source, sentence_matches
+            else:
+                corpus_matches.extend(sentence_matches)
+
+        if not by_sentence and corpus_matches is not None:
+            yield source, corpus_matches
+
+    async def aimatch(
+        self,
+        corpora: Union[str, Iterable[str]],
+        *,
+        case: str = 'l',
+        normalize_unicode: bool = False,
+        by_sentence: bool = False,
+        window: Union[int, str] = None,
+        overlap: str = None,
+        memoize_searches: bool = True,
+        tokenizer: str = '',
+        corpus_kwargs: Dict[str, Any] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[str, List[List[Dict[str, Any]]]]]:
+        """Asynchronous version of `imatch()`.
+
+        All N-grams of a sentence are searched concurrently using
+        `Matcher.asearch()`, see `_amatch_sentence()`.
+
+        Examples:
+
+        >>> async for source, matches in Facet().aimatch(['file1.txt']):
+        >>>     print(source, matches)
+        """
+        tokenizer, window, feature_bounds = self._match_params(
+            tokenizer=tokenizer,
+            window=window,
+            **kwargs,
+        )
+        cache_scope = self._sentence_cache_scope(
+            tokenizer=tokenizer,
+            window=window,
+            overlap=overlap,
+            **kwargs,
+        )
+
+        source = None
+        corpus_matches = None
+        searches = None
+        for _source, sentence, offset, offset_map in self._iter_sentences(
+            corpora,
+            tokenizer=tokenizer,
+            case=case,
+            normalize_unicode=normalize_unicode,
+            corpus_kwargs=corpus_kwargs,
+        ):
+            if sentence is None:
+                if not by_sentence and corpus_matches is not None:
+                    yield source, corpus_matches
+                source = _source
+                corpus_matches = []
+                searches = {} if memoize_searches else None
+                continue
+
+            sentence_matches = await self._amatch_cached_sentence(
+                sentence,
+                cache_scope=cache_scope,
+                tokenizer=tokenizer,
+                window=window,
+                feature_bounds=feature_bounds,
+                overlap=overlap,
+                offset=offset,
+                offset_map=offset_map,
+                searches=searches,
+                **kwargs,
+            )
+
+            if by_sentence:
+                if len(sentence_matches) > 0:
+                    yield source, sentence_matches
+            else:
+                corpus_matches.extend(sentence_matches)
+
+        if not by_sentence and corpus_matches is not None:
+            yield source, corpus_matches
+
+    def _iter_sentence_matches(
+        self,
+        corpora: Union[str, Iterable[str]],
+        *,
+        tokenizer: 'BaseTokenizer',
+        cache_scope: str = None,
+        memoize_searches: bool = True,
+        case: str = 'l',
+        normalize_unicode: bool = False,
+        corpus_kwargs: Dict[str, Any] = None,
+        **kwargs,
+    ) -> Iterator[Tuple[str, Union[List[List[Dict[str, Any]]], None]]]:
+        """Generator of matches of each sentence, see `imatch()`.
+
+        Returns (Tuple[str, List[List[Dict[str, Any]]]]): Corpus source and
+            matches of a sentence. Matches are None at the beginning of
+            each corpus.
+
+        Kwargs:
+            Options forwarded to `_match_cached_sentence()`.
+        """
+        searches = None
+        for source, sentence, offset, offset_map in self._iter_sentences(
+            corpora,
+            tokenizer=tokenizer,
+            case=case,
+            normalize_unicode=normalize_unicode,
+            corpus_kwargs=corpus_kwargs,
+        ):
+            if sentence is None:
+                searches = {} if memoize_searches else None
+                yield source, None
+                continue
+
+            yield source, self._match_cached_sentence(
+                sentence,
+                cache_scope=cache_scope,
+                tokenizer=tokenizer,
+                offset=offset,
+                offset_map=offset_map,
+                searches=searches,
+                **kwargs,
+            )
+
+    def _iter_pipeline_sentence_matches(
+        self,
+        corpora: Union[str, Iterable[str]],
+        *,
+        pipeline: Dict[str, int],
+        tokenizer: 'BaseTokenizer',
+        window: int = None,
+        feature_bounds: Tuple[int, int] = None,
+        overlap: str = None,
+        cache_scope: str = None,
+        memoize_searches: bool = True,
+        case: str = 'l',
+        normalize_unicode: bool = False,
+        corpus_kwargs: Dict[str, Any] = None,
+        **kwargs,
+    ) -> Iterator[Tuple[str, Union[List[List[Dict[str, Any]]], None]]]:
+        """Generator of matches of each sentence using a pipeline of
+        stages, see `_iter_sentence_matches()`.
+
+        Stages are:
+            * tokenize - N-grams of sentence, skipped for sentences in
+              sentence cache.
+            * search - searches of N-grams, see `_prefetch_searches()`.
+            * lookup - matches from searches and concept data, see
+              `_match_cached_sentence()`.
+
+        Args:
+            pipeline (Dict[str, int]): Number of workers per stage, and
+                'queue_size' for max number of sentences waiting per stage.
+
+        Kwargs:
+            Options passed directly to `Matcher.search()`.
+
+        Notes:
+            * Sentences are read by a separate thread, and results are
+              yielded in order.
+            * With overlap resolution, N-grams that would be skipped are
+              also searched.
+        """
+        def iter_items():
+            searches = None
+            for source, sentence, offset, offset_map in self._iter_sentences(
+                corpora,
+                tokenizer=tokenizer,
+                case=case,
+                normalize_unicode=normalize_unicode,
+                corpus_kwargs=corpus_kwargs,
+            ):
+                if sentence is None:
+                    searches = {} if memoize_searches else None
+                yield {
+                    'source': source,
+                    'sentence': sentence,
+                    'offset': offset,
+                    'offset_map': offset_map,
+                    'searches': searches,
+                    'ngram_structs': None,
+                    'matches': None,
+                }
+
+        stage_kwargs = {
+            'cache_scope': cache_scope,
+            'tokenizer': tokenizer,
+            'window': window,
+            'feature_bounds': feature_bounds,
+        }
+        pipeline = {**pipeline}
+        executor = Pipeline(
+            [
+                (
+                    'tokenize',
+                    functools.partial(self._pipeline_tokenize, **stage_kwargs),
+                    pipeline.pop('tokenize', 1),
+                ),
+                (
+                    'search',
+                    functools.partial(self._pipeline_search, **kwargs),
+                    pipeline.pop('search', 1),
+                ),
+                (
+                    'lookup',
+                    functools.partial(
+                        self._pipeline_lookup,
+                        overlap=overlap,
+                        **stage_kwargs,
+                        **kwargs,
+                    ),
+                    pipeline.pop('lookup', 1),
+                ),
+            ],
+            queue_size=pipeline.pop('queue_size', 64),
+        )
+        if len(pipeline) > 0:
+            raise ValueError(f'invalid pipeline stages, {list(pipeline)}')
+
+        for item in executor.run(iter_items()):
+            yield item['source'], item['matches']
+
+    def _pipeline_tokenize(
+        self,
+        item: Dict[str, Any],
+        *,
+        cache_scope: str = None,
+        tokenizer: 'BaseTokenizer',
+        window: int = None,
+        feature_bounds: Tuple[int, int] = None,
+    ) -> Dict[str, Any]:
+        """Tokenize stage, see `_iter_pipeline_sentence_matches()`."""
+        sentence = item['sentence']
+        if sentence is None:
+            return item
+        if cache_scope is not None and isinstance(sentence, tuple):
+            # NOTE: Sentence cache stores spans relative to sentence.
+            key = self._sentence_cache_key(sentence[2], cache_scope)
+            with self._sentence_cache_lock:
+                is_cached = key in self._sentence_cache
+            if is_cached:
+                return item
+            begin, end, text = sentence
+            ngram_structs = self._iter_ngrams(
+                (0, end - begin, text),
+                tokenizer=tokenizer,
+                window=window,
+                feature_bounds=feature_bounds,
+            )
+        else:
+            ngram_structs = self._iter_ngrams(
+                sentence,
+                tokenizer=tokenizer,
+                window=window,
+                feature_bounds=feature_bounds,
+                offset=item['offset'],
+                offset_map=item['offset_map'],
+            )
+        item['ngram_structs'] = list(ngram_structs)
+        if item['searches'] is None:
+            item['searches'] = {}
+        return item
+
+    def _pipeline_search(
+        self,
+        item: Dict[str, Any],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Search stage, see `_iter_pipeline_sentence_matches()`."""
+        if item['ngram_structs'] is not None:
+            self._prefetch_searches(
+                item['ngram_structs'],
+                searches=item['searches'],
+                **kwargs,
+            )
+        return item
+
+    def _pipeline_lookup(
+        self,
+        item: Dict[str, Any],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Lookup stage, see `_iter_pipeline_sentence_matches()`.
+
+        Kwargs:
+            Options forwarded to `_match_cached_sentence()`.
+        """
+        if item['sentence'] is None:
+            return item
+        # NOTE: Sentences without N-grams are matched as usual, e.g., if
+        # evicted from sentence cache after tokenize stage.
+        if item['ngram_structs'] is not None:
+            kwargs['ngram_structs'] = item['ngram_structs']
+        item['matches'] = self._match_cached_sentence(
+            item['sentence'],
+            offset=item['offset'],
+            offset_map=item['offset_map'],
+            searches=item['searches'],
+            **kwargs,
+        )
+        return item
+
+    def _prefetch_searches(
+        self,
+        ngram_structs: Iterable[Tuple[int, int, str]],
+        *,
+        searches: Dict[str, List[Tuple[str, float]]],
+        **kwargs,
+    ):
+        """Search N-grams not already in 'searches' and add their results.
+
+        Kwargs:
+            Options passed directly to `Matcher.search()`.
+        """
+        ngrams = [
+            ngram
+            for ngram in dict.fromkeys(ngram for _, _, ngram in ngram_structs)
+            if ngram not in searches
+        ]
+        metrics.incr('facet.searches', len(ngrams))
+        matcher, search_kwargs = self._search_matcher(**kwargs)
+        for ngram in ngrams:
+            searches[ngram] = matcher.search(ngram, **search_kwargs)
+
+    def _imatch_incremental(
+        self,
+        corpora: Union[str, Iterable[str]],
+        *,
+        manifest: Union[str, 'MatchManifest'],
+        corpus_kwargs: Dict[str, Any] = None,
+        **kwargs,
+    ) -> Iterator[Tuple[str, List[List[Dict[str, Any]]]]]:
+        """Generator of matches from corpora, reusing matches of corpora
+        recorded in a manifest, see `imatch()`.
+
+        Kwargs:
+            Options forwarded to `imatch()`.
+        """
+        if corpus_kwargs is None:
+            corpus_kwargs = {}
+        if not isinstance(manifest, MatchManifest):
+            tokenizer, window, _ = self._match_params(
+                tokenizer=kwargs.get('tokenizer', ''),
+                window=kwargs.get('window'),
+            )
+            # NOTE: Memoization of searches and pipelining do not change
+            # matches.
+            match_kwargs = {
+                k: v
+                for k, v in kwargs.items()
+                if k not in ('memoize_searches', 'pipeline')
+            }
+            manifest = MatchManifest(
+                manifest,
+                fingerprint=hashlib.sha1(self._match_config(
+                    **{
+                        **match_kwargs,
+                        'tokenizer': tokenizer,
+                        'window': window,
+                        'corpus_kwargs': corpus_kwargs,
+                    },
+                ).encode()).hexdigest(),
+            )
+
+        num_reused = 0
+        num_texts = 0
+        for corpus in corpus_generator(
+            corpora,
+            source_only=True,
+            **corpus_kwargs,
+        ):
+            # NOTE: Plain text files are not read if their size and
+            # modification time did not change.
+            if is_iterable(corpus):
+                source, text = corpus
+                filename = None
+                corpus = (corpus,)
+                key = source
+            elif (
+                not corpus_kwargs.get('phony', False)
+                and os.path.isfile(corpus)
+            ):
+                source = filename = corpus
+                text = None
+                key = source
+            else:
+                # NOTE: Texts share their source, so they are recorded by
+                # their position among texts.
+                source, text = '__text__', corpus
+                filename = None
+                key = f'{source}:{num_texts}'
+                num_texts += 1
+
+            source_matches = manifest.lookup(
+                key,
+                filename=filename,
+                text=text,
+            )
+            if source_matches is not None:
+                num_reused += 1
+            else:
+                source_matches = [
+                    matches
+                    for _, matches in self.imatch(
+                        corpus,
+                        corpus_kwargs=corpus_kwargs,
+                        **kwargs,
+                    )
+                ]
+                manifest.update(
+                    key,
+                    source_matches,
+                    filename=filename,
+                    text=text,
+                )
+
+            for matches in source_matches:
+                yield source, matches
+
+        manifest.save()
+        metrics.incr('facet.corpora_reused', num_reused)
+
+    def _match_params(
+        self,
+        *,
+        tokenizer: str = '',
+        window: Union[int, str] = None,
+        **kwargs,
+    ) -> Tuple['BaseTokenizer', int, Tuple[int, int]]:
+        """Resolves tokenizer, window, and feature bounds, see `imatch()`.
+
+        Kwargs:
+            Options forwarded to `Matcher.search`.
+        """
         tokenizer = (
             self._tokenizer
             if tokenizer == ''
             else get_tokenizer(tokenizer)
         )
 
-        casefunc = strcase_map[case]
+        if window == 'auto':
+            window = self.max_term_tokens
+
+        # NOTE: Spans with a number of features out of these bounds cannot
+        # meet the similarity threshold, so they are not searched.
+        feature_bounds = (
+            self._matcher.query_feature_bounds(
+                alpha=kwargs.get('alpha'),
+                similarity=kwargs.get('similarity'),
+            )
+            if isinstance(self._matcher, BaseSimstring)
+            else None
+        )
+        return tokenizer, window, feature_bounds
+
+    def _sentence_cache_scope(self, **kwargs) -> Union[str, None]:
+        """Configuration part of sentence cache keys, None if sentence
+        cache is disabled.
+
+        Kwargs:
+            Match options, see `_match_config()`.
+        """
+        if (
+            self._sentence_cache_size <= 0
+            and self._sentence_cache_db is None
+        ):
+            return None
+        return self._match_config(**kwargs)
+
+    def _match_config(
+        self,
+        *,
+        tokenizer: 'BaseTokenizer',
+        **kwargs,
+    ) -> str:
+        """Description of installed data, matcher/tokenizer configuration
+        and match options, that determine matches of a text.
+
+        Kwargs:
+            Match options, see `imatch()`.
+        """
+        matcher = self._matcher
+        return repr((
+            type(self).NAME,
+            self.index_version,
+            type(matcher).__name__,
+            getattr(matcher, 'alpha', None),
+            type(getattr(matcher, 'similarity', None)).__name__,
+            type(getattr(matcher, 'ngram', None)).__name__,
+            type(tokenizer).__name__,
+            tokenizer.window,
+            sorted(
+                (k, v if isinstance(v, (int, float, str)) else repr(v))
+                for k, v in kwargs.items()
+            ),
+        ))
+
+    def _sentence_cache_key(self, sentence: str, cache_scope: str) -> str:
+        return hashlib.sha1(
+            (cache_scope + '\0' + sentence).encode()
+        ).hexdigest()
+
+    def _sentence_cache_get(
+        self,
+        key: str,
+    ) -> Union[List[List[Dict[str, Any]]], None]:
+        """Get sentence matches from in-memory cache or database."""
+        with self._sentence_cache_lock:
+            sentence_matches = self._sentence_cache.get(key)
+            if sentence_matches is not None:
+                self._sentence_cache.move_to_end(key)
+        if sentence_matches is None and self._sentence_cache_db is not None:
+            sentence_matches = self._sentence_cache_db.get(key)
+            if sentence_matches is not None:
+                self._sentence_cache_put(key, sentence_matches)
+
+        with self._sentence_cache_lock:
+            if sentence_matches is None:
+                self._sentence_cache_stats['misses'] += 1
+            else:
+                self._sentence_cache_stats['hits'] += 1
+        if sentence_matches is None:
+            metrics.incr('facet.sentence_cache.misses')
+        else:
+            metrics.incr('facet.sentence_cache.hits')
+        return sentence_matches
+
+    def _sentence_cache_put(
+        self,
+        key: str,
+        sentence_matches: List[List[Dict[str, Any]]],
+    ):
+        if self._sentence_cache_size <= 0:
+            return
+        with self._sentence_cache_lock:
+            self._sentence_cache[key] = sentence_matches
+            # Evict least recently used sentences
+            while len(self._sentence_cache) > self._sentence_cache_size:
+                self._sentence_cache.popitem(last=False)
+
+    def _sentence_cache_set(
+        self,
+        key: str,
+        sentence_matches: List[List[Dict[str, Any]]],
+    ):
+        """Store sentence matches in in-memory cache and database."""
+        self._sentence_cache_put(key, sentence_matches)
+        if self._sentence_cache_db is not None:
+            self._sentence_cache_db.set(key, sentence_matches)
+
+    @staticmethod
+    def _shift_sentence_matches(
+        sentence_matches: List[List[Dict[str, Any]]],
+        begin: int,
+        *,
+        offset: int = 0,
+        offset_map: List[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Copy of sentence matches with spans relative to the corpus, see
+        `_iter_ngrams()`."""
+        def shift(position):
+            position += begin
+            if offset_map is not None:
+                position = offset_map[position]
+            return position + offset
+
+        def shift_match(ngram_match):
+            # NOTE: Matches loaded from a database may be dictionaries.
+            if isinstance(ngram_match, MatchRecord):
+                ngram_match = ngram_match.replace()
+            else:
+                ngram_match = MatchRecord.from_mapping(ngram_match)
+            ngram_match.begin = shift(ngram_match.begin)
+            ngram_match.end = shift(ngram_match.end)
+            return ngram_match
+
+        return [
+            list(map(shift_match, ngram_matches))
+            for ngram_matches in sentence_matches
+        ]
+
+    def _match_cached_sentence(
+        self,
+        sentence: Tuple[int, int, str],
+        *,
+        cache_scope: str = None,
+        offset: int = 0,
+        offset_map: List[int] = None,
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Match N-grams of a sentence using sentence cache.
+
+        Args:
+            sentence (Tuple[int, int, str]): Sentence with span. Cache is
+                only used for span-text tuples.
+
+            cache_scope (str): Configuration part of cache keys, see
+                `_sentence_cache_scope()`. If None, cache is not used.
+
+        Kwargs:
+            Options forwarded to `_match_sentence()`.
+        """
+        # NOTE: Sentences that are not span-text tuples (e.g., spaCy
+        # spans) are not cached.
+        if cache_scope is None or not isinstance(sentence, tuple):
+            return self._match_sentence(
+                sentence,
+                offset=offset,
+                offset_map=offset_map,
+                **kwargs,
+            )
+
+        begin, end, text = sentence
+        key = self._sentence_cache_key(text, cache_scope)
+        sentence_matches = self._sentence_cache_get(key)
+        if sentence_matches is None:
+            # NOTE: Spans are relative to the normalized sentence.
+            sentence_matches = self._match_sentence(
+                (0, end - begin, text),
+                **kwargs,
+            )
+            self._sentence_cache_set(key, sentence_matches)
+        return type(self)._shift_sentence_matches(
+            sentence_matches,
+            begin,
+            offset=offset,
+            offset_map=offset_map,
+        )
+
+    async def _amatch_cached_sentence(
+        self,
+        sentence: Tuple[int, int, str],
+        *,
+        cache_scope: str = None,
+        offset: int = 0,
+        offset_map: List[int] = None,
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Asynchronous version of `_match_cached_sentence()`."""
+        if cache_scope is None or not isinstance(sentence, tuple):
+            return await self._amatch_sentence(
+                sentence,
+                offset=offset,
+                offset_map=offset_map,
+                **kwargs,
+            )
+
+        begin, end, text = sentence
+        key = self._sentence_cache_key(text, cache_scope)
+        sentence_matches = self._sentence_cache_get(key)
+        if sentence_matches is None:
+            sentence_matches = await self._amatch_sentence(
+                (0, end - begin, text),
+                **kwargs,
+            )
+            self._sentence_cache_set(key, sentence_matches)
+        return type(self)._shift_sentence_matches(
+            sentence_matches,
+            begin,
+            offset=offset,
+            offset_map=offset_map,
+        )
+
+    def _iter_sentences(
+        self,
+        corpora: Union[str, Iterable[str]],
+        *,
+        tokenizer: 'BaseTokenizer',
+        case: str = 'l',
+        normalize_unicode: bool = False,
+        corpus_kwargs: Dict[str, Any] = None,
+    ) -> Iterator[Tuple[str, Tuple[int, int, str], int, List[int]]]:
+        """Generator of sentences from corpora, see `imatch()`.
+
+        Casing, Unicode normalization, and tokenizer's converters are
+        applied in a single pass over each corpus (or chunk), see
+        `Normalizer`.
+
+        Returns (Tuple[str, Tuple[int, int, str], int, List[int]]): Corpus
+            source, sentence with span, offset of corpus chunk, and map of
+            offsets from normalized to original text (None if identity).
+            A None sentence marks the beginning of a corpus.
+        """
+        normalizer = get_normalizer((
+            strcase_map[case],
+            *((unidecode,) if normalize_unicode else ()),
+            *tokenizer.converters,
+        ))
 
         if corpus_kwargs is None:
             corpus_kwargs = {}
 
-        if PROFILE:
-            prof = cProfile.Profile(subcalls=True, builtins=True)
-            prof.enable()
+        # NOTE: Large files can be read in chunks (see 'chunk_size' option
+        # of 'corpus_generator'). Chunks of a corpus are generated in order
+        # and a new corpus begins at offset 0.
+        for source, corpus, offset in corpus_generator(
+            corpora,
+            with_offset=True,
+            **corpus_kwargs,
+        ):
+            if offset == 0:
+                metrics.incr('facet.corpora')
+                yield source, None, offset, None
+
+            corpus, offset_map = normalizer.normalize(corpus)
+
+            for sentence in metrics.timed_iter(
+                'facet.sentencize',
+                tokenizer.sentencize(corpus, convert=False),
+            ):
+                metrics.incr('facet.sentences')
+                yield source, sentence, offset, offset_map
+
+    def _match_sentence(
+        self,
+        sentence: Tuple[int, int, str],
+        *,
+        tokenizer: 'BaseTokenizer',
+        window: int = None,
+        feature_bounds: Tuple[int, int] = None,
+        overlap: str = None,
+        offset: int = 0,
+        offset_map: List[int] = None,
+        ngram_structs: Iterable[Tuple[int, int, str]] = None,
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Match N-grams of a sentence.
 
-        t1 = time.time()
-        matches = collections.defaultdict(list)
-        for source, corpus in corpus_generator(corpora, **corpus_kwargs):
-            corpus = casefunc(corpus)
+        Args:
+            sentence (Tuple[int, int, str]): Sentence with span.
 
-            if normalize_unicode:
-                corpus = unidecode(corpus)
+            tokenizer (BaseTokenizer): Tokenizer instance.
 
-            for sentence in tokenizer.sentencize(corpus):
-                for ngram_struct in tokenizer.tokenize(sentence):
-                    ngram_matches = self._match(ngram_struct, **kwargs)
-                    if len(ngram_matches) == 0:
-                        continue
+            window (int): Max number of tokens per span. If None, the
+                tokenizer's window is used.
 
-                    # NOTE: Matches are not checked for duplication if placed
-                    # in the same key.
-                    matches[source].append(ngram_matches)
-        t2 = time.time()
-        print(f'Matching N-grams: {t2 - t1} s')
+            feature_bounds (Tuple[int, int]): Min/max number of features of
+                spans to search. If None, all spans are searched.
+
+            overlap (str): Resolution of overlapping matches, see `imatch()`.
+
+            offset (int): Shift for spans, used to make spans relative to
+                the corpus when processing chunks.
+
+            offset_map (List[int]): Map of offsets from normalized text to
+                original text, applied to spans before 'offset'.
+
+            ngram_structs (Iterable[Tuple[int, int, str]]): N-grams with
+                span of the sentence. If None, they are generated with
+                `_iter_ngrams()`.
+
+        Kwargs:
+            Options forwarded to `Matcher.search` via `_match`.
+        """
+        if ngram_structs is None:
+            ngram_structs = self._iter_ngrams(
+                sentence,
+                tokenizer=tokenizer,
+                window=window,
+                feature_bounds=feature_bounds,
+                offset=offset,
+                offset_map=offset_map,
+            )
+
+        if overlap is not None:
+            return self._match_nonoverlapping(
+                ngram_structs,
+                overlap=overlap,
+                **kwargs,
+            )
+
+        sentence_matches = []
+        for ngram_struct in ngram_structs:
+            ngram_matches = self._match(ngram_struct, **kwargs)
+            if len(ngram_matches) > 0:
+                sentence_matches.append(ngram_matches)
+        return sentence_matches
+
+    async def _amatch_sentence(
+        self,
+        sentence: Tuple[int, int, str],
+        *,
+        tokenizer: 'BaseTokenizer',
+        window: int = None,
+        feature_bounds: Tuple[int, int] = None,
+        offset: int = 0,
+        offset_map: List[int] = None,
+        searches: Dict[str, List[Tuple[str, float]]] = None,
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Asynchronous version of `_match_sentence()`.
+
+        Searches of all N-grams of the sentence are in flight at once,
+        then matches are built from their results. N-grams already in
+        'searches' are not searched again.
+
+        Notes:
+            * With overlap resolution, N-grams that would be skipped are
+              also searched.
+        """
+        ngram_structs = list(self._iter_ngrams(
+            sentence,
+            tokenizer=tokenizer,
+            window=window,
+            feature_bounds=feature_bounds,
+            offset=offset,
+            offset_map=offset_map,
+        ))
+        matcher, search_kwargs = self._search_matcher(**{
+            k: v
+            for k, v in kwargs.items()
+            if k != 'overlap'
+        })
+        if searches is None:
+            searches = {}
+        ngrams = list(dict.fromkeys(
+            ngram
+            for _, _, ngram in ngram_structs
+            if ngram not in searches
+        ))
+        metrics.incr('facet.searches', len(ngrams))
+        searches.update(zip(ngrams, await asyncio.gather(*(
+            matcher.asearch(ngram, **search_kwargs)
+            for ngram in ngrams
+        ))))
+        return self._match_sentence(
+            sentence,
+            tokenizer=tokenizer,
+            ngram_structs=ngram_structs,
+            searches=searches,
+            **kwargs,
+        )
+
+    def _search(
+        self,
+        ngram: str,
+        *,
+        searches: Dict[str, List[Tuple[str, float]]] = None,
+        **kwargs,
+    ) -> List[Tuple[str, float]]:
+        """Search N-gram in matcher.
+
+        Args:
+            searches (Dict[str, List[Tuple[str, float]]]): Results of
+                searches already performed, see `_amatch_sentence()`. New
+                results are added to it.
+
+        Kwargs:
+            Options passed directly to `Matcher.search()`.
+        """
+        if searches is not None:
+            ngram_searches = searches.get(ngram)
+            if ngram_searches is None:
+                matcher, search_kwargs = self._search_matcher(**kwargs)
+                ngram_searches = matcher.search(ngram, **search_kwargs)
+                searches[ngram] = ngram_searches
+                metrics.incr('facet.searches')
+            return ngram_searches
+        metrics.incr('facet.searches')
+        matcher, search_kwargs = self._search_matcher(**kwargs)
+        return matcher.search(ngram, **search_kwargs)
+
+    def _search_matcher(
+        self,
+        **kwargs,
+    ) -> Tuple['BaseMatcher', Dict[str, Any]]:
+        """Matcher to search with and its search options, for the given
+        match options.
+
+        Kwargs:
+            Options passed to `Matcher.search()`. Derived facets can
+            consume options that select among several matchers.
+        """
+        return self._matcher, kwargs
+
+    def _iter_ngrams(
+        self,
+        sentence: Tuple[int, int, str],
+        *,
+        tokenizer: 'BaseTokenizer',
+        window: int = None,
+        feature_bounds: Tuple[int, int] = None,
+        offset: int = 0,
+        offset_map: List[int] = None,
+    ) -> Iterator[Tuple[int, int, str]]:
+        """Generator of N-grams to search from a sentence, see
+        `_match_sentence()`."""
+        num_ngrams = 0
+        num_pruned = 0
+        for ngram_struct in metrics.timed_iter(
+            'facet.tokenize',
+            tokenizer.tokenize(sentence)
+            if window is None
+            else tokenizer.tokenize(sentence, window=window),
+        ):
+            num_ngrams += 1
+            if feature_bounds is not None:
+                num_features = self._matcher.ngram.num_features(
+                    ngram_struct[2]
+                )
+                if not feature_bounds[0] <= num_features <= feature_bounds[1]:
+                    num_pruned += 1
+                    continue
+
+            if offset_map is not None:
+                begin, end, ngram = ngram_struct
+                ngram_struct = (offset_map[begin], offset_map[end], ngram)
+
+            if offset > 0:
+                begin, end, ngram = ngram_struct
+                ngram_struct = (begin + offset, end + offset, ngram)
+
+            yield ngram_struct
+
+        metrics.incr('facet.ngrams', num_ngrams)
+        metrics.incr('facet.ngrams_pruned', num_pruned)
+
+    def _match_nonoverlapping(
+        self,
+        ngram_structs: Iterable[Tuple[int, int, str]],
+        *,
+        overlap: str = 'longest',
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Match N-grams from longest to shortest and keep non-overlapping
+        matches.
 
-        if PROFILE:
-            prof.disable()
-            prof.create_stats()
-            prof.print_stats('time')
-            prof.clear()
+        Args:
+            ngram_structs (Iterable[Tuple[int, int, str]]): N-grams with span.
 
-        return formatter(matches, output=output)
+            overlap (str): Resolution of overlapping matches. Valid values
+                are: 'longest', 'best'.
 
-    def install(self, filename, **kwargs):
+        Kwargs:
+            Options forwarded to `Matcher.search` via `_match`.
+        """
+        if overlap not in ('longest', 'best'):
+            raise ValueError(f'invalid overlap resolution, {overlap}')
+
+        def overlaps(span, spans):
+            return any(
+                span[0] <= other[1] and other[0] <= span[1]
+                for other in spans
+            )
+
+        # Spans which exclude overlapping spans from being searched
+        covered_spans = []
+        matched_spans = []
+        for ngram_struct in sorted(
+            ngram_structs,
+            key=lambda span: (span[0] - span[1], span[0]),
+        ):
+            if overlaps(ngram_struct, covered_spans):
+                continue
+
+            ngram_matches = self._match(ngram_struct, **kwargs)
+            if len(ngram_matches) == 0:
+                continue
+
+            similarity = max(match['similarity'] for match in ngram_matches)
+            matched_spans.append((ngram_struct, similarity, ngram_matches))
+
+            # NOTE: For 'best' resolution, only an exact match cannot be
+            # replaced by a shorter overlapping span.
+            if overlap == 'longest' or similarity >= 1.:
+                covered_spans.append(ngram_struct)
+
+        if overlap == 'best':
+            covered_spans = []
+            # NOTE: Spans are already sorted by length, and sort is stable.
+            matched_spans.sort(key=lambda matched: -matched[1])
+            selected_spans = []
+            for matched in matched_spans:
+                if not overlaps(matched[0], covered_spans):
+                    covered_spans.append(matched[0])
+                    selected_spans.append(matched)
+            matched_spans = selected_spans
+
+        matched_spans.sort(key=lambda matched: matched[0][0])
+        return [ngram_matches for _, _, ngram_matches in matched_spans]
+
+    def install(
+        self,
+        filename,
+        *,
+        profile: Union[str, 'BaseProfiler'] = '',
+        resume: bool = False,
+        checkpoint: Union[str, 'BaseKVDatabase'] = None,
+        **kwargs,
+    ):
         """Install data.
 
         Args:
             filename (str): File with data to install.
 
+            profile (str, BaseProfiler): Profiler instance or profiler name.
+                If None, profiling is disabled for this call.
+
+            resume (bool): If set, progress is checkpointed and records
+                committed by a previous failed install are skipped.
+
+            checkpoint (str, BaseKVDatabase): Sidecar filename or database
+                for checkpoints. If set, progress is checkpointed. If None
+                and 'resume' is set, the matcher's database is used if it
+                is a key/value database, else a sidecar file,
+                '<filename>.checkpoint'.
+
         Kwargs:
             Options passed directly to '*load_data()' function method via
             'install()'.
+
+        Notes:
+            * Checkpoints are saved every time records are committed and
+              removed when install completes. Data is parsed again when
+              resuming, only writes of committed records are skipped.
         """
-        if PROFILE:
-            prof = cProfile.Profile(subcalls=True, builtins=True)
-            prof.enable()
+        filename = expand_envvars(filename)
+        if resume or checkpoint is not None:
+            if checkpoint is None:
+                checkpoint = (
+                    self._matcher.db
+                    if isinstance(self._matcher.db, BaseKVDatabase)
+                    else filename + '.checkpoint'
+                )
+            self._checkpoint = InstallCheckpoint(
+                filename,
+                checkpoint,
+                resume=resume,
+            )
+
+        try:
+            with self._profile('install', profile):
+                self._install(filename, **kwargs)
+            if self._checkpoint is not None:
+                self._checkpoint.clear()
+        finally:
+            self._checkpoint = None
+
+        self._dump_index_version(filename, **kwargs)
+
+        # NOTE: Cached matches may be outdated.
+        self.clear_caches()
+
+        peak = peak_memory()
+        if peak is not None:
+            metrics.set_gauge('install.peak_memory', peak)
+
+    def _profile(
+        self,
+        scope: str,
+        profile: Union[str, 'BaseProfiler'] = '',
+    ):
+        """Context manager for profiling an operation.
 
-        self._install(expand_envvars(filename), **kwargs)
+        Args:
+            scope (str): Profiling scope, see `BaseProfiler`.
 
-        if PROFILE:
-            prof.disable()
-            prof.create_stats()
-            prof.print_stats('time')
-            prof.clear()
+            profile (str, BaseProfiler): Profiler instance or profiler name.
+                If empty string, the facet's profiler is used.
+        """
+        profiler = (
+            self._profiler
+            if profile == ''
+            else get_profiler(profile)
+        )
+        # NOTE: An empty ExitStack is a null context manager.
+        if profiler is None:
+            return contextlib.ExitStack()
+        return profiler.profile(scope)
 
     def close(self):
         self._matcher.db.close()
@@ -243,6 +1775,83 @@ class BaseFacet(ABC):
     def _install(self, data, **kwargs):
         pass
 
+    def _num_tokens(self, term: str) -> int:
+        """Number of tokens of a term using the facet's tokenizer."""
+        return sum(1 for _ in self._tokenizer.tokenize(term, window=1))
+
+    def _record_install_metrics(self, num_records: int, start_time: float):
+        """Records number of installed records and install rate."""
+        if not metrics.is_enabled():
+            return
+        elapsed_time = time.time() - start_time
+        metrics.incr('install.records', num_records)
+        metrics.observe('install.dump', elapsed_time)
+        if elapsed_time > 0:
+            metrics.set_gauge(
+                'install.records_per_second',
+                num_records / elapsed_time,
+            )
+
+    def _checkpoint_stage(self, name: str) -> int:
+        """Start a checkpointed dump stage, returns number of records to
+        skip."""
+        if self._checkpoint is None:
+            return 0
+        return self._checkpoint.next_stage(name)
+
+    def _save_checkpoint(self, num_records: int):
+        """Stores number of records committed by current dump stage.
+
+        Notes:
+            * Proxy databases are only copied at the end of a stage, so
+              intermediate commits are not checkpointed.
+        """
+        if self._checkpoint is not None:
+            self._checkpoint.save(num_records)
+
+    def _dump_index_version(self, filename: str, **kwargs):
+        """Stores version of installed data in matcher's database, only
+        supported for key/value databases.
+
+        Version is derived from the previous version, the size and
+        modification time of installed files, and install options, so
+        that installing the same data into an empty database results in
+        the same version.
+        """
+        if not isinstance(self._matcher.db, BaseKVDatabase):
+            return
+        filenames = (
+            sorted(
+                os.path.join(filename, name)
+                for name in os.listdir(filename)
+            )
+            if os.path.isdir(filename)
+            else [filename]
+        )
+        stats = [
+            (os.path.basename(name), stat.st_size, stat.st_mtime_ns)
+            for name, stat in zip(filenames, map(os.stat, filenames))
+        ]
+        version = hashlib.sha1(repr((
+            self._matcher.db.get(INDEX_VERSION_KEY),
+            stats,
+            sorted((k, repr(v)) for k, v in kwargs.items()),
+        )).encode()).hexdigest()
+        self._matcher.db.set(INDEX_VERSION_KEY, version)
+        self._matcher.db.commit()
+
+    def _dump_max_term_tokens(self, max_term_tokens: int):
+        """Stores max number of tokens of installed terms in matcher's
+        database, only supported for key/value databases."""
+        if not isinstance(self._matcher.db, BaseKVDatabase):
+            return
+        prev_max_term_tokens = self._matcher.db.get(MAX_TERM_TOKENS_KEY)
+        if (
+            prev_max_term_tokens is None
+            or max_term_tokens > prev_max_term_tokens
+        ):
+            self._matcher.db.set(MAX_TERM_TOKENS_KEY, max_term_tokens)
+
     def _dump_matcher(
         self,
         data: Iterable[str],
@@ -263,14 +1872,21 @@ class BaseFacet(ABC):
         if self._use_proxy_install:
             self._matcher.set_proxy_db(create_proxy_db())
 
-        prev_time = time.time()
+        skip = self._checkpoint_stage('matcher')
+        start_time = prev_time = time.time()
 
         i = 0
+        max_term_tokens = 0
         for term in data:
             i += 1
+            max_term_tokens = max(max_term_tokens, self._num_tokens(term))
+            if i <= skip:
+                continue
             self._matcher.insert(term)
             if i % bulk_size == 0:
                 self._matcher.db.commit()
+                if not self._use_proxy_install:
+                    self._save_checkpoint(i)
 
             if VERBOSE and i % status_step == 0:
                 curr_time = time.time()
@@ -278,7 +1894,9 @@ class BaseFacet(ABC):
                 print(f'{i}: {elapsed_time} s')
                 prev_time = curr_time
 
+        self._dump_max_term_tokens(max_term_tokens)
         self._matcher.db.commit()
+        self._record_install_metrics(i - min(i, skip), start_time)
 
         if VERBOSE:
             print(f'Records processed: {i}')
@@ -287,6 +1905,7 @@ class BaseFacet(ABC):
         # Copy proxy database
         if self._use_proxy_install:
             self._matcher.set_proxy_db(None)
+        self._save_checkpoint(i)
 
     def _dump_kv(
         self,
@@ -311,14 +1930,19 @@ class BaseFacet(ABC):
             proxy_db = create_proxy_db()
             db = proxy_db
 
-        prev_time = time.time()
+        skip = self._checkpoint_stage('kv')
+        start_time = prev_time = time.time()
 
         i = 0
         for key, val in data:
             i += 1
+            if i <= skip:
+                continue
             db.set(key, val)
             if i % bulk_size == 0:
                 db.commit()
+                if not self._use_proxy_install:
+                    self._save_checkpoint(i)
 
             if VERBOSE and i % status_step == 0:
                 curr_time = time.time()
@@ -327,6 +1951,7 @@ class BaseFacet(ABC):
                 prev_time = curr_time
 
         db.commit()
+        self._record_install_metrics(i - min(i, skip), start_time)
 
         if VERBOSE:
             print(f'Records processed: {i}')
@@ -337,6 +1962,7 @@ class BaseFacet(ABC):
             proxy_db.copy(orig_db)
             db = orig_db
             proxy_db.clear()
+        self._save_checkpoint(i)
 
     def _dump_matcher_kv(
         self,
@@ -364,16 +1990,23 @@ class BaseFacet(ABC):
             proxy_db2 = create_proxy_db()
             db = proxy_db2
 
-        prev_time = time.time()
+        skip = self._checkpoint_stage('matcher_kv')
+        start_time = prev_time = time.time()
 
         i = 0
+        max_term_tokens = 0
         for key, val in data:
             i += 1
+            max_term_tokens = max(max_term_tokens, self._num_tokens(key))
+            if i <= skip:
+                continue
             self._matcher.insert(key)
             db.set(key, val)
             if i % bulk_size == 0:
                 self._matcher.db.commit()
                 db.commit()
+                if not self._use_proxy_install:
+                    self._save_checkpoint(i)
 
             if VERBOSE and i % status_step == 0:
                 curr_time = time.time()
@@ -381,8 +2014,10 @@ class BaseFacet(ABC):
                 print(f'{i}: {elapsed_time} s')
                 prev_time = curr_time
 
+        self._dump_max_term_tokens(max_term_tokens)
         self._matcher.db.commit()
         db.commit()
+        self._record_install_metrics(i - min(i, skip), start_time)
 
         if VERBOSE:
             print(f'Records processed: {i}')
@@ -396,3 +2031,4 @@ class BaseFacet(ABC):
             proxy_db2.copy(orig_db2)
             db = orig_db2
             proxy_db2.clear()
+        self._save_checkpoint(i)
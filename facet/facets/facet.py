@@ -1,5 +1,9 @@
 import time
-from ..helpers import iload_data
+from ..helpers import (
+    iter_chunk_rows,
+    iload_data_chunks,
+)
+from ..records import MatchRecord
 from .base import BaseFacet
 from unidecode import unidecode
 from typing import (
@@ -36,7 +40,7 @@ class Facet(BaseFacet):
             filename (str): File with data to install.
 
         Kwargs:
-            Options passed directly to '*load_data()' function.
+            Options passed directly to 'iload_data_chunks()' function.
         """
         # Prepare 'keys' parameter as an iterable for 'load_data()'
         if isinstance(cols, (str, int)):
@@ -46,11 +50,14 @@ class Facet(BaseFacet):
 
         print('Loading/parsing data...')
         start = time.time()
-        data = iload_data(
-            filename,
-            keys=cols,
-            converters={cols[0]: [unidecode, str.lower]},
-            **kwargs,
+        data = iter_chunk_rows(
+            iload_data_chunks(
+                filename,
+                keys=cols,
+                converters={cols[0]: [unidecode, str.lower]},
+                **kwargs,
+            ),
+            num_keys=len(cols),
         )
         curr_time = time.time()
         print(f'Loading/parsing data: {curr_time - start} s')
@@ -80,15 +87,6 @@ class Facet(BaseFacet):
         """
         begin, end, ngram = ngram_struct
         return [
-            {
-                'begin': begin,
-                'end': end,
-                'ngram': ngram,
-                'candidate': candidate,
-                'similarity': similarity,
-            }
-            for candidate, similarity in self._matcher.search(
-                ngram,
-                **kwargs,
-            )
+            MatchRecord(begin, end, ngram, candidate, similarity)
+            for candidate, similarity in self._search(ngram, **kwargs)
         ]
@@ -0,0 +1,461 @@
+import asyncio
+import hashlib
+# NOTE: How to include facetFactory?
+import facet
+from .. import metrics
+from .base import BaseFacet
+from ..matcher import BaseSimstring
+from ..tokenizer import BaseTokenizer
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Union,
+    Iterable,
+)
+
+
+__all__ = ['FederatedFacet']
+
+
+class FederatedFacet(BaseFacet):
+    """FACET matcher for multiple dictionaries in a single pass.
+
+    Corpora are read, normalized, sentencized, and tokenized once, and
+    features of each N-gram are extracted once per feature extractor, then
+    N-grams are searched in every dictionary. Matches are labeled with the
+    name of their dictionary ('dictionary' field).
+
+    Args:
+        facets (Dict[str, Union[BaseFacet, Dict[str, Any]]]): Mapping of
+            dictionary names to FACET instances or configurations (see
+            FacetFactory). Each FACET has its own matcher and databases.
+
+    Kwargs:
+        Options passed directly to `BaseFacet`, except 'matcher' which is
+        ignored.
+
+    Notes:
+        * Match options (e.g., 'alpha', 'similarity') apply to all
+          dictionaries, and overlapping matches are resolved per dictionary.
+        * Searches of all N-grams of a sentence are performed before
+          resolving overlapping matches, see `_match_sentence()`.
+        * Dictionaries are installed individually, see `install()`.
+    """
+
+    NAME = 'federated'
+
+    def __init__(
+        self,
+        *,
+        facets: Dict[str, Union['BaseFacet', Dict[str, Any]]],
+        **kwargs,
+    ):
+        if len(facets) == 0:
+            raise ValueError('invalid federated FACET, no dictionaries')
+        self._facets = {
+            name: (
+                facet.FacetFactory(value).create()
+                if isinstance(value, dict)
+                else value
+            )
+            for name, value in facets.items()
+        }
+
+        # NOTE: Matcher of first dictionary is used for operations of
+        # BaseFacet that require a single matcher.
+        kwargs['matcher'] = next(iter(self._facets.values())).matcher
+        super().__init__(**kwargs)
+
+    @property
+    def facets(self) -> Dict[str, 'BaseFacet']:
+        return dict(self._facets)
+
+    @property
+    def index_version(self) -> Union[str, None]:
+        """Version of installed data of all dictionaries, None if unknown
+        for all dictionaries."""
+        versions = [
+            (name, dictionary.index_version)
+            for name, dictionary in self._facets.items()
+        ]
+        if all(version is None for _, version in versions):
+            return None
+        return hashlib.sha1(repr(versions).encode()).hexdigest()
+
+    @property
+    def max_term_tokens(self) -> Union[int, None]:
+        """Max number of tokens of installed terms of all dictionaries,
+        None if unknown for any dictionary."""
+        max_term_tokens = [
+            dictionary.max_term_tokens
+            for dictionary in self._facets.values()
+        ]
+        if any(num_tokens is None for num_tokens in max_term_tokens):
+            return None
+        return max(max_term_tokens)
+
+    def install(self, filename: str, *, dictionary: str, **kwargs):
+        """Install data into a dictionary.
+
+        Args:
+            filename (str): File with data to install.
+
+            dictionary (str): Dictionary name.
+
+        Kwargs:
+            Options passed directly to `install()` of the dictionary's FACET.
+
+        Notes:
+            * Checkpoints, profiling, and index version are handled by the
+              dictionary's FACET.
+        """
+        self._install(filename, dictionary=dictionary, **kwargs)
+
+        # NOTE: Cached matches may be outdated.
+        self.clear_caches()
+
+    def _install(self, filename: str, *, dictionary: str, **kwargs):
+        """Install data into a dictionary, see `install()`."""
+        if dictionary not in self._facets:
+            raise ValueError(f'invalid dictionary, {dictionary}')
+        self._facets[dictionary].install(filename, **kwargs)
+
+    def clear_caches(self):
+        super().clear_caches()
+        for dictionary in self._facets.values():
+            dictionary.clear_caches()
+
+    def close(self):
+        for dictionary in self._facets.values():
+            dictionary.close()
+        self._close()
+
+    def _match_params(self, **kwargs) -> Tuple['BaseTokenizer', int, None]:
+        """Resolves tokenizer and window, see `BaseFacet._match_params()`.
+
+        Notes:
+            * Feature bounds differ per dictionary, see
+              `_dictionary_requests()`.
+        """
+        tokenizer, window, _ = super()._match_params(**kwargs)
+        return tokenizer, window, None
+
+    def _match_config(
+        self,
+        *,
+        tokenizer: 'BaseTokenizer',
+        **kwargs,
+    ) -> str:
+        return repr((
+            type(self).NAME,
+            [
+                (name, dictionary._match_config(tokenizer=tokenizer, **kwargs))
+                for name, dictionary in self._facets.items()
+            ],
+        ))
+
+    def _match(
+        self,
+        ngram_struct: Tuple[int, int, str],
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Match N-gram in all dictionaries.
+
+        Kwargs:
+            Options passed directly to `Matcher.search()`.
+        """
+        federated_matches = []
+        for name, dictionary in self._facets.items():
+            for ngram_match in dictionary._match(ngram_struct, **kwargs):
+                ngram_match['dictionary'] = name
+                federated_matches.append(ngram_match)
+        return federated_matches
+
+    def _match_sentence(
+        self,
+        sentence: Tuple[int, int, str],
+        *,
+        tokenizer: 'BaseTokenizer',
+        window: int = None,
+        feature_bounds: Tuple[int, int] = None,
+        overlap: str = None,
+        offset: int = 0,
+        offset_map: List[int] = None,
+        ngram_structs: Iterable[Tuple[int, int, str]] = None,
+        searches: Dict[str, Dict[str, List[Tuple[str, float]]]] = None,
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Match N-grams of a sentence in all dictionaries.
+
+        Args:
+            searches (Dict[str, Dict[str, List[Tuple[str, float]]]]):
+                Results of searches already performed per dictionary name.
+                New results are added to it.
+
+        Kwargs:
+            Options passed directly to `Matcher.search()`.
+
+        Notes:
+            * N-grams are generated once and searched in every dictionary
+              before its matches are built, see `_dictionary_requests()`.
+        """
+        if ngram_structs is None:
+            ngram_structs = list(self._iter_ngrams(
+                sentence,
+                tokenizer=tokenizer,
+                window=window,
+                offset=offset,
+                offset_map=offset_map,
+            ))
+        if searches is None:
+            searches = {}
+
+        ngram_features = {}
+        dictionary_ngram_structs = {}
+        for name, dictionary in self._facets.items():
+            dictionary_searches = searches.setdefault(name, {})
+            dictionary_ngram_structs[name], requests = (
+                self._dictionary_requests(
+                    dictionary,
+                    ngram_structs,
+                    ngram_features=ngram_features,
+                    searches=dictionary_searches,
+                    **kwargs,
+                )
+            )
+            matcher, search_kwargs = dictionary._search_matcher(**kwargs)
+            for ngram, query_features in requests:
+                dictionary_searches[ngram] = matcher.search(
+                    ngram,
+                    **type(self)._search_kwargs(
+                        query_features,
+                        **search_kwargs,
+                    ),
+                )
+
+        return self._dictionary_matches(
+            sentence,
+            dictionary_ngram_structs,
+            searches=searches,
+            tokenizer=tokenizer,
+            overlap=overlap,
+            **kwargs,
+        )
+
+    async def _amatch_sentence(
+        self,
+        sentence: Tuple[int, int, str],
+        *,
+        tokenizer: 'BaseTokenizer',
+        window: int = None,
+        feature_bounds: Tuple[int, int] = None,
+        overlap: str = None,
+        offset: int = 0,
+        offset_map: List[int] = None,
+        searches: Dict[str, Dict[str, List[Tuple[str, float]]]] = None,
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Asynchronous version of `_match_sentence()`.
+
+        Searches of all N-grams of the sentence in all dictionaries are in
+        flight at once.
+        """
+        ngram_structs = list(self._iter_ngrams(
+            sentence,
+            tokenizer=tokenizer,
+            window=window,
+            offset=offset,
+            offset_map=offset_map,
+        ))
+        if searches is None:
+            searches = {}
+
+        ngram_features = {}
+        dictionary_ngram_structs = {}
+        dictionary_requests = []
+        for name, dictionary in self._facets.items():
+            dictionary_ngram_structs[name], requests = (
+                self._dictionary_requests(
+                    dictionary,
+                    ngram_structs,
+                    ngram_features=ngram_features,
+                    searches=searches.setdefault(name, {}),
+                    **kwargs,
+                )
+            )
+            dictionary_requests.extend(
+                (name, ngram, query_features)
+                for ngram, query_features in requests
+            )
+
+        dictionary_matchers = {
+            name: dictionary._search_matcher(**kwargs)
+            for name, dictionary in self._facets.items()
+        }
+        responses = await asyncio.gather(*(
+            dictionary_matchers[name][0].asearch(
+                ngram,
+                **type(self)._search_kwargs(
+                    query_features,
+                    **dictionary_matchers[name][1],
+                ),
+            )
+            for name, ngram, query_features in dictionary_requests
+        ))
+        for (name, ngram, _), response in zip(dictionary_requests, responses):
+            searches[name][ngram] = response
+
+        return self._dictionary_matches(
+            sentence,
+            dictionary_ngram_structs,
+            searches=searches,
+            tokenizer=tokenizer,
+            overlap=overlap,
+            **kwargs,
+        )
+
+    def _prefetch_searches(
+        self,
+        ngram_structs: Iterable[Tuple[int, int, str]],
+        *,
+        searches: Dict[str, Dict[str, List[Tuple[str, float]]]],
+        **kwargs,
+    ):
+        """Search N-grams in all dictionaries, see
+        `BaseFacet._prefetch_searches()`."""
+        ngram_structs = list(ngram_structs)
+        ngram_features = {}
+        for name, dictionary in self._facets.items():
+            dictionary_searches = searches.setdefault(name, {})
+            _, requests = self._dictionary_requests(
+                dictionary,
+                ngram_structs,
+                ngram_features=ngram_features,
+                searches=dictionary_searches,
+                **kwargs,
+            )
+            matcher, search_kwargs = dictionary._search_matcher(**kwargs)
+            for ngram, query_features in requests:
+                dictionary_searches[ngram] = matcher.search(
+                    ngram,
+                    **type(self)._search_kwargs(
+                        query_features,
+                        **search_kwargs,
+                    ),
+                )
+
+    def _dictionary_requests(
+        self,
+        dictionary: 'BaseFacet',
+        ngram_structs: List[Tuple[int, int, str]],
+        *,
+        ngram_features: Dict[Tuple[str, str], List[str]],
+        searches: Dict[str, List[Tuple[str, float]]],
+        **kwargs,
+    ) -> Tuple[
+        List[Tuple[int, int, str]],
+        List[Tuple[str, Union[List[str], None]]],
+    ]:
+        """N-grams of a dictionary and its searches to perform.
+
+        N-grams with a number of features out of the dictionary's feature
+        bounds are skipped. Features are shared among dictionaries with
+        equivalent N-gram extractors.
+
+        Args:
+            dictionary (BaseFacet): FACET of dictionary.
+
+            ngram_structs (List[Tuple[int, int, str]]): N-grams with span.
+
+            ngram_features (Dict[Tuple[str, str], List[str]]): Features
+                already extracted, by N-gram extractor and N-gram. New
+                features are added to it.
+
+            searches (Dict[str, List[Tuple[str, float]]]): Results of
+                searches already performed in the dictionary.
+
+        Kwargs:
+            Options passed directly to `Matcher.search()`.
+
+        Returns (Tuple[List, List]): N-grams of dictionary, and unique
+            N-grams to search with their features (None if the matcher
+            does not use N-gram features).
+        """
+        matcher = dictionary.matcher
+        if not isinstance(matcher, BaseSimstring):
+            requests = {
+                ngram: None
+                for _, _, ngram in ngram_structs
+                if ngram not in searches
+            }
+            metrics.incr('facet.searches', len(requests))
+            return ngram_structs, list(requests.items())
+
+        _, _, feature_bounds = dictionary._match_params(**kwargs)
+        extractor = (
+            type(matcher.ngram).__name__,
+            repr(sorted(vars(matcher.ngram).items())),
+        )
+        dictionary_ngram_structs = []
+        requests = {}
+        for ngram_struct in ngram_structs:
+            ngram = ngram_struct[2]
+            query_features = ngram_features.get((extractor, ngram))
+            if query_features is None:
+                query_features = matcher.ngram.get_features(ngram)
+                ngram_features[(extractor, ngram)] = query_features
+            if (
+                feature_bounds is not None
+                and not (
+                    feature_bounds[0]
+                    <= len(query_features)
+                    <= feature_bounds[1]
+                )
+            ):
+                continue
+            dictionary_ngram_structs.append(ngram_struct)
+            if ngram not in searches:
+                requests[ngram] = query_features
+
+        metrics.incr('facet.searches', len(requests))
+        return dictionary_ngram_structs, list(requests.items())
+
+    def _dictionary_matches(
+        self,
+        sentence: Tuple[int, int, str],
+        dictionary_ngram_structs: Dict[str, List[Tuple[int, int, str]]],
+        *,
+        searches: Dict[str, Dict[str, List[Tuple[str, float]]]],
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Build matches of a sentence from searches of each dictionary,
+        labeled by dictionary name.
+
+        Kwargs:
+            Options forwarded to `_match_sentence()` of dictionaries.
+        """
+        sentence_matches = []
+        for name, dictionary in self._facets.items():
+            dictionary_matches = dictionary._match_sentence(
+                sentence,
+                ngram_structs=dictionary_ngram_structs[name],
+                searches=searches[name],
+                **kwargs,
+            )
+            for ngram_matches in dictionary_matches:
+                for ngram_match in ngram_matches:
+                    ngram_match['dictionary'] = name
+            sentence_matches.extend(dictionary_matches)
+        return sentence_matches
+
+    @staticmethod
+    def _search_kwargs(
+        query_features: Union[List[str], None],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Search options, with N-gram features for Simstring matchers."""
+        if query_features is None:
+            return kwargs
+        return {**kwargs, 'query_features': query_features}
@@ -1,17 +1,29 @@
 import time
 import functools
+import contextlib
 import collections
 import multiprocessing
 # NOTE: How to include facetFactory?
 import facet
 # from ..factory import FacetFactory
-from ..formatter import get_formatter
+from .. import metrics
+from ..formatter import (
+    get_formatter,
+    BaseStreamFormatter,
+)
 from ..helpers import corpus_generator
+from ..profiler import (
+    get_profiler,
+    BaseProfiler,
+)
 from typing import (
     Any,
+    List,
     Dict,
+    Tuple,
     Union,
     Iterable,
+    Iterator,
 )
 
 
@@ -23,7 +35,16 @@ __all__ = ['ParallelFacet']
 # the match() operation.
 # NOTE: This class can have the same API as BaseFacet, maybe even subclass it.
 class ParallelFacet:
-    """Multiprocessing FACET for matching only."""
+    """Multiprocessing FACET for matching only.
+
+    Args:
+        config (str, Dict[str, Any]): Configuration of FACET workers.
+
+        num_procs (int): Number of worker processes.
+
+        profile (str, BaseProfiler): Profiler instance or profiler name,
+            for matching in the main process.
+    """
 
     NAME = 'parallel'
 
@@ -31,17 +52,27 @@ class ParallelFacet:
         self,
         config: Union[str, Dict[str, Any]],
         num_procs: int = multiprocessing.cpu_count(),
+        profile: Union[str, 'BaseProfiler'] = None,
     ):
         self.num_procs = num_procs
         self._factory = facet.FacetFactory(config)
         self._formatter = get_formatter(
             self._factory.get_config().pop('formatter', None)
         )
+        self._profiler = get_profiler(profile)
+
+    @property
+    def profiler(self):
+        return self._profiler
 
     @staticmethod
-    def _worker(corpora, *, factory, kwargs):
+    def _worker(corpus, *, factory, kwargs):
         f = factory.create()
-        matches = f.match(corpora, **kwargs)
+        # NOTE: Worker processes a single corpus item (as given by
+        # 'corpus_generator(source_only=True)'), so its matches are
+        # materialized to be sent back to the parent process. Item is
+        # placed in a list because it can be a (source, text) pair.
+        matches = list(f.imatch([corpus], **kwargs))
         f.close()
         return matches
 
@@ -49,9 +80,15 @@ class ParallelFacet:
         self,
         corpora: Union[str, Iterable[str]],
         bulk_size: int = 1,
+        profile: Union[str, 'BaseProfiler'] = '',
         **kwargs,
     ):
         """
+        Args:
+            profile (str, BaseProfiler): Profiler instance or profiler name.
+                If empty string, the facet's profiler is used. If None,
+                profiling is disabled for this call.
+
         Notes:
             * To increase performance for large data sets, increase the
               bulk_size parameter. This allows reusing more effectively
@@ -59,44 +96,90 @@ class ParallelFacet:
               that supports concurrent writes and persists.
 
         Kwargs:
-            Options forwarded to 'match()' method of FACET workers.
+            Options forwarded to 'imatch()' method of FACET workers.
         """
         # Disable formatter for workers, this object will manage formatting.
         formatter = get_formatter(kwargs.pop('formatter', self._formatter))
-        kwargs['formatter'] = None
         output = kwargs.pop('output', None)
-        kwargs['output'] = None
+
+        profiler = self._profiler if profile == '' else get_profiler(profile)
+
+        # NOTE: An empty ExitStack is a null context manager.
+        with (
+            contextlib.ExitStack()
+            if profiler is None
+            else profiler.profile('match')
+        ):
+            t1 = time.time()
+
+            # NOTE: Stream formatters consume matches as they are generated.
+            if isinstance(formatter, BaseStreamFormatter):
+                formatted_matches = formatter(
+                    self.imatch(corpora, bulk_size=bulk_size, **kwargs),
+                    output=output,
+                )
+            else:
+                # Combine matches from workers
+                all_matches = collections.defaultdict(list)
+                for source, matches in self.imatch(
+                    corpora,
+                    bulk_size=bulk_size,
+                    **kwargs,
+                ):
+                    if len(matches) > 0:
+                        all_matches[source].extend(matches)
+                formatted_matches = formatter(all_matches, output=output)
+
+            t2 = time.time()
+            metrics.observe('facet.match', t2 - t1)
+
+        return formatted_matches
+
+    def imatch(
+        self,
+        corpora: Union[str, Iterable[str]],
+        bulk_size: int = 1,
+        **kwargs,
+    ) -> Iterator[Tuple[str, List[List[Dict[str, Any]]]]]:
+        """Generator of matches from corpora processed by worker processes.
+
+        Matches are yielded as soon as a worker completes a corpus item,
+        so the order of results is not deterministic.
+
+        Kwargs:
+            Options forwarded to 'imatch()' method of FACET workers.
+        """
+        # NOTE: Workers would overwrite each other's manifest.
+        if kwargs.get('manifest') is not None:
+            raise ValueError('manifest is not supported by parallel FACET')
 
         # Set corpus extraction for sources only
         corpus_kwargs = kwargs.pop('corpus_kwargs', {})
         corpus_kwargs['source_only'] = True
 
+        # Workers read the content of sources, so forward reading options.
+        kwargs['corpus_kwargs'] = {
+            k: corpus_kwargs[k]
+            for k in ('chunk_size', 'delimiter', 'encoding')
+            if k in corpus_kwargs
+        }
+
         func = functools.partial(
             self._worker,
             factory=self._factory,
             kwargs=kwargs,
         )
 
-        t1 = time.time()
-
         # NOTE: Need to compare with map_async()
         # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool.map_async
-        all_matches = collections.defaultdict(list)
         with multiprocessing.Pool(processes=self.num_procs) as pool:
-            # Combine matches from workers
             for matches in pool.imap_unordered(
                 func,
                 # Extract corpus items to distribute among workers
                 corpus_generator(corpora, **corpus_kwargs),
                 chunksize=bulk_size,
             ):
-                for k, v in matches.items():
-                    all_matches[k].extend(v)
-
-        t2 = time.time()
-        print(f'Matching all N-grams: {t2 - t1} s')
-
-        return formatter(all_matches, output=output)
+                yield from matches
 
     def close(self):
         pass
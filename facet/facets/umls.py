@@ -1,17 +1,36 @@
 import os
 import time
+import asyncio
+import functools
+import threading
+import collections
+import concurrent.futures
 from unidecode import unidecode
-from ..helpers import load_data
+from .. import metrics
+from ..helpers import (
+    load_data,
+    iter_chunk_rows,
+    iload_data_chunks,
+    ExternalGroups,
+)
 from ..database import (
     get_database,
     BaseDatabase,
+    BaseKVDatabase,
+    PrefixDatabase,
+)
+from ..matcher import (
+    BaseMatcher,
+    Simstring,
 )
+from ..records import MatchRecord
 from .base import BaseFacet
 from typing import (
     Any,
     List,
     Dict,
     Tuple,
+    Set,
     Union,
     Iterable,
 )
@@ -63,6 +82,16 @@ ACCEPTED_SEMTYPES = {
     'T191': 'Neoplastic Process'
 }
 
+# Attributes supported for partitioning the matcher's index.
+PARTITION_ATTRIBUTES = ('sty', 'sab')
+
+# Key of matcher's database that stores the partition values of each
+# partitioned attribute, {attribute: [value, ...]}.
+PARTITIONS_KEY = '__PARTITIONS__'
+
+# Prefix of keys of a partition in the matcher's database.
+PARTITION_KEY_PREFIX = '__PARTITION__'
+
 
 class UMLSFacet(BaseFacet):
     """FACET text matcher.
@@ -75,6 +104,24 @@ class UMLSFacet(BaseFacet):
         cuisty_db (str, BaseDatabase): Handle to database instance or database
             name for CUI-STY storage. Valid database values are: 'dict',
             'redis', 'elasticsearch'.
+
+        cui_cache_size (int): Max number of CUI-STY mappings kept in memory
+            for recently matched CUIs. If 0, no mappings are cached.
+
+        preload_cuisty (bool): If set, the CUI-STY table is loaded into
+            memory on first match. Use only if table fits in memory.
+
+    Notes:
+        * Concept data (CUI and STY) of matches are retrieved per sentence
+          with a single multi-key lookup per database. If concepts were
+          installed as joined records (see `_install()`), the CUI-STY
+          database is not accessed.
+
+        * If the matcher's index is partitioned by semantic types and/or
+          source vocabularies (see `_install()`), matches can be restricted
+          to them with 'sty' and 'sab' match options, and only the
+          selected partitions are searched. Each option is a value or an
+          iterable of values, e.g., `match(corpus, sty=['T047', 'T184'])`.
     """
 
     NAME = 'umlsfacet'
@@ -84,11 +131,20 @@ class UMLSFacet(BaseFacet):
         *,
         conso_db: Union[str, 'BaseDatabase'] = None,
         cuisty_db: Union[str, 'BaseDatabase'] = None,
+        cui_cache_size: int = 4096,
+        preload_cuisty: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
         self._conso_db = get_database(conso_db)
         self._cuisty_db = get_database(cuisty_db)
+        self._cui_cache_size = cui_cache_size
+        self._preload_cuisty = preload_cuisty
+        self._cui_cache = collections.OrderedDict()
+        self._cui_cache_lock = threading.Lock()
+        self._cuisty = None
+        self._partitions = None
+        self._partition_searches = {}
 
     @property
     def conso_db(self):
@@ -98,12 +154,28 @@ class UMLSFacet(BaseFacet):
     def cuisty_db(self):
         return self._cuisty_db
 
+    @property
+    def partitions(self) -> Dict[str, List[str]]:
+        """Partition values of each partitioned attribute of the matcher's
+        index, {attribute: [value, ...]}."""
+        if self._partitions is None:
+            partitions = (
+                self._matcher.db.get(PARTITIONS_KEY)
+                if isinstance(self._matcher.db, BaseKVDatabase)
+                else None
+            )
+            self._partitions = {} if partitions is None else partitions
+        return self._partitions
+
     def _install(
         self,
         data: str,
         *,
         cui_valids: Dict[str, Iterable[Any]] = None,
         sty_valids: Dict[str, Iterable[Any]] = {'sty': ACCEPTED_SEMTYPES},
+        join_concepts: bool = False,
+        memory_budget: int = None,
+        partition_by: Union[str, Iterable[str]] = None,
         **kwargs,
     ):
         """UMLS installation that minimizes database storage footprint
@@ -115,10 +187,36 @@ class UMLSFacet(BaseFacet):
         Args:
             data (str): Directory of UMLS RRF files.
 
+            join_concepts (bool): If set, CONCEPT-CUI database stores a
+                single record per term with its CUI and semantic types,
+                {'CUI': cui, 'STY': [sty, ...]}, so matches resolve concept
+                data with a single lookup. CUI-STY database is optional.
+
+            memory_budget (int): If set, RRF files are streamed and grouped
+                using an external sort which buffers approximately this
+                number of bytes before spilling to temporary files, see
+                `_install_external()`.
+
+            partition_by (Union[str, Iterable[str]]): Attributes, 'sty'
+                and/or 'sab', whose values partition the matcher's index,
+                see `_dump_partitions()`. Partitions are stored in the
+                matcher's database in addition to the whole index. Requires
+                a Simstring matcher with a key/value database and is not
+                supported with 'memory_budget'.
+
         Kwargs:
-            Options passed directly to '*load_data()' function.
+            Options passed directly to '*load_data()' function. Set
+            'num_procs' to parse RRF files with multiple processes.
+
+        Notes:
+            * MRSTY and MRCONSO files are parsed concurrently, see
+              `_load_tables()`.
         """
         t1 = time.time()
+        partition_by = self._parse_partition_by(
+            partition_by,
+            memory_budget=memory_budget,
+        )
 
         # NOTE: This allows user configuration to use either None or {}
         # for disabling these filters.
@@ -127,52 +225,49 @@ class UMLSFacet(BaseFacet):
         if sty_valids is None:
             sty_valids = {}
 
-        # NOTE: Even if 'conso_db' is None, we can filter based on semantic
-        # types selected.
-        if self._cuisty_db is not None:
-            print('Loading/parsing semantic types...')
-            start = time.time()
-            mrsty_file = os.path.join(data, 'MRSTY.RRF')
-            cuisty = load_data(
-                mrsty_file,
-                keys=['cui'],
-                values=['sty'],
-                headers=HEADERS_MRSTY,
-                valids={**cui_valids, **sty_valids},
-                multiple_values=True,
-                unique_values=True,
-                delimiter='|',
+        if memory_budget is not None:
+            self._install_external(
+                data,
+                cui_valids=cui_valids,
+                sty_valids=sty_valids,
+                join_concepts=join_concepts,
+                memory_budget=memory_budget,
                 **kwargs,
             )
-            curr_time = time.time()
-            print(f'Loading/parsing semantic types: {curr_time - start} s')
-
-            print('Writing semantic types...')
-            start = time.time()
-            # Stores {CUI:Semantic Type} mapping, cui: [sty, ...]
-            self._dump_kv(cuisty.items(), db=self._cuisty_db)
-            curr_time = time.time()
-            print(f'Writing semantic types: {curr_time - start} s')
+            t2 = time.time()
+            print(f'Total runtime: {t2 - t1} s')
+            return
 
-            # Join tables based on CUIs
-            if len(cui_valids) == 0:
-                cui_valids = {'cui': cuisty.keys()}
+        # NOTE: Concepts are filtered by semantic types only if CUI-STY
+        # table is stored or joined, semantic types of partitions do not
+        # filter the index.
+        join_cuisty = self._cuisty_db is not None or join_concepts
+        load_cuisty = join_cuisty or 'sty' in partition_by
 
-        print('Loading/parsing concepts...')
-        start = time.time()
-        mrconso_file = os.path.join(data, 'MRCONSO.RRF')
-        conso = load_data(
-            mrconso_file,
-            keys=['str'],
-            values=['cui'] if self._conso_db is not None else None,
-            headers=HEADERS_MRCONSO,
-            valids={**cui_valids, **{'lat': ['ENG']}},
-            converters={'str': [unidecode, str.lower]},
-            delimiter='|',
+        # NOTE: Even if 'conso_db' is None, we can filter based on semantic
+        # types selected.
+        conso, cuisty = self._load_tables(
+            data,
+            cui_valids=cui_valids,
+            sty_valids=sty_valids,
+            load_cuisty=load_cuisty,
+            load_cuis=self._conso_db is not None or 'sty' in partition_by,
+            join_cuis=join_cuisty and len(cui_valids) == 0,
             **kwargs,
         )
-        curr_time = time.time()
-        print(f'Loading/parsing concepts: {curr_time - start} s')
+
+        if load_cuisty:
+            if self._cuisty_db is not None:
+                print('Writing semantic types...')
+                start = time.time()
+                # Stores {CUI:Semantic Type} mapping, cui: [sty, ...]
+                self._dump_kv(cuisty.items(), db=self._cuisty_db)
+                curr_time = time.time()
+                print(f'Writing semantic types: {curr_time - start} s')
+
+            # Join tables based on CUIs
+            if join_cuisty and len(cui_valids) == 0:
+                cui_valids = {'cui': cuisty.keys()}
 
         if self._conso_db is not None:
             print('Writing concepts and matcher data...')
@@ -180,7 +275,18 @@ class UMLSFacet(BaseFacet):
             # Stores {Term:CUI} mapping, term: [CUI, ...]
             # NOTE: File lock in SQLite database prevents using matcher_kv()
             # self._dump_matcher_kv(conso.items(), db=self._conso_db)
-            self._dump_kv(conso.items(), db=self._conso_db)
+            if join_concepts:
+                # Stores {Term:Concept} mapping,
+                # term: {'CUI': CUI, 'STY': [sty, ...]}
+                self._dump_kv(
+                    (
+                        (term, {'CUI': cui, 'STY': cuisty.get(cui)})
+                        for term, cui in conso.items()
+                    ),
+                    db=self._conso_db,
+                )
+            else:
+                self._dump_kv(conso.items(), db=self._conso_db)
             self._dump_matcher(conso.keys())
             curr_time = time.time()
             print(f'Writing concepts and matcher data: {curr_time - start} s')
@@ -195,9 +301,409 @@ class UMLSFacet(BaseFacet):
             curr_time = time.time()
             print(f'Writing matcher data: {curr_time - start} s')
 
+        if len(partition_by) > 0:
+            self._dump_partitions(
+                data,
+                partition_by=partition_by,
+                conso=conso,
+                cuisty=cuisty,
+                valids={**cui_valids, **{'lat': ['ENG']}},
+                **kwargs,
+            )
+
         t2 = time.time()
         print(f'Total runtime: {t2 - t1} s')
 
+    def _load_tables(
+        self,
+        data: str,
+        *,
+        cui_valids: Dict[str, Iterable[Any]],
+        sty_valids: Dict[str, Iterable[Any]],
+        load_cuisty: bool,
+        load_cuis: bool,
+        join_cuis: bool,
+        **kwargs,
+    ) -> Tuple[
+        Union[Dict[str, str], List[str]],
+        Union[Dict[str, List[str]], None],
+    ]:
+        """Load CONCEPT-CUI and CUI-STY tables, see `_install()`.
+
+        Args:
+            data (str): Directory of UMLS RRF files.
+
+            load_cuisty (bool): If set, CUI-STY table is loaded.
+
+            load_cuis (bool): If set, CONCEPT-CUI table is loaded as a
+                mapping, else as a list of concepts.
+
+            join_cuis (bool): If set, concepts are joined with the CUIs of
+                CUI-STY table. Only applies if CUI-STY table is loaded.
+
+        Kwargs:
+            Options passed directly to 'load_data()' function.
+
+        Notes:
+            * If CUI-STY table is loaded, MRSTY and MRCONSO files are
+              parsed concurrently. Then, if 'join_cuis' is set, concepts
+              are joined with the CUIs of MRSTY, each concept
+              keeps its first CUI with accepted semantic types. This
+              requires keeping all the CUIs of concepts during parsing.
+
+            * Files parsed with multiple processes ('num_procs') are parsed
+              one after the other from the main thread, because worker
+              processes should not be forked while other threads run.
+        """
+        join_cuis = load_cuisty and join_cuis
+        load_conso = functools.partial(
+            type(self)._timed_load,
+            'concepts',
+            os.path.join(data, 'MRCONSO.RRF'),
+            keys=['str'],
+            values=['cui'] if load_cuis or join_cuis else None,
+            headers=HEADERS_MRCONSO,
+            valids={**cui_valids, **{'lat': ['ENG']}},
+            converters={'str': [unidecode, str.lower]},
+            multiple_values=join_cuis,
+            unique_values=join_cuis,
+            delimiter='|',
+            **kwargs,
+        )
+        if not load_cuisty:
+            return load_conso(), None
+
+        load_cuisty = functools.partial(
+            type(self)._timed_load,
+            'semantic types',
+            os.path.join(data, 'MRSTY.RRF'),
+            keys=['cui'],
+            values=['sty'],
+            headers=HEADERS_MRSTY,
+            valids={**cui_valids, **sty_valids},
+            multiple_values=True,
+            unique_values=True,
+            delimiter='|',
+            **kwargs,
+        )
+        if kwargs.get('num_procs', 1) > 1:
+            cuisty = load_cuisty()
+            conso = load_conso()
+        else:
+            with concurrent.futures.ThreadPoolExecutor(1) as executor:
+                conso_future = executor.submit(load_conso)
+                cuisty = load_cuisty()
+                conso = conso_future.result()
+
+        if join_cuis:
+            conso_cuis, conso = conso, {}
+            for term, cuis in conso_cuis.items():
+                for cui in cuis:
+                    if cui in cuisty:
+                        conso[term] = cui
+                        break
+            if not load_cuis:
+                conso = list(conso)
+        return conso, cuisty
+
+    @staticmethod
+    def _timed_load(name: str, *args, **kwargs) -> Any:
+        """Version of 'load_data()' that prints its runtime."""
+        print(f'Loading/parsing {name}...')
+        start = time.time()
+        data = load_data(*args, **kwargs)
+        curr_time = time.time()
+        print(f'Loading/parsing {name}: {curr_time - start} s')
+        return data
+
+    def clear_caches(self):
+        super().clear_caches()
+        self._cui_cache.clear()
+        self._cuisty = None
+        self._partitions = None
+        self._partition_searches.clear()
+
+    def _parse_partition_by(
+        self,
+        partition_by: Union[str, Iterable[str], None],
+        *,
+        memory_budget: int = None,
+    ) -> List[str]:
+        """Validate attributes for partitioning matcher's index, see
+        `_install()`."""
+        if partition_by is None:
+            return []
+        if isinstance(partition_by, str):
+            partition_by = [partition_by]
+        partition_by = list(dict.fromkeys(partition_by))
+        for attribute in partition_by:
+            if attribute not in PARTITION_ATTRIBUTES:
+                raise ValueError(f'invalid partition attribute, {attribute}')
+        if len(partition_by) > 0 and (
+            not isinstance(self._matcher, Simstring)
+            or not isinstance(self._matcher.db, BaseKVDatabase)
+        ):
+            raise ValueError('partitioned index requires a Simstring '
+                             'matcher with a key/value database')
+        if len(partition_by) > 0 and memory_budget is not None:
+            raise ValueError('partitioned index is not supported with '
+                             'memory budget')
+        return partition_by
+
+    def _dump_partitions(
+        self,
+        data: str,
+        *,
+        partition_by: List[str],
+        conso: Dict[str, str],
+        cuisty: Dict[str, List[str]] = None,
+        valids: Dict[str, Iterable[Any]],
+        **kwargs,
+    ):
+        """Stores terms in the matcher partitions of their attribute
+        values.
+
+        Terms are partitioned by the semantic types of their CUI ('sty'),
+        and by the source vocabularies of the MRCONSO rows they appear in
+        ('sab'). A term is stored in a partition per value.
+
+        Args:
+            data (str): Directory of UMLS RRF files.
+
+            conso (Dict[str, str]): Term-CUI mapping.
+
+            cuisty (Dict[str, List[str]]): CUI-STY mapping.
+
+            valids (Dict[str, Iterable[Any]]): Filters of MRCONSO rows.
+
+        Kwargs:
+            Options passed directly to 'load_data()' function.
+        """
+        partitions = dict(self.partitions)
+        for attribute in partition_by:
+            print(f'Writing {attribute.upper()} partitions...')
+            start = time.time()
+            if attribute == 'sty':
+                groups = (
+                    (term, cuisty.get(cui))
+                    for term, cui in conso.items()
+                )
+            else:
+                groups = load_data(
+                    os.path.join(data, 'MRCONSO.RRF'),
+                    keys=['str'],
+                    values=['sab'],
+                    headers=HEADERS_MRCONSO,
+                    valids=valids,
+                    converters={'str': [unidecode, str.lower]},
+                    multiple_values=True,
+                    unique_values=True,
+                    delimiter='|',
+                    **kwargs,
+                ).items()
+            values = self._dump_partition(attribute, groups)
+            partitions[attribute] = sorted(
+                values.union(partitions.get(attribute, ()))
+            )
+            curr_time = time.time()
+            print(f'Writing {attribute.upper()} partitions: '
+                  f'{curr_time - start} s')
+
+        self._matcher.db.set(PARTITIONS_KEY, partitions)
+        self._matcher.db.commit()
+
+    def _dump_partition(
+        self,
+        attribute: str,
+        groups: Iterable[Tuple[str, Iterable[str]]],
+        *,
+        bulk_size: int = 10000,
+    ) -> Set[str]:
+        """Stores (term, values) pairs in the partitions of an attribute,
+        returns the partition values."""
+        matchers = {}
+        for i, (term, values) in enumerate(groups, start=1):
+            for value in values or ():
+                matcher = matchers.get(value)
+                if matcher is None:
+                    matcher = self._partition_matcher(attribute, value)
+                    matchers[value] = matcher
+                matcher.insert(term)
+            if i % bulk_size == 0:
+                self._matcher.db.commit()
+        return set(matchers)
+
+    def _partition_matcher(self, attribute: str, value: str) -> 'Simstring':
+        """Matcher of a partition, its keys are stored with a prefix in the
+        matcher's database."""
+        return Simstring(
+            db=PrefixDatabase(
+                self._matcher.db,
+                prefix=f'{PARTITION_KEY_PREFIX}{attribute}:{value}:',
+            ),
+            alpha=self._matcher.alpha,
+            similarity=self._matcher.similarity,
+            ngram=self._matcher.ngram,
+        )
+
+    def _search_matcher(
+        self,
+        *,
+        sty: Union[str, Iterable[str]] = None,
+        sab: Union[str, Iterable[str]] = None,
+        **kwargs,
+    ) -> Tuple[Union['BaseMatcher', '_PartitionSearch'], Dict[str, Any]]:
+        """Matcher of partitions selected by semantic types and source
+        vocabularies, see `_PartitionSearch`.
+
+        Kwargs:
+            Options passed to `Matcher.search()`.
+        """
+        filters = tuple(
+            (
+                attribute,
+                tuple(sorted({values} if isinstance(values, str) else values)),
+            )
+            for attribute, values in (('sty', sty), ('sab', sab))
+            if values is not None
+        )
+        if len(filters) == 0:
+            return self._matcher, kwargs
+
+        matcher = self._partition_searches.get(filters)
+        if matcher is None:
+            for attribute, _ in filters:
+                if attribute not in self.partitions:
+                    raise ValueError(
+                        f'index is not partitioned by {attribute}'
+                    )
+            matcher = _PartitionSearch([
+                [
+                    self._partition_matcher(attribute, value)
+                    for value in values
+                    if value in self.partitions[attribute]
+                ]
+                for attribute, values in filters
+            ])
+            self._partition_searches[filters] = matcher
+
+        # NOTE: Partition matchers are created with the matcher's settings,
+        # pass them explicitly in case they changed.
+        return matcher, {
+            'alpha': self._matcher.alpha,
+            'similarity': self._matcher.similarity,
+            **kwargs,
+        }
+
+    def _install_external(
+        self,
+        data: str,
+        *,
+        cui_valids: Dict[str, Iterable[Any]],
+        sty_valids: Dict[str, Iterable[Any]],
+        join_concepts: bool = False,
+        memory_budget: int = 2**28,
+        **kwargs,
+    ):
+        """Memory-bounded UMLS installation, see `_install()`.
+
+        Parsed rows are grouped by key with an external sort, and groups
+        are streamed into the databases and matcher.
+
+        Notes:
+            * Proxy install is disabled because proxy databases hold
+              all records in memory.
+
+            * The set of CUIs with accepted semantic types is kept in memory
+              for joining tables, and the CUI-STY mapping if concepts are
+              joined.
+        """
+        # NOTE: Files are streamed sequentially.
+        kwargs.pop('num_procs', None)
+        use_proxy_install = self._use_proxy_install
+        self._use_proxy_install = False
+
+        try:
+            cuisty = {}
+            if self._cuisty_db is not None or join_concepts:
+                print('Loading/parsing/writing semantic types...')
+                start = time.time()
+                mrsty_file = os.path.join(data, 'MRSTY.RRF')
+                with ExternalGroups(
+                    iter_chunk_rows(
+                        iload_data_chunks(
+                            mrsty_file,
+                            keys=['cui'],
+                            values=['sty'],
+                            headers=HEADERS_MRSTY,
+                            valids={**cui_valids, **sty_valids},
+                            delimiter='|',
+                            **kwargs,
+                        ),
+                    ),
+                    memory_budget=memory_budget,
+                    unique_values=True,
+                ) as groups:
+                    # Stores {CUI:Semantic Type} mapping, cui: [sty, ...]
+                    if self._cuisty_db is not None:
+                        self._dump_kv(groups, db=self._cuisty_db)
+
+                    # Join tables based on CUIs
+                    if join_concepts:
+                        cuisty = dict(groups)
+                        cuis = cuisty.keys()
+                    else:
+                        cuis = {cui for cui, _ in groups}
+                    if len(cui_valids) == 0:
+                        cui_valids = {'cui': cuis}
+                curr_time = time.time()
+                print(f'Loading/parsing/writing semantic types: '
+                      f'{curr_time - start} s')
+
+            print('Loading/parsing/writing concepts and matcher data...')
+            start = time.time()
+            mrconso_file = os.path.join(data, 'MRCONSO.RRF')
+            conso = iter_chunk_rows(
+                iload_data_chunks(
+                    mrconso_file,
+                    keys=['str'],
+                    values=['cui'] if self._conso_db is not None else None,
+                    headers=HEADERS_MRCONSO,
+                    valids={**cui_valids, **{'lat': ['ENG']}},
+                    converters={'str': [unidecode, str.lower]},
+                    delimiter='|',
+                    **kwargs,
+                ),
+            )
+            if self._conso_db is None:
+                conso = ((term, None) for term in conso)
+
+            with ExternalGroups(conso, memory_budget=memory_budget) as groups:
+                if self._conso_db is not None:
+                    # Consider the CUI of the first appearance of a term.
+                    if join_concepts:
+                        # Stores {Term:Concept} mapping,
+                        # term: {'CUI': CUI, 'STY': [sty, ...]}
+                        records = (
+                            (
+                                term,
+                                {'CUI': cuis[0], 'STY': cuisty.get(cuis[0])},
+                            )
+                            for term, cuis in groups
+                        )
+                    else:
+                        # Stores {Term:CUI} mapping
+                        records = ((term, cuis[0]) for term, cuis in groups)
+                    self._dump_kv(records, db=self._conso_db)
+
+                # Stores Matcher-specific data
+                self._dump_matcher(term for term, _ in groups)
+            curr_time = time.time()
+            print('Loading/parsing/writing concepts and matcher data: '
+                  f'{curr_time - start} s')
+        finally:
+            self._use_proxy_install = use_proxy_install
+
     def _match(
         self,
         ngram_struct: Tuple[int, int, str],
@@ -211,31 +717,193 @@ class UMLSFacet(BaseFacet):
             Options passed directly to `Matcher.search()`.
         """
         begin, end, ngram = ngram_struct
-        ngram_matches = []
-        for candidate, similarity in self._matcher.search(
-            ngram,
-            **kwargs,
-        ):
-            ngram_match = {
-                'begin': begin,
-                'end': end,
-                'ngram': ngram,
-                'candidate': candidate,
-                'similarity': similarity,
-            }
-
-            if self._conso_db is not None:
-                cui = self._conso_db.get(candidate)
-                if cui is not None:
-                    ngram_match['CUI'] = cui
-                    if self._cuisty_db is not None:
-                        ngram_match['STY'] = self._cuisty_db.get(cui)
-            ngram_matches.append(ngram_match)
+        return [
+            MatchRecord(begin, end, ngram, candidate, similarity)
+            for candidate, similarity in self._search(ngram, **kwargs)
+        ]
 
-        return ngram_matches
+    def _match_sentence(
+        self,
+        sentence: Tuple[int, int, str],
+        **kwargs,
+    ) -> List[List[Dict[str, Any]]]:
+        """Match N-grams of a sentence and add their concept data.
+
+        Kwargs:
+            Options forwarded to `BaseFacet._match_sentence()`.
+        """
+        sentence_matches = super()._match_sentence(sentence, **kwargs)
+        if self._conso_db is not None and len(sentence_matches) > 0:
+            self._add_concepts(sentence_matches)
+        return sentence_matches
+
+    def _add_concepts(self, sentence_matches: List[List[Dict[str, Any]]]):
+        """Add CUI and STY to matches using a single lookup per database."""
+        candidates = list({
+            ngram_match['candidate']
+            for ngram_matches in sentence_matches
+            for ngram_match in ngram_matches
+        })
+        candidate_concepts = dict(zip(
+            candidates,
+            type(self)._mget(self._conso_db, candidates),
+        ))
+
+        # NOTE: Joined records already contain the semantic types.
+        cuis = {
+            concept
+            for concept in candidate_concepts.values()
+            if concept is not None and not isinstance(concept, dict)
+        }
+        cui_stys = (
+            self._get_stys(cuis)
+            if self._cuisty_db is not None and len(cuis) > 0
+            else None
+        )
+
+        for ngram_matches in sentence_matches:
+            for ngram_match in ngram_matches:
+                concept = candidate_concepts[ngram_match['candidate']]
+                if concept is None:
+                    continue
+                if isinstance(concept, dict):
+                    ngram_match.update(concept)
+                else:
+                    ngram_match['CUI'] = concept
+                    if cui_stys is not None:
+                        ngram_match['STY'] = cui_stys[concept]
+
+    def _get_stys(self, cuis: Iterable[str]) -> Dict[str, Any]:
+        """Get semantic types of CUIs from preloaded table, cache, or
+        CUI-STY database."""
+        if self._preload_cuisty:
+            if self._cuisty is None:
+                self._cuisty = self._load_cuisty()
+            return {cui: self._cuisty.get(cui) for cui in cuis}
+
+        cui_stys = {}
+        missing_cuis = []
+        with self._cui_cache_lock:
+            for cui in cuis:
+                if cui in self._cui_cache:
+                    self._cui_cache.move_to_end(cui)
+                    cui_stys[cui] = self._cui_cache[cui]
+                else:
+                    missing_cuis.append(cui)
+        metrics.incr('umls.cui_cache.hits', len(cui_stys))
+        metrics.incr('umls.cui_cache.misses', len(missing_cuis))
+
+        if len(missing_cuis) > 0:
+            stys = type(self)._mget(self._cuisty_db, missing_cuis)
+            with self._cui_cache_lock:
+                for cui, sty in zip(missing_cuis, stys):
+                    cui_stys[cui] = sty
+                    if self._cui_cache_size > 0:
+                        self._cui_cache[cui] = sty
+
+                # Evict least recently used CUIs
+                while len(self._cui_cache) > self._cui_cache_size:
+                    self._cui_cache.popitem(last=False)
+
+        return cui_stys
+
+    def _load_cuisty(self, *, bulk_size: int = 10000) -> Dict[str, Any]:
+        """Load CUI-STY table into memory."""
+        cuisty = {}
+        cuis = list(self._cuisty_db.keys())
+        for i in range(0, len(cuis), bulk_size):
+            bulk_cuis = cuis[i:i + bulk_size]
+            cuisty.update(zip(
+                bulk_cuis,
+                type(self)._mget(self._cuisty_db, bulk_cuis),
+            ))
+        return cuisty
+
+    @staticmethod
+    def _mget(db: 'BaseDatabase', keys: List[Any]) -> List[Any]:
+        if isinstance(db, BaseKVDatabase):
+            return db.mget(keys)
+        return [db.get(key) for key in keys]
 
     def _close(self):
         if self._conso_db is not None:
             self._conso_db.close()
         if self._cuisty_db is not None:
             self._cuisty_db.close()
+
+
+class _PartitionSearch:
+    """Search in the union of the partitions selected for each attribute,
+    intersected across attributes, see `UMLSFacet._search_matcher()`.
+
+    Args:
+        partitions (List[List[BaseMatcher]]): Matchers of selected
+            partitions of each attribute.
+    """
+
+    def __init__(self, partitions: List[List['BaseMatcher']]):
+        self._partitions = partitions
+
+    def search(
+        self,
+        string: str,
+        *,
+        rank: bool = True,
+        **kwargs,
+    ) -> List[Tuple[str, float]]:
+        """Search string in selected partitions, see `Matcher.search()`."""
+        return type(self)._merge(
+            [
+                [matcher.search(string, **kwargs) for matcher in matchers]
+                for matchers in self._partitions
+            ],
+            rank=rank,
+        )
+
+    async def asearch(
+        self,
+        string: str,
+        *,
+        rank: bool = True,
+        **kwargs,
+    ) -> List[Tuple[str, float]]:
+        """Asynchronous version of `search()`."""
+        responses = iter(await asyncio.gather(*(
+            matcher.asearch(string, **kwargs)
+            for matchers in self._partitions
+            for matcher in matchers
+        )))
+        return type(self)._merge(
+            [
+                [next(responses) for _ in matchers]
+                for matchers in self._partitions
+            ],
+            rank=rank,
+        )
+
+    @staticmethod
+    def _merge(
+        results: List[List[List[Tuple[str, float]]]],
+        *,
+        rank: bool = True,
+    ) -> List[Tuple[str, float]]:
+        """Union of results of partitions of each attribute, intersected
+        across attributes."""
+        selected = None
+        for attribute_results in results:
+            similarities = {}
+            for strings_and_similarities in attribute_results:
+                similarities.update(strings_and_similarities)
+            selected = (
+                similarities
+                if selected is None
+                else {
+                    string: similarity
+                    for string, similarity in selected.items()
+                    if string in similarities
+                }
+            )
+        strings_and_similarities = list(selected.items())
+        if rank:
+            strings_and_similarities.sort(key=lambda ss: ss[1], reverse=True)
+        return strings_and_similarities
@@ -7,6 +7,7 @@ from .serializer import serializer_map
 from .matcher import matcher_map
 from .matcher.similarity import similarity_map
 from .matcher.ngram import ngram_map
+from .profiler import profiler_map
 from .configuration import Configuration
 from typing import (
     Any,
@@ -31,6 +32,7 @@ class FacetFactory:
         'similarity': similarity_map,
         'ngram': ngram_map,
         'serializer': serializer_map,
+        'profiler': profiler_map,
     }
 
     # NOTE: For all classes, map parameter names that support objects to their
@@ -42,6 +44,8 @@ class FacetFactory:
         'cache_db': 'database',   # Matcher cache database
         'cuisty_db': 'database',  # (UMLSFacet) CUI-STY database
         'conso_db': 'database',   # (UMLSFacet) CONCEPT-CUI database
+        'profile': 'profiler',    # FACET profiler
+        'sentence_cache_db': 'database',  # FACET sentence cache database
     }
 
     # NOTE: These are CLI parameters that should be removed so that factory
@@ -53,6 +57,7 @@ class FacetFactory:
         'host',
         'port',
         'dump_config',
+        'metrics',
     }
 
     # Configuration keyword used to specify classes.
@@ -1,24 +1,41 @@
-from .base import BaseFormatter
-from .json import JSONFormatter
+from .base import (
+    BaseFormatter,
+    BaseStreamFormatter,
+)
+from .json import (
+    JSONFormatter,
+    JSONLinesFormatter,
+)
 from .yaml import YAMLFormatter
-from .xml import XMLFormatter
+from .xml import (
+    XMLFormatter,
+    XMLStreamFormatter,
+)
 from .pickle import (
     PickleFormatter,
     CloudpickleFormatter,
 )
-from .csv import CSVFormatter
+from .csv import (
+    CSVFormatter,
+    CSVStreamFormatter,
+)
 from .null import NullFormatter
+from .columnar import ColumnarFormatter
 from typing import Union
 
 
 formatter_map = {
     JSONFormatter.NAME: JSONFormatter,
+    JSONLinesFormatter.NAME: JSONLinesFormatter,
     YAMLFormatter.NAME: YAMLFormatter,
     XMLFormatter.NAME: XMLFormatter,
+    XMLStreamFormatter.NAME: XMLStreamFormatter,
     PickleFormatter.NAME: PickleFormatter,
     CloudpickleFormatter.NAME: CloudpickleFormatter,
     CSVFormatter.NAME: CSVFormatter,
+    CSVStreamFormatter.NAME: CSVStreamFormatter,
     NullFormatter.NAME: NullFormatter,
+    ColumnarFormatter.NAME: ColumnarFormatter,
     None: NullFormatter,
 }
 
@@ -1,3 +1,5 @@
+import io
+import collections
 from abc import (
     ABC,
     abstractmethod,
@@ -7,11 +9,17 @@ from typing import (
     Any,
     List,
     Dict,
+    Tuple,
     Union,
+    Iterable,
+    TextIO,
 )
 
 
-__all__ = ['BaseFormatter']
+__all__ = [
+    'BaseFormatter',
+    'BaseStreamFormatter',
+]
 
 
 class BaseFormatter(ABC):
@@ -19,10 +27,18 @@ class BaseFormatter(ABC):
 
     def format(
         self,
-        data: Dict[str, List[List[Dict[str, Any]]]],
+        data: Union[
+            Dict[str, List[List[Dict[str, Any]]]],
+            Iterable[Tuple[str, List[List[Dict[str, Any]]]]],
+        ],
         *,
         output: str = None,
     ) -> Any:
+        # NOTE: Support streams of (source, matches) pairs, as generated by
+        # 'imatch()', by combining them into a single mapping.
+        if not hasattr(data, 'items'):
+            data = type(self)._collect(data)
+
         formatted_data = self._format(data)
 
         if output:
@@ -35,6 +51,84 @@ class BaseFormatter(ABC):
 
     __call__ = format
 
+    @staticmethod
+    def _collect(
+        data: Iterable[Tuple[str, List[List[Dict[str, Any]]]]],
+    ) -> Dict[str, List[List[Dict[str, Any]]]]:
+        matches = collections.defaultdict(list)
+        for source, source_matches in data:
+            if len(source_matches) > 0:
+                matches[source].extend(source_matches)
+        return matches
+
     @abstractmethod
     def _format(self, data) -> Union[str, bytes]:
         pass
+
+
+class BaseStreamFormatter(BaseFormatter):
+    """Class supporting incremental results formatting and writing to stream.
+
+    Records are formatted and written as they arrive from a stream of
+    (source, matches) pairs, as generated by 'imatch()', so memory usage
+    does not depends on the size of the results.
+
+    Notes:
+        * Output can be a file name or a writable file object
+          (e.g., sys.stdout). If no output is provided, the formatted
+          results are returned as a string.
+    """
+
+    def format(
+        self,
+        data: Union[
+            Dict[str, List[List[Dict[str, Any]]]],
+            Iterable[Tuple[str, List[List[Dict[str, Any]]]]],
+        ],
+        *,
+        output: Union[str, TextIO] = None,
+    ) -> Union[str, None]:
+        if hasattr(data, 'items'):
+            data = data.items()
+
+        if not output:
+            return self._format(data)
+
+        if hasattr(output, 'write'):
+            self._write(data, output)
+        else:
+            with open(expand_envvars(output), 'w') as fd:
+                self._write(data, fd)
+
+    __call__ = format
+
+    def _format(self, data) -> str:
+        fd = io.StringIO()
+        self._write(data, fd)
+        return fd.getvalue()
+
+    def _write(
+        self,
+        data: Iterable[Tuple[str, List[List[Dict[str, Any]]]]],
+        fd: TextIO,
+    ):
+        self._write_header(fd)
+        for source, matches in data:
+            if len(matches) > 0:
+                self._write_record(source, matches, fd)
+        self._write_footer(fd)
+
+    def _write_header(self, fd: TextIO):
+        pass
+
+    def _write_footer(self, fd: TextIO):
+        pass
+
+    @abstractmethod
+    def _write_record(
+        self,
+        source: str,
+        matches: List[List[Dict[str, Any]]],
+        fd: TextIO,
+    ):
+        pass
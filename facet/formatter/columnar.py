@@ -0,0 +1,49 @@
+from ..records import MatchTable
+from ..helpers import expand_envvars
+from .base import BaseFormatter
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Union,
+    Iterable,
+)
+
+
+__all__ = ['ColumnarFormatter']
+
+
+class ColumnarFormatter(BaseFormatter):
+    """Columnar formatter, see `MatchTable`.
+
+    Notes:
+        * If an output is provided, the table is written in Parquet
+          format.
+    """
+
+    NAME = 'columnar'
+
+    def format(
+        self,
+        data: Union[
+            Dict[str, List[List[Dict[str, Any]]]],
+            Iterable[Tuple[str, List[List[Dict[str, Any]]]]],
+        ],
+        *,
+        output: str = None,
+    ) -> Union['MatchTable', None]:
+        table = self._format(data)
+        if output:
+            import pyarrow.parquet
+            pyarrow.parquet.write_table(
+                table.to_arrow(),
+                expand_envvars(output),
+            )
+        else:
+            return table
+
+    __call__ = format
+
+    def _format(self, data):
+        return MatchTable(data)
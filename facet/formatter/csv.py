@@ -1,9 +1,15 @@
 import io
 import csv
-from .base import BaseFormatter
+from .base import (
+    BaseFormatter,
+    BaseStreamFormatter,
+)
 
 
-__all__ = ['CSVFormatter']
+__all__ = [
+    'CSVFormatter',
+    'CSVStreamFormatter',
+]
 
 
 class CSVFormatter(BaseFormatter):
@@ -24,7 +30,38 @@ class CSVFormatter(BaseFormatter):
         writer.writeheader()
         for src, v1 in data.items():
             for v2 in v1:
-                for v3 in v2:
-                    v3['source'] = src
-                writer.writerows(v2)
+                writer.writerows({'source': src, **v3} for v3 in v2)
         return fd.getvalue()
+
+
+class CSVStreamFormatter(BaseStreamFormatter):
+    """CSV formatter, field names are resolved from the first match."""
+
+    NAME = 'csvstream'
+
+    def _write_header(self, fd):
+        self._writer = None
+
+    def _write_record(self, source, matches, fd):
+        if self._writer is None:
+            fieldnames = ['source'] + list(matches[0][0].keys())
+            # NOTE: Matches can have different fields (e.g., federated
+            # dictionaries), fields not in the header are ignored and
+            # missing fields are left empty.
+            self._writer = csv.DictWriter(
+                fd,
+                fieldnames,
+                restval='',
+                extrasaction='ignore',
+                lineterminator='\n',
+            )
+            self._writer.writeheader()
+
+        for ngram_matches in matches:
+            self._writer.writerows(
+                {'source': source, **ngram_match}
+                for ngram_match in ngram_matches
+            )
+
+    def _write_footer(self, fd):
+        self._writer = None
@@ -1,8 +1,15 @@
 import json
-from .base import BaseFormatter
+from ..records import json_default
+from .base import (
+    BaseFormatter,
+    BaseStreamFormatter,
+)
 
 
-__all__ = ['JSONFormatter']
+__all__ = [
+    'JSONFormatter',
+    'JSONLinesFormatter',
+]
 
 
 class JSONFormatter(BaseFormatter):
@@ -10,4 +17,17 @@ class JSONFormatter(BaseFormatter):
     NAME = 'json'
 
     def _format(self, data):
-        return json.dumps(data, indent=2)
+        return json.dumps(data, indent=2, default=json_default)
+
+
+class JSONLinesFormatter(BaseStreamFormatter):
+    """JSON Lines formatter, one {source, matches} object per line."""
+
+    NAME = 'jsonl'
+
+    def _write_record(self, source, matches, fd):
+        fd.write(json.dumps(
+            {'source': source, 'matches': matches},
+            default=json_default,
+        ))
+        fd.write('\n')
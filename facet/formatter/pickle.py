@@ -1,5 +1,6 @@
 import pickle
 import cloudpickle
+from ..records import to_builtin
 from .base import BaseFormatter
 
 
@@ -14,7 +15,7 @@ class PickleFormatter(BaseFormatter):
     NAME = 'pickle'
 
     def _format(self, data):
-        return pickle.dumps(data)
+        return pickle.dumps(to_builtin(data))
 
 
 class CloudpickleFormatter(BaseFormatter):
@@ -22,4 +23,4 @@ class CloudpickleFormatter(BaseFormatter):
     NAME = 'cloudpickle'
 
     def _format(self, data):
-        return cloudpickle.dumps(data)
+        return cloudpickle.dumps(to_builtin(data))
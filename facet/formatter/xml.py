@@ -1,9 +1,16 @@
 import dicttoxml
 import xml.dom.minidom
-from .base import BaseFormatter
+from ..records import to_builtin
+from .base import (
+    BaseFormatter,
+    BaseStreamFormatter,
+)
 
 
-__all__ = ['XMLFormatter']
+__all__ = [
+    'XMLFormatter',
+    'XMLStreamFormatter',
+]
 
 
 class XMLFormatter(BaseFormatter):
@@ -12,5 +19,28 @@ class XMLFormatter(BaseFormatter):
 
     def _format(self, data):
         return xml.dom.minidom.parseString(
-            dicttoxml.dicttoxml(data, attr_type=False)
+            dicttoxml.dicttoxml(to_builtin(data), attr_type=False)
         ).toprettyxml(indent='  ')
+
+
+class XMLStreamFormatter(BaseStreamFormatter):
+    """XML formatter, uses the same element layout as 'XMLFormatter' but
+    without pretty printing."""
+
+    NAME = 'xmlstream'
+
+    def _write_header(self, fd):
+        fd.write('<?xml version="1.0" encoding="UTF-8" ?>\n<root>\n')
+
+    def _write_record(self, source, matches, fd):
+        fd.write(
+            dicttoxml.dicttoxml(
+                {source: to_builtin(matches)},
+                root=False,
+                attr_type=False,
+            ).decode()
+        )
+        fd.write('\n')
+
+    def _write_footer(self, fd):
+        fd.write('</root>\n')
@@ -1,4 +1,5 @@
 import yaml
+from ..records import to_builtin
 from .base import BaseFormatter
 
 
@@ -10,4 +11,4 @@ class YAMLFormatter(BaseFormatter):
     NAME = 'yaml'
 
     def _format(self, data):
-        return yaml.dump(data)
+        return yaml.dump(to_builtin(data))
@@ -1,7 +1,29 @@
+import io
 import os
+import sys
+import bz2
+import csv
+import gzip
+import heapq
+import json
+import lzma
+import mmap
+import stat
+import numpy
+import pickle
+import codecs
+import locale
 import pandas
+import pyarrow
+import tarfile
+import zipfile
+import tempfile
+import functools
+import itertools
 import collections
+import multiprocessing
 import urllib.parse
+from unidecode import unidecode
 from typing import (
     Any,
     List,
@@ -11,17 +33,29 @@ from typing import (
     Callable,
     Iterable,
     Iterator,
+    BinaryIO,
+    TextIO,
 )
 
 
 __all__ = [
     'load_data',
+    'split_file',
+    'peak_memory',
+    'ExternalGroups',
     'iload_data',
+    'iload_data_chunks',
+    'iter_chunk_rows',
+    'data_filetype',
     'unpack_dir',
     'valid_item',
     'is_iterable',
     'iterable_true',
     'corpus_generator',
+    'corpus_file_format',
+    'iread_text',
+    'iread_records',
+    'iread_corpus_file',
     'valid_items_from_dict',
     'filter_indices_and_values',
     'get_obj_map_key',
@@ -145,71 +179,378 @@ def filter_indices_and_values(
     return ((idx, val) for idx, val in enumerate(iterable) if predicate(val))
 
 
-def iload_data(
+def _column_mask(
+    column: 'pandas.Series',
+    *,
+    valids: 'pandas.Index' = None,
+    invalids: 'pandas.Index' = None,
+) -> Union['numpy.ndarray', None]:
+    """Vectorized version of 'valid_item()' for a column of a dataframe,
+    returns None if column is not filtered.
+
+    Notes:
+        * Membership is tested with the hash table of the (unique)
+          indexes, which is built once and reused for every chunk.
+          'Series.isin()' rebuilds its value set for every call on Arrow
+          strings, which is about 100 times slower for 25k CUIs.
+    """
+    mask = None
+    if valids is not None:
+        mask = valids.get_indexer(column) >= 0
+    if invalids is not None:
+        invalid_mask = invalids.get_indexer(column) < 0
+        mask = invalid_mask if mask is None else mask & invalid_mask
+    return mask
+
+
+def _unidecode_column(column: 'pandas.Series') -> 'pandas.Series':
+    # NOTE: ASCII values are not modified by unidecode, so only
+    # non-ASCII values are converted.
+    mask = column.str.contains(r'[^\x00-\x7f]', regex=True)
+    if mask.any():
+        column = column.copy()
+        column[mask] = column[mask].map(unidecode)
+    return column
+
+
+# Vectorized equivalents of common converter functions for columns of
+# strings.
+_COLUMN_CONVERTERS = {
+    str.lower: lambda column: column.str.lower(),
+    str.upper: lambda column: column.str.upper(),
+    str.strip: lambda column: column.str.strip(),
+    unidecode: _unidecode_column,
+}
+
+
+def _convert_column(
+    column: 'pandas.Series',
+    converters: Union[Callable, Iterable[Callable]],
+) -> 'pandas.Series':
+    """Apply converter functions to a column of a dataframe."""
+    if callable(converters):
+        converters = (converters,)
+    is_string = pandas.api.types.is_string_dtype(column)
+    for f in converters:
+        if is_string and f in _COLUMN_CONVERTERS:
+            column = _COLUMN_CONVERTERS[f](column)
+        else:
+            column = column.map(f)
+            is_string = pandas.api.types.is_string_dtype(column)
+    return column
+
+
+def _arrow_column_mask(
+    column: 'pyarrow.Array',
+    *,
+    valids: 'pyarrow.Array' = None,
+    invalids: 'pyarrow.Array' = None,
+) -> Union['pyarrow.BooleanArray', None]:
+    """Version of '_column_mask()' for a column of a record batch,
+    returns None if column is not filtered."""
+    import pyarrow.compute
+    mask = None
+    if valids is not None:
+        mask = pyarrow.compute.is_in(column, value_set=valids)
+    if invalids is not None:
+        invalid_mask = pyarrow.compute.invert(
+            pyarrow.compute.is_in(column, value_set=invalids)
+        )
+        mask = (
+            invalid_mask
+            if mask is None
+            else pyarrow.compute.and_(mask, invalid_mask)
+        )
+    return mask
+
+
+def _unidecode_arrow_column(column: 'pyarrow.Array') -> 'pyarrow.Array':
+    import pyarrow.compute
+    # NOTE: ASCII values are not modified by unidecode, so only
+    # non-ASCII values are converted.
+    mask = pyarrow.compute.invert(pyarrow.compute.string_is_ascii(column))
+    if pyarrow.compute.any(mask).as_py():
+        column = pyarrow.compute.replace_with_mask(
+            column,
+            mask,
+            pyarrow.array(
+                map(unidecode, column.filter(mask).to_pylist()),
+                type=column.type,
+            ),
+        )
+    return column
+
+
+# Arrow compute equivalents of common converter functions for columns of
+# strings, see '_arrow_column_converters()'.
+_ARROW_COLUMN_CONVERTERS = None
+
+
+def _arrow_column_converters() -> Dict[Callable, Callable]:
+    # NOTE: Arrow compute module is imported on first use, so that only
+    # loading Arrow-based files requires a recent Arrow version.
+    global _ARROW_COLUMN_CONVERTERS
+    if _ARROW_COLUMN_CONVERTERS is None:
+        import pyarrow.compute
+        _ARROW_COLUMN_CONVERTERS = {
+            str.lower: pyarrow.compute.utf8_lower,
+            str.upper: pyarrow.compute.utf8_upper,
+            str.strip: pyarrow.compute.utf8_trim_whitespace,
+            unidecode: _unidecode_arrow_column,
+        }
+    return _ARROW_COLUMN_CONVERTERS
+
+
+def _convert_arrow_column(
+    column: 'pyarrow.Array',
+    converters: Union[Callable, Iterable[Callable]],
+) -> 'pyarrow.Array':
+    """Apply converter functions to a column of a record batch."""
+    if callable(converters):
+        converters = (converters,)
+    arrow_converters = _arrow_column_converters()
+    for f in converters:
+        if (
+            pyarrow.types.is_string(column.type)
+            or pyarrow.types.is_large_string(column.type)
+        ) and f in arrow_converters:
+            column = arrow_converters[f](column)
+        else:
+            column = pyarrow.array(map(f, column.to_pylist()))
+    return column
+
+
+# File extensions of data files read with Arrow, other files are read
+# as delimited text.
+DATA_FILETYPE_EXTENSIONS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+def data_filetype(data, filetype: str = None) -> str:
+    """Type of data file for loading data.
+
+    Args:
+        data (str): File or buffer.
+
+        filetype (str): Type of file, 'csv', 'parquet', 'arrow', 'jsonl'.
+            If None, it is selected from the file extension, and defaults
+            to 'csv'.
+    """
+    if filetype is not None:
+        filetype = filetype.lower()
+        if filetype not in ('csv', *DATA_FILETYPE_EXTENSIONS.values()):
+            raise ValueError(f'invalid data file type, {filetype}')
+        return filetype
+    if isinstance(data, str):
+        return DATA_FILETYPE_EXTENSIONS.get(
+            os.path.splitext(data)[1].lower(),
+            'csv',
+        )
+    return 'csv'
+
+
+def _iread_record_batches(
     data,
     *,
-    keys: Iterable[Union[str, int]] = (0,),
-    values: Iterable[Union[str, int]] = None,
-    headers: Iterable[Union[str, int]] = None,
-    valids: Dict[Union[str, int], Iterable[Any]] = None,
-    invalids: Dict[Union[str, int], Iterable[Any]] = None,
+    filetype: str,
+    columns: Iterable[Union[str, int]],
+    headers: Iterable[str] = None,
+    chunksize: int = 10000,
+) -> Iterator[Tuple['pyarrow.Array', ...]]:
+    """Generator for chunks of columns of an Arrow-based file.
+
+    Args:
+        columns (Iterable[str|int]): Column names or indices.
+            If str and 'headers' is None, then it corresponds to the
+            names in the file's schema.
+
+        headers (Iterable[str]): Column names, replaces names in the
+            file's schema.
+
+    Notes:
+        * Parquet files are read with column projection.
+          Arrow IPC files are memory-mapped, so columns are not copied.
+          JSONL files are parsed by blocks.
+
+        * Arrow modules are imported on first use. Arrow-based files
+          require a version of Arrow with the compute functions used for
+          filtering and converting columns (pyarrow>=5.0), and JSONL files
+          are parsed by blocks only if the streaming reader is available.
+    """
+    def resolve(names):
+        if headers is not None:
+            names = list(headers)
+        return [
+            col if isinstance(col, int) else names.index(col)
+            for col in columns
+        ]
+
+    if filetype == 'parquet':
+        import pyarrow.parquet
+        reader = pyarrow.parquet.ParquetFile(data)
+        names = reader.schema_arrow.names
+        indices = resolve(names)
+        projection = list(dict.fromkeys(names[i] for i in indices))
+        batches = reader.iter_batches(batch_size=chunksize,
+                                      columns=projection)
+        indices = [projection.index(names[i]) for i in indices]
+    elif filetype == 'arrow':
+        import pyarrow.ipc
+        source = pyarrow.memory_map(data)
+        try:
+            reader = pyarrow.ipc.open_file(source)
+            batches = map(reader.get_batch, range(reader.num_record_batches))
+        except pyarrow.ArrowInvalid:
+            source.seek(0)
+            reader = pyarrow.ipc.open_stream(source)
+            batches = reader
+        indices = resolve(reader.schema.names)
+    elif filetype == 'jsonl':
+        import pyarrow.json
+        # NOTE: Streaming reader is not available in old Arrow versions.
+        if hasattr(pyarrow.json, 'open_json'):
+            reader = pyarrow.json.open_json(data)
+            batches = reader
+        else:
+            reader = pyarrow.json.read_json(data)
+            batches = reader.to_batches()
+        indices = resolve(reader.schema.names)
+    else:
+        raise ValueError(f'invalid Arrow data file type, {filetype}')
+
+    for batch in batches:
+        # NOTE: Slices of record batches are zero-copy.
+        for offset in range(0, batch.num_rows, chunksize):
+            chunk = batch.slice(offset, chunksize)
+            yield tuple(chunk.column(i) for i in indices)
+
+
+def _iload_arrow_chunks(
+    data,
+    *,
+    filetype: str,
+    keys: Iterable[Union[str, int]],
+    values: Iterable[Union[str, int]],
+    usecols: Iterable[Union[str, int]],
+    headers: Iterable[str] = None,
+    valids: Dict[Union[str, int], Iterable[Any]],
+    invalids: Dict[Union[str, int], Iterable[Any]],
     converters: Dict[Union[str, int], Iterable[Callable]] = None,
+    chunksize: int = 10000,
+    nrows: int = None,
     **kwargs,
-) -> Iterator[Tuple[Any, Any]]:
-    """Generator for data.
+) -> Iterator[Tuple['pyarrow.Array', ...]]:
+    """Version of 'iload_data_chunks()' for Arrow-based files.
 
-    Use Pandas 'read_csv()' to load data into a dataframe which is then
-    iterated as key/value pairs.
+    Rows with missing keys are skipped. Options for 'read_csv()' are
+    ignored.
+    """
+    import pyarrow.compute
+    keys_values = (*keys, *values)
 
-    Args:
-        data (str): File or buffer.
-            See Pandas 'filepath_or_buffer' option from 'read_csv()'.
+    # NOTE: Valid/invalid items are converted once to Arrow arrays of
+    # the type of their column.
+    value_sets = {}
+
+    def value_set(col, items, column):
+        if items is None:
+            return None
+        if (col, id(items)) not in value_sets:
+            value_sets[(col, id(items))] = pyarrow.array(
+                list(items),
+                type=column.type,
+            )
+        return value_sets[(col, id(items))]
+
+    for chunk in _iread_record_batches(
+        data,
+        filetype=filetype,
+        columns=usecols,
+        headers=headers,
+        chunksize=chunksize,
+    ):
+        if nrows is not None:
+            if nrows <= 0:
+                break
+            chunk = tuple(column.slice(0, nrows) for column in chunk)
+            nrows -= len(chunk[0])
+
+        columns = dict(zip(usecols, chunk))
+
+        # Filter missing keys and valid/invalid keys/values
+        mask = None
+        for col in set(keys).union(valids, invalids):
+            if col in valids or col in invalids:
+                col_mask = _arrow_column_mask(
+                    columns[col],
+                    valids=value_set(col, valids.get(col), columns[col]),
+                    invalids=value_set(col, invalids.get(col), columns[col]),
+                )
+            else:
+                col_mask = pyarrow.compute.is_valid(columns[col])
+            mask = (
+                col_mask
+                if mask is None
+                else pyarrow.compute.and_(mask, col_mask)
+            )
+        if mask is not None:
+            columns = {
+                col: column.filter(mask)
+                for col, column in columns.items()
+            }
+
+        if len(columns[keys_values[0]]) == 0:
+            continue
+
+        # Apply converter functions
+        if converters is not None:
+            for col in set(keys_values).intersection(converters):
+                columns[col] = _convert_arrow_column(
+                    columns[col],
+                    converters[col],
+                )
 
-        keys (Iterable[str|int]): Columns to use as dictionary keys.
-            Multiple keys are stored as tuples in same order as given.
-            If str, then it corresponds to 'headers' names.
-            If int, then it corresponds to column indices.
+        yield tuple(columns[col] for col in keys_values)
 
-        values (Iterable[str|int]): Columns to use as dictionary values.
-            Multiple values are stored as tuples in same order as given.
-            If str, then it corresponds to 'headers' names.
-            If int, then it corresponds to column indices.
 
-        headers (Iterable[str|int]): Column names.
-            Headers are required when keys/values are str.
-            Headers do not need to be complete, but do need to be in order
-            and contain the keys/values identifier.
+def iload_data_chunks(
+    data,
+    *,
+    keys: Iterable[Union[str, int]] = (0,),
+    values: Iterable[Union[str, int]] = None,
+    headers: Iterable[Union[str, int]] = None,
+    valids: Dict[Union[str, int], Iterable[Any]] = None,
+    invalids: Dict[Union[str, int], Iterable[Any]] = None,
+    converters: Dict[Union[str, int], Iterable[Callable]] = None,
+    filetype: str = None,
+    **kwargs,
+) -> Iterator[Tuple[Union['numpy.ndarray', 'pyarrow.Array'], ...]]:
+    """Generator for chunks of data as column arrays.
 
-        valids (Dict[Any:Iterable[Any]]): Mapping between column identifiers
-            and sequences of valid values to include.
-            If values is None, then corresponding columns are included.
+    Use Pandas 'read_csv()' to load data in chunks, rows are filtered
+    and converter functions are applied column-wise per chunk.
+    Parquet, Arrow IPC, and JSONL files are read in record batches with
+    Arrow, see 'data_filetype()'.
 
-        invalids (Dict[Any:Iterable[Any]]): Mapping between column identifiers
-            and sequences of invalid values to skip.
-            Invalid values have precedence over valid values.
-            If values is None, then corresponding columns are included.
+    Args: See 'iload_data()'.
 
-        converters (Dict[Any:Callable|Iterable[Callable]]): Mapping between
-            headers and (sequences of) converter functions to be applied after
-            row filtering.
+    Kwargs: See 'iload_data()'.
 
-    Kwargs: Options forwarded to Pandas 'read_csv()', except for the
-        following options which are ignored because they are set by
-        internal decisions: filepath_or_buffer, names, usecols, header,
-        index_col.
+    Returns (Tuple[numpy.ndarray|pyarrow.Array, ...]): Column arrays of
+        keys followed by values, in the same order as given. Arrow arrays
+        are used for Arrow-based files.
     """
     if values is None:
         values = ()
     keys_values = (*keys, *values)
 
-    # Get keys/values sizes into variables to prevent calling len()
-    # for every iteration during processing.
-    # NOTE: Performance-wise, not sure if this has any effect, but makes
-    # code cleaner.
-    num_keys = len(keys)
-    num_values = len(values)
-    values_stop = len(keys_values)
-
     # Get columns used for filtering that are not part of keys/values
     filters = set()
     if valids is not None:
@@ -224,17 +565,35 @@ def iload_data(
     # provided. An empty iterable or an iterable of Nones is considered
     # as a no filtering request.
     # NOTE: Any iterable that supports the 'in' operator and has default
-    # behavior using 'any()' is allowed.
-    key_value_check = iterable_true(valids) or iterable_true(invalids)
-
-    # Pre-compute indices and columns for converter functions.
-    # NOTE: This is a performance optimization because it allows operating
-    # on deterministic items without incurring on hashing operations
-    # nor indirect addressing.
-    if converters is not None:
-        converters_idxcols = tuple(
-            filter_indices_and_values(lambda x: x in converters, usecols)
+    # behavior using 'any()' is allowed. Iterables are converted once
+    # into indexes because they are reused for every chunk.
+    def column_filters(filters):
+        if not iterable_true(filters):
+            return {}
+        return {
+            col: pandas.Index(list(items)).unique()
+            for col, items in filters.items()
+            if items is not None
+        }
+
+    valids = column_filters(valids)
+    invalids = column_filters(invalids)
+
+    filetype = data_filetype(data, filetype)
+    if filetype != 'csv':
+        yield from _iload_arrow_chunks(
+            data,
+            filetype=filetype,
+            keys=keys,
+            values=values,
+            usecols=tuple(dict.fromkeys(usecols)),
+            headers=headers,
+            valids=valids,
+            invalids=invalids,
+            converters=converters,
+            **kwargs,
         )
+        return
 
     # Extend the column headers with a dummy header (hopefully unique).
     # NOTE: UMLS files end with a bar at each line and Pandas assumes
@@ -287,46 +646,191 @@ def iload_data(
     #   c) Organize keys/values
     for df in reader:
 
-        # Keys/values generator
-        usecols_values = (df[col] for col in usecols)
+        # Filter valid/invalid keys/values
+        mask = None
+        for col in set(valids).union(invalids):
+            col_mask = _column_mask(
+                df[col],
+                valids=valids.get(col),
+                invalids=invalids.get(col),
+            )
+            mask = col_mask if mask is None else mask & col_mask
+        if mask is not None:
+            df = df[mask]
+
+        if len(df) == 0:
+            continue
+
+        # Apply converter functions
+        columns = {
+            col: (
+                _convert_column(df[col], converters[col])
+                if converters is not None and col in converters
+                else df[col]
+            )
+            for col in set(keys_values)
+        }
+
+        yield tuple(columns[col].to_numpy() for col in keys_values)
 
-        # NOTE: Uses lists instead of tuples so that individual items
-        # can be replaced after applying converter functions.
-        for kv in map(list, zip(*usecols_values)):
 
-            # Filter valid/invalid keys/values
-            if (
-                key_value_check
-                and not valid_items_from_dict(
-                    usecols,
-                    kv,
-                    valids=valids,
-                    invalids=invalids,
-                )
-            ):
-                continue
+def iload_data(
+    data,
+    *,
+    keys: Iterable[Union[str, int]] = (0,),
+    values: Iterable[Union[str, int]] = None,
+    **kwargs,
+) -> Iterator[Tuple[Any, Any]]:
+    """Generator for data.
+
+    Use Pandas 'read_csv()' to load data into a dataframe which is then
+    iterated as key/value pairs.
+
+    Args:
+        data (str): File or buffer.
+            See Pandas 'filepath_or_buffer' option from 'read_csv()'.
+
+        keys (Iterable[str|int]): Columns to use as dictionary keys.
+            Multiple keys are stored as tuples in same order as given.
+            If str, then it corresponds to 'headers' names.
+            If int, then it corresponds to column indices.
+
+        values (Iterable[str|int]): Columns to use as dictionary values.
+            Multiple values are stored as tuples in same order as given.
+            If str, then it corresponds to 'headers' names.
+            If int, then it corresponds to column indices.
+
+        headers (Iterable[str|int]): Column names.
+            Headers are required when keys/values are str.
+            Headers do not need to be complete, but do need to be in order
+            and contain the keys/values identifier.
+
+        valids (Dict[Any:Iterable[Any]]): Mapping between column identifiers
+            and sequences of valid values to include.
+            If values is None, then corresponding columns are included.
 
-            # Apply converter functions
-            if converters is not None:
-                for idx, key in converters_idxcols:
-                    if callable(converters[key]):
-                        kv[idx] = converters[key](kv[idx])
-                    else:
-                        for f in converters[key]:
-                            kv[idx] = f(kv[idx])
-
-            # Organize keys
-            ks = (kv[0] if num_keys == 1
-                  else tuple(kv[:num_keys]))
-
-            if num_values > 0:
-                # Organize values
-                vs = (kv[num_keys] if num_values == 1
-                      else tuple(kv[num_keys:values_stop]))
-
-                yield ks, vs
+        invalids (Dict[Any:Iterable[Any]]): Mapping between column identifiers
+            and sequences of invalid values to skip.
+            Invalid values have precedence over valid values.
+            If values is None, then corresponding columns are included.
+
+        converters (Dict[Any:Callable|Iterable[Callable]]): Mapping between
+            headers and (sequences of) converter functions to be applied after
+            row filtering.
+
+        filetype (str): Type of file, 'csv', 'parquet', 'arrow', 'jsonl'.
+            If None, it is selected from the file extension, see
+            'data_filetype()'.
+
+    Kwargs: Options forwarded to Pandas 'read_csv()', except for the
+        following options which are ignored because they are set by
+        internal decisions: filepath_or_buffer, names, usecols, header,
+        index_col. For Arrow-based files, only 'chunksize' and 'nrows'
+        are supported.
+
+    Notes:
+        * Rows are processed in chunks, see 'iload_data_chunks()'.
+    """
+    yield from iter_chunk_rows(
+        iload_data_chunks(data, keys=keys, values=values, **kwargs),
+        num_keys=len(keys),
+    )
+
+
+def iter_chunk_rows(
+    chunks: Iterable[Tuple[Union['numpy.ndarray', 'pyarrow.Array'], ...]],
+    *,
+    num_keys: int = 1,
+) -> Iterator[Any]:
+    """Generator of keys or key/value pairs from chunks of column arrays.
+
+    Args:
+        chunks (Iterable[Tuple[numpy.ndarray|pyarrow.Array, ...]]): Column
+            arrays of keys followed by values, see 'iload_data_chunks()'.
+
+        num_keys (int): Number of key columns. Multiple keys/values are
+            stored as tuples in same order as given.
+    """
+    for columns in chunks:
+        # NOTE: Convert arrays to lists of Python objects.
+        columns = [column.tolist() for column in columns]
+
+        # Organize keys
+        ks = (columns[0] if num_keys == 1
+              else zip(*columns[:num_keys]))
+
+        if len(columns) > num_keys:
+            # Organize values
+            vs = (columns[num_keys] if len(columns) == num_keys + 1
+                  else zip(*columns[num_keys:]))
+
+            yield from zip(ks, vs)
+        else:
+            yield from ks
+
+
+def split_file(filename: str, num_parts: int) -> List[Tuple[int, int]]:
+    """Split a file into byte ranges aligned to line boundaries.
+
+    Args:
+        filename (str): File name.
+
+        num_parts (int): Max number of byte ranges, ranges are of
+            similar size.
+
+    Returns (List[Tuple[int, int]]): Begin/end byte offsets of ranges,
+        empty ranges are omitted.
+    """
+    size = os.path.getsize(filename)
+    offsets = [0]
+    with open(filename, 'rb') as fd:
+        for i in range(1, num_parts):
+            offset = size * i // num_parts
+            if offset <= offsets[-1]:
+                continue
+            # Move to the beginning of the next line
+            fd.seek(offset - 1)
+            fd.readline()
+            offsets.append(min(fd.tell(), size))
+    offsets.append(size)
+    return [
+        (begin, end)
+        for begin, end in zip(offsets[:-1], offsets[1:])
+        if begin < end
+    ]
+
+
+def _load_data_range(byte_range: Tuple[int, int], *, data: str, kwargs):
+    """Load data from a byte range of a file, see 'load_data()'."""
+    begin, end = byte_range
+    with open(data, 'rb') as fd:
+        fd.seek(begin)
+        buffer = io.BytesIO(fd.read(end - begin))
+    return load_data(buffer, memory_map=False, **kwargs)
+
+
+def _merge_data(
+    data: Union[List[Any], Dict[Any, Union[Any, List[Any]]]],
+    partial_data: Union[List[Any], Dict[Any, Union[Any, List[Any]]]],
+    *,
+    multiple_values: bool = False,
+    unique_values: bool = False,
+):
+    """Merge in-place data loaded from consecutive parts of a file,
+    consistent with 'load_data()'."""
+    if isinstance(data, list):
+        data.extend(partial_data)
+    elif multiple_values:
+        for k, vs in partial_data.items():
+            if unique_values and k in data:
+                data[k].extend(v for v in vs if v not in data[k])
             else:
-                yield ks
+                data[k].extend(vs)
+    else:
+        # Consider the value of the first appearance of a key.
+        for k, v in partial_data.items():
+            if k not in data:
+                data[k] = v
 
 
 def load_data(
@@ -336,6 +840,7 @@ def load_data(
     unique_keys: bool = False,
     multiple_values: bool = False,
     unique_values: bool = False,
+    num_procs: int = 1,
     **kwargs,
 ) -> Union[List[Any], Dict[Any, Union[Any, List[Any]]]]:
     """Load data.
@@ -364,33 +869,217 @@ def load_data(
         unique_values (bool): Control if values can be repeated or not.
             Only applies if 'multiple_values' is True.
 
-    Kwargs: Options forwarded to 'iload_data()'.
+        num_procs (int): Number of processes for parsing a file. The file
+            is split into byte ranges aligned to lines, and each range is
+            parsed by a worker process. Only applies to uncompressed files
+            without header row and if 'nrows' is not set.
+
+    Kwargs: Options forwarded to 'iload_data_chunks()'.
     """
+    # NOTE: Files that cannot be split (e.g., empty or single line) are
+    # loaded sequentially.
+    ranges = (
+        split_file(data, num_procs)
+        if (
+            num_procs > 1
+            and isinstance(data, str)
+            and os.path.isfile(data)
+            and kwargs.get('nrows') is None
+            and kwargs.get('skiprows') is None
+            and kwargs.get('compression', 'infer') in ('infer', None)
+            and corpus_file_format(data)[0] is None
+            and data_filetype(data, kwargs.get('filetype')) == 'csv'
+        )
+        else []
+    )
+    if len(ranges) > 1:
+        # NOTE: Filters are converted to sets because some iterables
+        # (e.g., dictionary views) cannot be sent to worker processes.
+        for option in ('valids', 'invalids'):
+            if kwargs.get(option) is not None:
+                kwargs[option] = {
+                    col: None if items is None else frozenset(items)
+                    for col, items in kwargs[option].items()
+                }
+
+        func = functools.partial(
+            _load_data_range,
+            data=data,
+            kwargs={
+                'keys': keys,
+                'unique_keys': unique_keys,
+                'multiple_values': multiple_values,
+                'unique_values': unique_values,
+                **kwargs,
+            },
+        )
+        _data = None
+        with multiprocessing.Pool(processes=num_procs) as pool:
+            # NOTE: Partial data is merged in file order to keep the
+            # semantics of sequential loading.
+            for partial_data in pool.imap(func, ranges):
+                if _data is None:
+                    _data = partial_data
+                else:
+                    _merge_data(
+                        _data,
+                        partial_data,
+                        multiple_values=multiple_values,
+                        unique_values=unique_values,
+                    )
+        if unique_keys and isinstance(_data, list):
+            _data = list(set(_data))
+        return _data
+
+    num_keys = len(keys)
+    chunks = iload_data_chunks(data, keys=keys, **kwargs)
     if kwargs.get('values') is None:
         if unique_keys:
             # NOTE: Convert to a list because JSON does not serializes sets.
-            _data = list(set(iload_data(data, keys=keys, **kwargs)))
+            _data = list(set(iter_chunk_rows(chunks, num_keys=num_keys)))
         else:
-            _data = list(iload_data(data, keys=keys, **kwargs))
+            _data = list(iter_chunk_rows(chunks, num_keys=num_keys))
     elif multiple_values:
         if unique_values:
             _data = collections.defaultdict(list)
-            for k, v in iload_data(data, keys=keys, **kwargs):
+            for k, v in iter_chunk_rows(chunks, num_keys=num_keys):
                 if v not in _data[k]:
                     _data[k].append(v)
         else:
             _data = collections.defaultdict(list)
-            for k, v in iload_data(data, keys=keys, **kwargs):
+            for k, v in iter_chunk_rows(chunks, num_keys=num_keys):
                 _data[k].append(v)
     else:
         # Consider the value of the first appearance of a key.
         _data = {}
-        for k, v in iload_data(data, keys=keys, **kwargs):
+        for k, v in iter_chunk_rows(chunks, num_keys=num_keys):
             if k not in _data:
                 _data[k] = v
     return _data
 
 
+class ExternalGroups:
+    """Groups key/value pairs by key using a memory-bounded external sort.
+
+    Pairs are buffered until the memory budget is reached, then the buffer
+    is sorted and spilled as a run to a temporary file. Iteration merges
+    the runs (k-way merge) and yields keys in sorted order with their
+    values in order of appearance.
+
+    Args:
+        data (Iterable[Tuple[Any, Any]]): Key/value pairs, keys need to
+            be orderable.
+
+        memory_budget (int): Approximate max number of bytes of buffered
+            pairs.
+
+        unique_values (bool): Control if values can be repeated or not.
+
+        tmpdir (str): Directory for spill files. If None, the system
+            temporary directory is used.
+
+    Notes:
+        * Groups can be iterated multiple times, spill files are removed
+          when closed. Supports context manager.
+    """
+
+    # Number of pairs per pickled block in spill files
+    _BLOCK_SIZE = 10000
+
+    def __init__(
+        self,
+        data: Iterable[Tuple[Any, Any]],
+        *,
+        memory_budget: int = 2**28,
+        unique_values: bool = False,
+        tmpdir: str = None,
+    ):
+        self._unique_values = unique_values
+        self._tmpdir = tempfile.TemporaryDirectory(dir=tmpdir)
+        self._runs = []
+        self._buffer = []
+        self.num_pairs = 0
+
+        buffer_size = 0
+        for key, value in data:
+            # NOTE: Sequence number keeps order of appearance of values
+            # and prevents comparing values during sort.
+            self._buffer.append((key, self.num_pairs, value))
+            self.num_pairs += 1
+            buffer_size += (
+                sys.getsizeof(key) + sys.getsizeof(value) + 100
+            )
+            if buffer_size >= memory_budget:
+                self._spill()
+                buffer_size = 0
+
+        self._buffer.sort()
+        if len(self._runs) > 0 and len(self._buffer) > 0:
+            self._spill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    @property
+    def num_runs(self):
+        return len(self._runs)
+
+    def _spill(self):
+        self._buffer.sort()
+        filename = os.path.join(self._tmpdir.name, f'run{len(self._runs)}')
+        with open(filename, 'wb') as fd:
+            for i in range(0, len(self._buffer), type(self)._BLOCK_SIZE):
+                pickle.dump(
+                    self._buffer[i:i + type(self)._BLOCK_SIZE],
+                    fd,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+        self._runs.append(filename)
+        self._buffer = []
+
+    @staticmethod
+    def _iread_run(filename: str) -> Iterator[Tuple[Any, int, Any]]:
+        with open(filename, 'rb') as fd:
+            while True:
+                try:
+                    yield from pickle.load(fd)
+                except EOFError:
+                    break
+
+    def __iter__(self) -> Iterator[Tuple[Any, List[Any]]]:
+        records = (
+            heapq.merge(*map(type(self)._iread_run, self._runs))
+            if len(self._runs) > 0
+            else iter(self._buffer)
+        )
+        for key, group in itertools.groupby(records, key=lambda r: r[0]):
+            values = []
+            for _, _, value in group:
+                if not self._unique_values or value not in values:
+                    values.append(value)
+            yield key, values
+
+    def close(self):
+        self._buffer = []
+        self._runs = []
+        self._tmpdir.cleanup()
+
+
+def peak_memory() -> Union[int, None]:
+    """Peak resident memory of current process in bytes, None if not
+    supported by platform."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # NOTE: Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
 def unpack_dir(
     adir: str,
     *,
@@ -426,69 +1115,378 @@ def expand_envvars(string: str):
     return os.path.expandvars(os.path.expanduser(string))
 
 
+def iread_text(
+    filename: str,
+    *,
+    chunk_size: int = 2**24,
+    delimiter: str = '\n',
+    encoding: str = None,
+) -> Iterator[Tuple[int, str]]:
+    """Memory-mapped reader of text files in chunks.
+
+    Chunks are split at delimiter boundaries so that lines (or sentences,
+    depending on the delimiter) are not broken across chunks.
+
+    Args:
+        filename (str): Text file.
+
+        chunk_size (int): Approximate number of bytes per chunk. A chunk is
+            extended up to the next delimiter if it does not contains one.
+
+        delimiter (str): Boundary to split chunks at. Only encodings where
+            the delimiter cannot be part of a multi-byte character are
+            supported (e.g., UTF-8).
+
+        encoding (str): Text encoding of file. If None, the locale's
+            preferred encoding is used, as in 'open()'.
+
+    Returns (Tuple[int, str]): Character offset of chunk in file and chunk
+        text. Newlines are translated as when reading the file with
+        'open()' (universal newlines), so texts and offsets are the same
+        as those of the entire file read in text mode.
+    """
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    bdelimiter = delimiter.encode(encoding)
+    with open(filename, 'rb') as fd:
+        size = os.fstat(fd.fileno()).st_size
+        # NOTE: Empty files cannot be memory-mapped.
+        if size == 0:
+            yield 0, ''
+            return
+
+        with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = 0
+            begin = 0
+            while begin < size:
+                end = begin + chunk_size
+                if end < size:
+                    idx = mm.rfind(bdelimiter, begin, end)
+                    if idx < 0:
+                        idx = mm.find(bdelimiter, end)
+                    end = size if idx < 0 else idx + len(bdelimiter)
+                    # NOTE: Do not split a CRLF newline across chunks.
+                    if mm[end - 1:end] == b'\r' and mm[end:end + 1] == b'\n':
+                        end += 1
+                else:
+                    end = size
+                text = (
+                    mm[begin:end].decode(encoding)
+                    .replace('\r\n', '\n')
+                    .replace('\r', '\n')
+                )
+                yield offset, text
+                offset += len(text)
+                begin = end
+
+
+# Map of file extensions to functions for opening compressed streams.
+COMPRESSION_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+# Map of file extensions to corpus file formats.
+CORPUS_EXTENSIONS = {
+    '.tar': 'tar',
+    '.tgz': 'tar',
+    '.tbz2': 'tar',
+    '.txz': 'tar',
+    '.zip': 'zip',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+}
+
+
+def corpus_file_format(filename: str) -> Tuple[Union[str, None], str]:
+    """Resolve compression and format of a corpus file from its extensions.
+
+    Returns (Tuple[str, str]): Compression extension (None if not
+        compressed) and file format. Valid file formats are: 'text', 'tar',
+        'zip', 'jsonl', 'csv'.
+    """
+    root, ext = os.path.splitext(filename.lower())
+    compression = None
+    if ext in COMPRESSION_OPENERS:
+        compression = ext
+        root, ext = os.path.splitext(root)
+    return compression, CORPUS_EXTENSIONS.get(ext, 'text')
+
+
+def iread_records(
+    fd: TextIO,
+    *,
+    source: str,
+    record_format: str = 'jsonl',
+    id_field: str = 'id',
+    text_field: str = 'text',
+) -> Iterator[Tuple[str, str]]:
+    """Generator of documents from a record-oriented text stream.
+
+    Args:
+        fd (TextIO): Text stream of JSON Lines or CSV (with header) records.
+
+        source (str): Name of stream, used as prefix of record identifiers
+            when records do not have an identifier field.
+
+        record_format (str): Format of records. Valid values are: 'jsonl',
+            'csv'.
+
+        id_field (str): Name of field with the document identifier.
+
+        text_field (str): Name of field with the document text.
+
+    Returns (Tuple[str, str]): Document identifier and document text.
+    """
+    if record_format == 'jsonl':
+        records = (json.loads(line) for line in fd if line.strip())
+    elif record_format == 'csv':
+        records = csv.DictReader(fd)
+    else:
+        raise ValueError(f'invalid record format, {record_format}')
+
+    for i, record in enumerate(records):
+        yield str(record.get(id_field, f'{source}:{i}')), record[text_field]
+
+
+def _iread_corpus_stream(
+    source: str,
+    fd: BinaryIO,
+    *,
+    record_format: str = None,
+    encoding: str = None,
+    **kwargs,
+) -> Iterator[Tuple[str, str, int]]:
+    """Generator of documents from a (compressed) binary stream.
+
+    Kwargs: Options forwarded to 'iread_records()'.
+    """
+    compression, file_format = corpus_file_format(source)
+    if file_format in ('tar', 'zip'):
+        # NOTE: Nested archives are not supported.
+        return
+    if file_format == 'text' and record_format is not None:
+        file_format = record_format
+
+    if compression is not None:
+        fd = COMPRESSION_OPENERS[compression](fd)
+
+    # NOTE: Use a stream reader instead of 'io.TextIOWrapper' because
+    # members of tar archives opened in stream mode are not seekable.
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    with codecs.getreader(encoding)(fd) as text_fd:
+        if file_format == 'text':
+            yield source, text_fd.read(), 0
+        else:
+            for _source, text in iread_records(
+                text_fd,
+                source=source,
+                record_format=file_format,
+                **kwargs,
+            ):
+                yield _source, text, 0
+
+
+def iread_corpus_file(
+    filename: str,
+    *,
+    record_format: str = None,
+    encoding: str = None,
+    chunk_size: int = None,
+    delimiter: str = '\n',
+    **kwargs,
+) -> Iterator[Tuple[str, str, int]]:
+    """Generator of documents from a corpus file.
+
+    Files are decompressed and archive members are extracted as streams,
+    so only a single document is in memory at a time.
+
+    Args:
+        filename (str): Corpus file. Supported files are plain text,
+            JSON Lines and CSV records, optionally compressed with gzip,
+            bzip2, or xz, and tar/zip archives of these.
+
+        record_format (str): Format of records for files without a known
+            extension. Valid values are: 'jsonl', 'csv'. If None, files
+            with unknown extensions are considered plain text.
+
+        encoding (str): Text encoding of files.
+
+        chunk_size (int): If set, plain text files (uncompressed and not
+            archived) are memory-mapped and read in chunks, see
+            `iread_text`.
+
+        delimiter (str): Boundary to split file chunks at.
+
+    Kwargs: Options forwarded to 'iread_records()'.
+
+    Returns (Tuple[str, str, int]): Document source, document text, and
+        character offset of text in document. The source of archive members
+        is the archive name joined with the member name. The source of
+        records is the value of their identifier field.
+    """
+    compression, file_format = corpus_file_format(filename)
+    if file_format == 'tar':
+        # NOTE: Use stream mode, tarfile detects compression transparently.
+        with tarfile.open(filename, mode='r|*') as tf:
+            for member in tf:
+                if not member.isfile():
+                    continue
+                yield from _iread_corpus_stream(
+                    os.path.join(filename, member.name),
+                    tf.extractfile(member),
+                    record_format=record_format,
+                    encoding=encoding,
+                    **kwargs,
+                )
+    elif file_format == 'zip':
+        with zipfile.ZipFile(filename) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                with zf.open(info) as fd:
+                    yield from _iread_corpus_stream(
+                        os.path.join(filename, info.filename),
+                        fd,
+                        record_format=record_format,
+                        encoding=encoding,
+                        **kwargs,
+                    )
+    elif (
+        file_format == 'text'
+        and compression is None
+        and record_format is None
+    ):
+        if chunk_size:
+            for offset, text in iread_text(
+                filename,
+                chunk_size=chunk_size,
+                delimiter=delimiter,
+                **({} if encoding is None else {'encoding': encoding}),
+            ):
+                yield filename, text, offset
+        else:
+            # NOTE: For files, return the entire content. This is not the
+            # best approach for large files, but there is no way of
+            # splitting by sentences a priori (unless stated otherwise).
+            with open(filename, encoding=encoding) as fd:
+                yield filename, fd.read(), 0
+    else:
+        with open(filename, 'rb') as fd:
+            yield from _iread_corpus_stream(
+                filename,
+                fd,
+                record_format=record_format,
+                encoding=encoding,
+                **kwargs,
+            )
+
+
 def corpus_generator(
     corpora: Union[str, Iterable[str], Iterable[Iterable[str]]],
     *,
     source_only: bool = False,
     phony: bool = False,
     recursive: bool = False,
-) -> Tuple[str, str]:
+    with_offset: bool = False,
+    **kwargs,
+) -> Union[str, Tuple[str, str], Tuple[str, str, int]]:
     """Extracts text from corpora.
 
     Args:
         corpora (str): Text data to process. Valid values are:
             * Directory
-            * File
+            * File, see `iread_corpus_file` for supported formats
             * Raw text
             * An iterable with two parts: (filename_or_id, text)
             * An iterable of any combination of the above
 
         source_only (bool): If set, only return the sources (file names).
-            Raw text is returned as is.
+            Raw text and (filename_or_id, text) pairs are returned as is.
+            Documents from archives and record files are returned as
+            (filename_or_id, text) pairs.
 
         phony (bool): If set, attr:`corpora` items are not considered
             as file system objects when name collisions occur.
 
         recursive (bool): If set, unpack files recursively.
 
+        with_offset (bool): If set, also return the character offset of
+            the text in its corpus. Offsets are non-zero only for files
+            read in chunks.
+
+    Kwargs: Options forwarded to 'iread_corpus_file()' (e.g., chunk_size,
+        delimiter, encoding, record_format, id_field, text_field).
+
     Returns (Tuple[str, str]): Corpus source and corpus content.
                      The source identifier for raw text is '__text__'.
                      The source identifier for other is their file system name.
+                     If 'with_offset' is set, the character offset is
+                     returned as third element.
     """
     if not is_iterable(corpora):
         corpora = (corpora,)
 
-    # NOTE: Need to implement the following scheme.
-    # Convert corpus into iterable of iterables [(filename1, text), (...), ...]
-    # File format: (filename, None)
-    # Raw text format: (None, text)
-    # Filename and raw text format: (filename_or_id, text)
-    # Directory format: (dir, None)
-
-    if not phony:
-        _corpora = []
-        for corpus in corpora:
-            corpus = expand_envvars(corpus)
-            if os.path.isdir(corpus):
-                _corpora.extend(unpack_dir(corpus, recursive=recursive))
+    for corpus in corpora:
+        # Pairs of (filename_or_id, text)
+        if is_iterable(corpus):
+            source, text = corpus
+            if source_only:
+                yield corpus
+            elif with_offset:
+                yield source, text, 0
             else:
-                _corpora.append(corpus)
-    else:
-        _corpora = corpora
-
-    for corpus in _corpora:
-        corpus = expand_envvars(corpus)
-        # Assume corpus is raw text if it is not a file system object.
-        if phony or not os.path.exists(corpus):
-            yield corpus if source_only else ('__text__', corpus)
-        elif os.path.isfile(corpus):
-            if os.path.basename(corpus).startswith('.'):
+                yield source, text
+            continue
+
+        # NOTE: Query the file system once per item, any failure means
+        # that the item is not a file system object (e.g., raw text with
+        # null bytes or too long for a path).
+        mode = 0
+        if not phony:
+            try:
+                mode = os.stat(expand_envvars(corpus)).st_mode
+            except (OSError, ValueError):
+                pass
+
+        if stat.S_ISDIR(mode):
+            filenames = unpack_dir(expand_envvars(corpus), recursive=recursive)
+        elif stat.S_ISREG(mode):
+            filename = expand_envvars(corpus)
+            if os.path.basename(filename).startswith('.'):
+                continue
+            filenames = (filename,)
+        else:
+            # Assume corpus is raw text if it is not a file system object.
+            if source_only:
+                yield corpus
+            elif with_offset:
+                yield '__text__', corpus, 0
+            else:
+                yield '__text__', corpus
+            continue
+
+        for filename in filenames:
+            # NOTE: Plain text files are read by the consumer of sources,
+            # but documents from archives and record files are extracted.
+            if (
+                source_only
+                and corpus_file_format(filename) == (None, 'text')
+                and kwargs.get('record_format') is None
+            ):
+                yield filename
                 continue
-            # NOTE: For files, return the entire content. This is not the best
-            # approach for large files, but there is no way of splitting by
-            # sentences a priori (unless stated otherwise).
-            with open(corpus) as fd:
-                yield corpus if source_only else (corpus, fd.read())
+
+            for source, text, offset in iread_corpus_file(filename, **kwargs):
+                if source_only:
+                    yield source, text
+                elif with_offset:
+                    yield source, text, offset
+                else:
+                    yield source, text
 
 
 def get_obj_map_key(obj, class_map):
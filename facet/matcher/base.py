@@ -1,6 +1,9 @@
+import asyncio
+import functools
 from abc import ABC, abstractmethod
 from ..database import (
     get_database,
+    get_async_executor,
     BaseDatabase,
 )
 from typing import (
@@ -71,3 +74,19 @@ class BaseMatcher(ABC):
     @abstractmethod
     def search(self, string: str) -> Union[List[Tuple[str, float]], List[str]]:
         pass
+
+    async def asearch(
+        self,
+        string: str,
+        **kwargs,
+    ) -> Union[List[Tuple[str, float]], List[str]]:
+        """Asynchronous version of 'search()'.
+
+        Notes:
+            * Blocking search runs in a thread pool, derived classes
+              should override it to issue concurrent database requests.
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            get_async_executor(),
+            functools.partial(self.search, string, **kwargs),
+        )
@@ -1,5 +1,11 @@
+import asyncio
+import functools
+import threading
+import concurrent.futures
 from abc import abstractmethod
 from collections import defaultdict
+from .. import metrics
+from ..database import get_async_executor
 from .base import BaseMatcher
 from .similarity import (
     get_similarity,
@@ -11,7 +17,9 @@ from .ngram import (
     BaseNgram,
 )
 from typing import (
+    Any,
     List,
+    Dict,
     Tuple,
     Union,
     Iterator,
@@ -36,9 +44,21 @@ class BaseSimstring(BaseMatcher):
 
         ngram (str, BaseNgram): N-gram feature extractor instance or name.
 
+        num_threads (int): Number of threads for fetching strings of a
+            query concurrently in 'search()'. If None, strings are fetched
+            sequentially.
+
+        max_pending (int): Max number of concurrent requests to database
+            per matcher when using threads. If None, it is not limited.
+
     Kwargs: Options forwarded to 'BaseMatcher()'.
+
+    Notes:
+        * Fetching strings with threads requires a thread-safe database
+          connection, e.g., Redis, Mongo, Elasticsearch.
     """
 
+    GLOBAL_MIN_FEATURES = 1
     GLOBAL_MAX_FEATURES = 64
 
     def __init__(
@@ -47,12 +67,27 @@ class BaseSimstring(BaseMatcher):
         alpha: float = 0.7,
         similarity: Union[str, 'BaseSimilarity'] = 'jaccard',
         ngram: Union[str, 'BaseNgram'] = 'character',
+        num_threads: int = None,
+        max_pending: int = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
         self._alpha = None
         self._similarity = None
         self._ngram = get_ngram(ngram)
+        self._executor = (
+            None
+            if num_threads is None
+            else concurrent.futures.ThreadPoolExecutor(
+                max_workers=num_threads,
+            )
+        )
+        self._pending = (
+            None
+            if max_pending is None
+            else threading.BoundedSemaphore(max_pending)
+        )
+        self.global_min_features = type(self).GLOBAL_MIN_FEATURES
         self.global_max_features = type(self).GLOBAL_MAX_FEATURES
 
         self.alpha = alpha
@@ -66,6 +101,18 @@ class BaseSimstring(BaseMatcher):
     def insert(self, string: str):
         pass
 
+    async def aget_strings(self, size: int, feature: str) -> List[str]:
+        """Asynchronous version of 'get_strings()'.
+
+        Notes:
+            * Blocking request runs in a thread pool, derived classes
+              should override it using asynchronous database requests.
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            get_async_executor(),
+            functools.partial(self.get_strings, size, feature),
+        )
+
     @property
     def alpha(self):
         return self._alpha
@@ -90,6 +137,66 @@ class BaseSimstring(BaseMatcher):
     def ngram(self):
         return self._ngram
 
+    def query_feature_bounds(
+        self,
+        *,
+        alpha: float = None,
+        similarity: Union[str, 'BaseSimilarity'] = None,
+    ) -> Tuple[int, int]:
+        """Range of query feature sizes that can have candidate strings.
+
+        Bounds are derived from the range of feature sizes of inserted
+        strings, queries outside of this range cannot meet the similarity
+        threshold.
+
+        Args:
+            alpha (float): Similarity threshold.
+
+            similarity (str, BaseSimilarity): Instance of similarity measure or
+                similarity name.
+
+        Returns (Tuple[int, int]): Min and max query feature sizes.
+        """
+        alpha = (
+            self._alpha
+            if alpha is None
+            else get_alpha(alpha)
+        )
+        similarity = (
+            self._similarity
+            if similarity is None
+            else get_similarity(similarity)
+        )
+
+        # NOTE: Bounds of candidate feature sizes are monotonic with respect
+        # to query feature size, so use binary search.
+        def first_true(predicate):
+            hi = 1
+            while not predicate(hi):
+                hi *= 2
+            lo = hi // 2 + 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if predicate(mid):
+                    hi = mid
+                else:
+                    lo = mid + 1
+            return hi
+
+        min_size = first_true(
+            lambda size: (
+                similarity.max_features(size, alpha)
+                >= self.global_min_features
+            )
+        )
+        max_size = first_true(
+            lambda size: (
+                similarity.min_features(size, alpha)
+                > self.global_max_features
+            )
+        ) - 1
+        return min_size, max_size
+
     def search(
         self,
         string: str,
@@ -97,6 +204,8 @@ class BaseSimstring(BaseMatcher):
         alpha: float = None,
         similarity: Union[str, 'BaseSimilarity'] = None,
         rank: bool = True,
+        executor: 'concurrent.futures.Executor' = '',
+        query_features: List[str] = None,
     ) -> Union[List[Tuple[str, float]], List[str]]:
         """Approximate dictionary matching.
 
@@ -105,6 +214,124 @@ class BaseSimstring(BaseMatcher):
 
             similarity (str, BaseSimilarity): Instance of similarity measure or
                 similarity name.
+
+            query_features (List[str]): Features of string, if already
+                extracted with an N-gram extractor equivalent to the
+                matcher's.
+
+            executor (concurrent.futures.Executor): Executor for fetching
+                strings of all candidate feature sizes and query features
+                concurrently. If empty string, the matcher's thread pool is
+                used (see 'num_threads'). If None, strings are fetched
+                sequentially.
+        """
+        alpha, similarity, cache_key = self._search_params(
+            string,
+            alpha=alpha,
+            similarity=similarity,
+        )
+
+        # Check if query string is in cache
+        if cache_key is not None:
+            strings_and_similarities = self._cache_db.get(cache_key)
+            if strings_and_similarities is not None:
+                metrics.incr('matcher.cache.hits')
+                return strings_and_similarities
+            metrics.incr('matcher.cache.misses')
+
+        if executor == '':
+            executor = self._executor
+
+        with metrics.timer('matcher.search'):
+            strings_and_similarities = self._search(
+                string,
+                alpha=alpha,
+                similarity=similarity,
+                rank=rank,
+                executor=executor,
+                query_features=query_features,
+            )
+
+        # Insert candidate strings into cache
+        # NOTE: Need a way to limit database and only cache heavy hitters.
+        if cache_key is not None:
+            self._cache_db.set(cache_key, strings_and_similarities)
+
+        return strings_and_similarities
+
+    async def asearch(
+        self,
+        string: str,
+        *,
+        alpha: float = None,
+        similarity: Union[str, 'BaseSimilarity'] = None,
+        rank: bool = True,
+        query_features: List[str] = None,
+    ) -> Union[List[Tuple[str, float]], List[str]]:
+        """Asynchronous version of 'search()'.
+
+        Strings of all candidate feature sizes and query features are
+        requested at once, see 'aget_strings()'.
+        """
+        alpha, similarity, cache_key = self._search_params(
+            string,
+            alpha=alpha,
+            similarity=similarity,
+        )
+
+        # Check if query string is in cache
+        if cache_key is not None:
+            strings_and_similarities = await self._cache_db.aget(cache_key)
+            if strings_and_similarities is not None:
+                metrics.incr('matcher.cache.hits')
+                return strings_and_similarities
+            metrics.incr('matcher.cache.misses')
+
+        with metrics.timer('matcher.search'):
+            if query_features is None:
+                query_features = self._ngram.get_features(string)
+            feature_sizes = self._candidate_feature_sizes(
+                query_features,
+                alpha=alpha,
+                similarity=similarity,
+            )
+            requests = self._strings_requests(query_features, feature_sizes)
+            responses = await asyncio.gather(*(
+                self.aget_strings(candidate_feature_size, feature)
+                for candidate_feature_size, feature in requests
+            ))
+            candidate_strings = self._merge_strings(
+                query_features,
+                dict(zip(requests, responses)),
+                feature_sizes,
+                alpha=alpha,
+                similarity=similarity,
+            )
+            strings_and_similarities = self._select_candidates(
+                query_features,
+                candidate_strings,
+                alpha=alpha,
+                similarity=similarity,
+                rank=rank,
+            )
+
+        # Insert candidate strings into cache
+        if cache_key is not None:
+            self._cache_db.set(cache_key, strings_and_similarities)
+
+        return strings_and_similarities
+
+    def _search_params(
+        self,
+        string: str,
+        *,
+        alpha: float = None,
+        similarity: Union[str, 'BaseSimilarity'] = None,
+    ) -> Tuple[float, 'BaseSimilarity', Union[str, None]]:
+        """Resolves search parameters and cache key, see `search()`.
+
+        Returns (Tuple[float, BaseSimilarity, str]): Similarity threshold,
+            similarity measure, and cache key (None if cache is not used).
         """
         alpha = (
             self._alpha
@@ -126,37 +353,130 @@ class BaseSimstring(BaseMatcher):
             similarity.NAME == self._similarity.NAME
             and self._cache_db is not None
         )
+        cache_key = str(alpha) + string if use_cache else None
+        return alpha, similarity, cache_key
 
-        # Check if query string is in cache
-        if use_cache:
-            cache_key = str(alpha) + string
-            strings_and_similarities = self._cache_db.get(cache_key)
-            if strings_and_similarities is not None:
-                return strings_and_similarities
-
+    def _search(
+        self,
+        string: str,
+        *,
+        alpha: float,
+        similarity: 'BaseSimilarity',
+        rank: bool = True,
+        executor: 'concurrent.futures.Executor' = None,
+        query_features: List[str] = None,
+    ) -> List[Tuple[str, float]]:
+        """Approximate dictionary matching without cache, see `search()`."""
         # X = string_to_feature(x)
-        query_features = self._ngram.get_features(string)
-
-        min_features = max(
-            1,
-            similarity.min_features(len(query_features), alpha)
+        if query_features is None:
+            query_features = self._ngram.get_features(string)
+        feature_sizes = self._candidate_feature_sizes(
+            query_features,
+            alpha=alpha,
+            similarity=similarity,
         )
-        max_features = min(
-            self.global_max_features,
-            similarity.max_features(len(query_features), alpha)
+
+        if executor is not None:
+            # NOTE: Only database requests run in the executor, merges are
+            # CPU-bound and run in order of feature size, so candidates
+            # are in the same order as in sequential search.
+            requests = self._strings_requests(query_features, feature_sizes)
+            candidate_strings = self._merge_strings(
+                query_features,
+                dict(zip(requests, self._fetch_strings(requests, executor))),
+                feature_sizes,
+                alpha=alpha,
+                similarity=similarity,
+            )
+        else:
+            # Y = list of strings similar to the query
+            candidate_strings = [
+                candidate_string
+                # for l in range(min_y(|X|,a), max_y(|X|,a))
+                for candidate_feature_size in feature_sizes
+                # t = min_overlap(|X|,l,a)
+                # for r in overlapjoin(X,t,V,l)
+                for candidate_string in self._overlap_join(
+                    query_features,
+                    candidate_feature_size,
+                    similarity.min_common_features(
+                        len(query_features),
+                        candidate_feature_size,
+                        alpha,
+                    ),
+                )
+            ]
+        return self._select_candidates(
+            query_features,
+            candidate_strings,
+            alpha=alpha,
+            similarity=similarity,
+            rank=rank,
         )
 
-        # Y = list of strings similar to the query
-        candidate_strings = [
+    def _strings_requests(
+        self,
+        query_features: List[str],
+        feature_sizes: range,
+    ) -> List[Tuple[int, str]]:
+        """Pairs of feature size and query feature to fetch strings from
+        database."""
+        # NOTE: Duplicate features are requested once.
+        return [
+            (candidate_feature_size, feature)
+            for candidate_feature_size in feature_sizes
+            for feature in dict.fromkeys(query_features)
+        ]
+
+    def _fetch_strings(
+        self,
+        requests: List[Tuple[int, str]],
+        executor: 'concurrent.futures.Executor',
+    ) -> List[List[str]]:
+        """Fetch strings concurrently, in the same order as requests."""
+        def get_strings(candidate_feature_size, feature):
+            try:
+                return self.get_strings(candidate_feature_size, feature)
+            finally:
+                if self._pending is not None:
+                    self._pending.release()
+
+        futures = []
+        for candidate_feature_size, feature in requests:
+            # NOTE: Limit number of in-flight requests to database.
+            if self._pending is not None:
+                self._pending.acquire()
+            futures.append(executor.submit(
+                get_strings,
+                candidate_feature_size,
+                feature,
+            ))
+        return [future.result() for future in futures]
+
+    def _merge_strings(
+        self,
+        query_features: List[str],
+        strings: Dict[Tuple[int, str], Any],
+        feature_sizes: range,
+        *,
+        alpha: float,
+        similarity: 'BaseSimilarity',
+    ) -> List[str]:
+        """Candidate strings from fetched strings, see `_overlap_join()`.
+
+        Args:
+            strings (Dict[Tuple[int, str], Any]): Mapping of feature size
+                and query feature to strings.
+        """
+        return [
             candidate_string
-            # for l in range(min_y(|X|,a), max_y(|X|,a))
-            for candidate_feature_size in range(min_features,
-                                                max_features + 1)
-            # t = min_overlap(|X|,l,a)
-            # for r in overlapjoin(X,t,V,l)
-            for candidate_string in self._overlap_join(
+            for candidate_feature_size in feature_sizes
+            for candidate_string in self._cpmerge(
                 query_features,
-                candidate_feature_size,
+                {
+                    feature: strings[(candidate_feature_size, feature)]
+                    for feature in query_features
+                },
                 similarity.min_common_features(
                     len(query_features),
                     candidate_feature_size,
@@ -165,6 +485,41 @@ class BaseSimstring(BaseMatcher):
             )
         ]
 
+    def _candidate_feature_sizes(
+        self,
+        query_features: List[str],
+        *,
+        alpha: float,
+        similarity: 'BaseSimilarity',
+    ) -> range:
+        """Range of feature sizes of candidate strings for a query."""
+        min_features = max(
+            self.global_min_features,
+            similarity.min_features(len(query_features), alpha)
+        )
+        max_features = min(
+            self.global_max_features,
+            similarity.max_features(len(query_features), alpha)
+        )
+        return range(min_features, max_features + 1)
+
+    def _select_candidates(
+        self,
+        query_features: List[str],
+        candidate_strings: List[str],
+        *,
+        alpha: float,
+        similarity: 'BaseSimilarity',
+        rank: bool = True,
+    ) -> List[Tuple[str, float]]:
+        """Candidate strings that meet the similarity threshold, with their
+        similarities."""
+        metrics.observe(
+            'matcher.candidates',
+            len(candidate_strings),
+            buckets=metrics.COUNT_BUCKETS,
+        )
+
         similarities = [
             similarity.similarity(
                 query_features,
@@ -178,13 +533,6 @@ class BaseSimstring(BaseMatcher):
         )
         if rank:
             strings_and_similarities.sort(key=lambda ss: ss[1], reverse=True)
-
-        # Insert candidate strings into cache
-        # NOTE: Need a way to limit database and only cache heavy hitters.
-        if use_cache:
-            cache_key = str(alpha) + string
-            self._cache_db.set(cache_key, strings_and_similarities)
-
         return strings_and_similarities
 
     def _overlap_join(
@@ -195,11 +543,32 @@ class BaseSimstring(BaseMatcher):
     ) -> Iterator[str]:
         """CPMerge algorithm with pruning for solving the t-overlap join
         problem."""
-        # Sort elements in X by ascending order of |get(V,l,Xk)|
         strings = {
             feature: self.get_strings(candidate_feature_size, feature)
             for feature in query_features
         }
+        return self._cpmerge(query_features, strings, tau)
+
+    def _cpmerge(
+        self,
+        query_features,
+        strings: Dict[str, Any],
+        tau,
+    ) -> Iterator[str]:
+        """CPMerge algorithm with pruning, see `_overlap_join()`.
+
+        Args:
+            strings (Dict[str, Any]): Mapping of query features to strings
+                with the candidate feature size.
+        """
+        if metrics.is_enabled():
+            metrics.incr('matcher.get_strings.calls', len(strings))
+            metrics.incr('matcher.get_strings.bytes', sum(
+                len(string.encode())
+                for feature_strings in strings.values()
+                for string in feature_strings
+            ))
+        # Sort elements in X by ascending order of |get(V,l,Xk)|
         query_features = sorted(
             query_features,
             key=lambda feature: len(strings[feature]),
@@ -34,6 +34,10 @@ class BaseNgram(ABC):
         features = self._extract_features(text)
         return type(self)._make_feature_set(features) if unique else features
 
+    def num_features(self, text: str) -> int:
+        """Number of features of a text, without extracting them."""
+        return len(self._extract_features(text))
+
     @abstractmethod
     def _extract_features(self, text: str) -> Tuple[str]:
         pass
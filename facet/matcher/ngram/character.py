@@ -31,6 +31,16 @@ class CharacterNgram(BaseNgram):
         self.boundary_length = boundary_length
         self.boundary_symbol = boundary_symbol
 
+    def num_features(self, text: str) -> int:
+        length = len(text.strip())
+        if self.boundary_length != 0:
+            length += 2 * (
+                (self.n - 1)
+                if self.boundary_length < 0
+                else self.boundary_length
+            )
+        return max(0, length - self.n + 1)
+
     def _extract_features(self, text: str) -> Tuple[str]:
         text = text.strip()
         if self.boundary_length != 0:
@@ -23,6 +23,10 @@ class WordNgram(BaseNgram):
         self.delim = delimiter
         self.joiner = joiner
 
+    def num_features(self, text: str) -> int:
+        num_words = sum(1 for x in text.split(self.delim) if x)
+        return max(0, num_words - self.n + 1)
+
     def _extract_features(self, text: str) -> Tuple[str]:
         words = [x.strip() for x in text.split(self.delim) if x]
         return tuple(
@@ -36,18 +36,36 @@ class Simstring(BaseSimstring):
         # processes nor during a later search. Solution is to store the value
         # into the database. But what if the database is not a key-value store,
         # such as ElasticSearch.
-        gmf = self._db.get('__GLOBAL_MAX_FEATURES__')
+        gmaxf = self._db.get('__GLOBAL_MAX_FEATURES__')
         self.global_max_features = (
             type(self).GLOBAL_MAX_FEATURES
-            if gmf is None
-            else gmf
+            if gmaxf is None
+            else gmaxf
         )
 
+        # NOTE: Feature size bounds are tracked exactly once a string is
+        # inserted. Databases without stored bounds use the class defaults.
+        # Databases installed before the min bound was stored only have
+        # the max bound, so the min bound defaults to the lowest size and
+        # inserts only extend the bounds.
+        gminf = self._db.get('__GLOBAL_MIN_FEATURES__')
+        self.global_min_features = (
+            type(self).GLOBAL_MIN_FEATURES
+            if gminf is None
+            else gminf
+        )
+        self._has_feature_bounds = gmaxf is not None or gminf is not None
+
     def get_strings(self, size: int, feature: str) -> List[str]:
         """Get strings corresponding to feature size and query feature."""
         strings = self._db.get(str(size) + feature)
         return set() if strings is None else strings
 
+    async def aget_strings(self, size: int, feature: str) -> List[str]:
+        """Asynchronous version of 'get_strings()'."""
+        strings = await self._db.aget(str(size) + feature)
+        return set() if strings is None else strings
+
     def insert(self, string: str):
         """Insert string into database."""
         features = self._ngram.get_features(string)
@@ -57,14 +75,28 @@ class Simstring(BaseSimstring):
                 strings.add(string)
                 self._db.set(str(len(features)) + feature, strings)
 
-        # Track and store longest sequence of features
+        # NOTE: Strings without features cannot be found.
+        if len(features) == 0:
+            return
+
+        # Track and store shortest/longest sequence of features
         # NOTE: Too many database accesses. Probably it is best to estimate
         # or fix a value or assume inserts occur during the same
         # installation phase and keep track using class variables, then
         # require a "closing" operation to store value into database.
-        if len(features) > self.global_max_features:
+        if (
+            not self._has_feature_bounds
+            or len(features) < self.global_min_features
+        ):
+            self.global_min_features = len(features)
+            self._db.set('__GLOBAL_MIN_FEATURES__', self.global_min_features)
+        if (
+            not self._has_feature_bounds
+            or len(features) > self.global_max_features
+        ):
             self.global_max_features = len(features)
             self._db.set('__GLOBAL_MAX_FEATURES__', self.global_max_features)
+        self._has_feature_bounds = True
 
     # def get_strings(self, size: int, feature: str) -> List[str]:
     #     """Get strings corresponding to feature size and query feature."""
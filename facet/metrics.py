@@ -0,0 +1,306 @@
+"""Registry of counters, gauges, and latency histograms.
+
+Metrics are disabled by default and collection functions return
+immediately, so instrumented code paths have negligible overhead.
+
+Examples:
+
+>>> import facet
+>>> facet.metrics.enable()
+>>> facet.Facet().match('text')
+>>> facet.metrics.dump('metrics.json')
+"""
+
+
+import sys
+import json
+import time
+import threading
+import contextlib
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+)
+
+
+__all__ = [
+    'DEFAULT_BUCKETS',
+    'COUNT_BUCKETS',
+    'Histogram',
+    'MetricsRegistry',
+    'registry',
+    'enable',
+    'disable',
+    'is_enabled',
+    'reset',
+    'incr',
+    'set_gauge',
+    'observe',
+    'timer',
+    'timed_iter',
+    'snapshot',
+    'dump',
+]
+
+
+# Upper bounds of histogram buckets, seconds for latencies.
+DEFAULT_BUCKETS = tuple(1e-6 * 4 ** i for i in range(13))
+
+# Upper bounds of histogram buckets for sizes/counts.
+COUNT_BUCKETS = tuple(2 ** i for i in range(17))
+
+
+class Histogram:
+    """Histogram with fixed exponential buckets and summary statistics.
+
+    Args:
+        buckets (Iterable[float]): Ascending upper bounds of buckets, an
+            extra bucket collects values larger than the last bound.
+    """
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count > 0 else 0.,
+            'min': self.min,
+            'max': self.max,
+            'buckets': {
+                **{
+                    f'{bound:g}': count
+                    for bound, count in zip(self.buckets, self.counts)
+                },
+                'inf': self.counts[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe collection of named metrics.
+
+    Notes:
+        * Names use dot notation, 'component.metric'. Counters with
+          'hits' and 'misses' suffixes are combined into a 'hit_ratio'
+          in snapshots.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def incr(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        """Add value to histogram.
+
+        Args:
+            buckets (Iterable[float]): Upper bounds of buckets, only used
+                when histogram is created.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = Histogram(buckets)
+                self._histograms[name] = histogram
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def _timer(self, name: str):
+        t1 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t1)
+
+    def timer(self, name: str):
+        """Context manager that observes elapsed time into a histogram."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timer(name)
+
+    def timed_iter(self, name: str, iterable: Iterable[Any]) -> Iterable[Any]:
+        """Observes time spent producing the items of an iterable.
+
+        Notes:
+            * If enabled, items are yielded as they are produced and time
+              spent by consumers is not included. Time is observed once
+              the iterable is exhausted or closed. Otherwise, the iterable
+              is returned as is.
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(name, iterable)
+
+    def _timed_iter(
+        self,
+        name: str,
+        iterable: Iterable[Any],
+    ) -> Iterator[Any]:
+        elapsed = 0.
+        iterator = iter(iterable)
+        try:
+            while True:
+                t1 = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - t1
+                yield item
+        finally:
+            self.observe(name, elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {
+                name: histogram.to_dict()
+                for name, histogram in self._histograms.items()
+            }
+
+        ratios = {}
+        for name, hits in counters.items():
+            if not name.endswith('.hits'):
+                continue
+            prefix = name[:-len('.hits')]
+            total = hits + counters.get(prefix + '.misses', 0)
+            ratios[prefix + '.hit_ratio'] = hits / total if total > 0 else 0.
+
+        return {
+            'counters': counters,
+            'gauges': {**gauges, **ratios},
+            'histograms': histograms,
+        }
+
+
+class _NullContext:
+    # NOTE: contextlib.nullcontext() requires Python 3.7
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+# Default registry used by FACET components
+registry = MetricsRegistry()
+
+
+def enable():
+    registry.enabled = True
+
+
+def disable():
+    registry.enabled = False
+
+
+def is_enabled() -> bool:
+    return registry.enabled
+
+
+def reset():
+    registry.reset()
+
+
+def incr(name: str, value: int = 1):
+    if registry.enabled:
+        registry.incr(name, value)
+
+
+def set_gauge(name: str, value: float):
+    if registry.enabled:
+        registry.set_gauge(name, value)
+
+
+def observe(
+    name: str,
+    value: float,
+    *,
+    buckets: Iterable[float] = DEFAULT_BUCKETS,
+):
+    if registry.enabled:
+        registry.observe(name, value, buckets=buckets)
+
+
+def timer(name: str):
+    return registry.timer(name)
+
+
+def timed_iter(name: str, iterable: Iterable[Any]) -> Iterable[Any]:
+    return registry.timed_iter(name, iterable)
+
+
+def snapshot() -> Dict[str, Any]:
+    return registry.snapshot()
+
+
+def dump(output: str = None, *, indent: int = 2) -> str:
+    """Write snapshot of metrics in JSON format.
+
+    Args:
+        output (str): Output file. If None, STDERR is used.
+    """
+    data = json.dumps(snapshot(), indent=indent)
+    if output is None:
+        print(data, file=sys.stderr)
+    else:
+        with open(output, 'w') as fd:
+            fd.write(data)
+    return data
@@ -2,9 +2,11 @@ import sys
 import struct
 import pickle
 import socket
+import contextlib
 import socketserver
 import selectors
 from ..helpers import parse_address
+from ..profiler import BaseProfiler
 
 
 __all__ = [
@@ -44,10 +46,11 @@ class SocketServerHandler(socketserver.StreamRequestHandler):
             # fails, pass the error as response (the client will raise
             # the expection).
             try:
-                response = getattr(
-                    self.server.served_object,
-                    method_name
-                )(*args, **kwargs)
+                with self.server.profile():
+                    response = getattr(
+                        self.server.served_object,
+                        method_name
+                    )(*args, **kwargs)
             except Exception as ex:
                 # NOTE: Should we extend exception message with server info?
                 response = ex
@@ -80,6 +83,9 @@ class SocketServer(socketserver.ThreadingTCPServer):
         protocol (int): Version number of the protocol used to pickle/unpickle
             objects. Necessary to be set if and only if server and client are
             running on different Python versions.
+
+        profiler (BaseProfiler): Profiler for request handlers, uses the
+            'server' scope.
     """
     # socketserver.BaseServer
     timeout = None  # wait for requests, used in handle_request()
@@ -107,6 +113,7 @@ class SocketServer(socketserver.ThreadingTCPServer):
         *,
         served_object,
         protocol=pickle.HIGHEST_PROTOCOL,
+        profiler: 'BaseProfiler' = None,
     ):
         # Resolve socket address
         host, port = (address[0], None) if len(address) == 1 else address
@@ -117,6 +124,14 @@ class SocketServer(socketserver.ThreadingTCPServer):
         self._handlers_connections = []
         self.served_object = served_object
         self.protocol = protocol
+        self.profiler = profiler
+
+    def profile(self):
+        """Context manager for profiling a request."""
+        # NOTE: An empty ExitStack is a null context manager.
+        if self.profiler is None:
+            return contextlib.ExitStack()
+        return self.profiler.profile('server')
 
     def serve_forever(self, poll_interval=None):
         """Handle one request at a time until shutdown.
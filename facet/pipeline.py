@@ -0,0 +1,273 @@
+"""Executor of processing stages connected by bounded queues.
+
+Each stage runs in its own worker threads, so stages waiting on I/O
+(e.g., database requests) overlap with CPU-bound stages (e.g.,
+tokenization). Queues between stages are bounded, so a stage blocks when
+the next stage falls behind (backpressure).
+
+Examples:
+
+>>> pipeline = Pipeline([('double', lambda x: 2 * x, 2)], queue_size=8)
+>>> list(pipeline.run(range(4)))
+[0, 2, 4, 6]
+>>> pipeline.stats['double']['utilization']
+"""
+
+
+import time
+import queue
+import threading
+from . import metrics
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Union,
+    Callable,
+    Iterable,
+    Iterator,
+)
+
+
+__all__ = [
+    'Stage',
+    'Pipeline',
+]
+
+
+# Interval for blocked workers to check if pipeline stopped.
+POLL_INTERVAL = 0.1
+
+
+# Marker of end of items.
+_END = object()
+
+
+class Stage:
+    """Stage of a pipeline.
+
+    Args:
+        name (str): Stage name, used for statistics and metrics.
+
+        func (Callable): Function applied to each item, its result is
+            passed to the next stage.
+
+        num_workers (int): Number of worker threads.
+    """
+
+    def __init__(self, name: str, func: Callable, num_workers: int = 1):
+        if num_workers < 1:
+            raise ValueError(f'invalid number of workers, {num_workers}')
+        self.name = name
+        self.func = func
+        self.num_workers = num_workers
+
+
+class Pipeline:
+    """Executor of stages connected by bounded queues.
+
+    Args:
+        stages (Iterable[Union[Stage, Tuple[str, Callable, int]]]): Stages
+            in order of execution.
+
+        queue_size (int): Max number of items waiting for each stage.
+
+    Notes:
+        * Results are yielded in the same order as their items.
+        * An exception raised by a stage stops the pipeline and is raised
+          by `run()`.
+        * Statistics of last run are available in `stats`, per stage:
+          number of items, busy time, utilization (busy time over wall
+          time of all workers), and max/mean depth of its input queue.
+          Same values are recorded as 'pipeline.<stage>.*' metrics.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Union['Stage', Tuple[str, Callable, int]]],
+        *,
+        queue_size: int = 64,
+    ):
+        self._stages = [
+            stage if isinstance(stage, Stage) else Stage(*stage)
+            for stage in stages
+        ]
+        if len(self._stages) == 0:
+            raise ValueError('invalid pipeline, no stages')
+        self._queue_size = queue_size
+        self.stats = {}
+
+    @property
+    def stages(self):
+        return list(self._stages)
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Generator of results of processing items through all stages."""
+        run = _PipelineRun(self._stages, queue_size=self._queue_size)
+        threads = [
+            threading.Thread(target=run.feed, args=(items,), daemon=True),
+        ]
+        threads.extend(
+            threading.Thread(target=run.work, args=(i,), daemon=True)
+            for i, stage in enumerate(self._stages)
+            for _ in range(stage.num_workers)
+        )
+
+        t1 = time.time()
+        for thread in threads:
+            thread.start()
+
+        # NOTE: Workers complete items out of order, so results are
+        # buffered until all previous results are available.
+        try:
+            results = {}
+            next_index = 0
+            while True:
+                item = run.get(len(self._stages))
+                if item is _END:
+                    break
+                index, value = item
+                results[index] = value
+                while next_index in results:
+                    yield results.pop(next_index)
+                    next_index += 1
+        finally:
+            run.stop.set()
+            for thread in threads:
+                thread.join()
+            self._record_stats(run.stats, time.time() - t1)
+
+        if len(run.errors) > 0:
+            raise run.errors[0]
+
+    def _record_stats(
+        self,
+        stats: Dict[str, Dict[str, Any]],
+        wall_time: float,
+    ):
+        self.stats = {}
+        for stage in self._stages:
+            stage_stats = stats[stage.name]
+            num_items = stage_stats['items']
+            self.stats[stage.name] = {
+                'items': num_items,
+                'workers': stage.num_workers,
+                'busy_time': stage_stats['busy_time'],
+                'utilization': (
+                    stage_stats['busy_time']
+                    / (wall_time * stage.num_workers)
+                    if wall_time > 0
+                    else 0.
+                ),
+                'queue_depth_max': stage_stats['queue_depth_max'],
+                'queue_depth_mean': (
+                    stage_stats['queue_depth_sum'] / num_items
+                    if num_items > 0
+                    else 0.
+                ),
+            }
+            for name, value in self.stats[stage.name].items():
+                metrics.set_gauge(f'pipeline.{stage.name}.{name}', value)
+
+
+class _PipelineRun:
+    """State of a pipeline run shared by its threads, see `Pipeline.run()`.
+    """
+
+    def __init__(self, stages: List['Stage'], *, queue_size: int):
+        self.stages = stages
+        self.queues = [
+            queue.Queue(maxsize=queue_size)
+            for _ in range(len(stages) + 1)
+        ]
+        self.stop = threading.Event()
+        self.errors = []
+        self.stats = {
+            stage.name: {
+                'items': 0,
+                'busy_time': 0.,
+                'queue_depth_max': 0,
+                'queue_depth_sum': 0,
+            }
+            for stage in stages
+        }
+        self._lock = threading.Lock()
+        # Number of workers still running per stage, the last worker to
+        # finish forwards end markers to the next stage.
+        self._num_running = [stage.num_workers for stage in stages]
+
+    def put(self, i: int, item: Any) -> bool:
+        """Put item in input queue of i-th stage (last queue is for
+        results), returns False if pipeline stopped."""
+        while not self.stop.is_set():
+            try:
+                self.queues[i].put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(self, i: int) -> Any:
+        """Get item from input queue of i-th stage, end marker if pipeline
+        stopped."""
+        while not self.stop.is_set():
+            try:
+                return self.queues[i].get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return _END
+
+    def fail(self, ex: Exception):
+        self.errors.append(ex)
+        self.stop.set()
+
+    def feed(self, items: Iterable[Any]):
+        try:
+            for item in enumerate(items):
+                if not self.put(0, item):
+                    return
+        except Exception as ex:
+            self.fail(ex)
+            return
+        for _ in range(self.stages[0].num_workers):
+            self.put(0, _END)
+
+    def work(self, i: int):
+        stage = self.stages[i]
+        try:
+            while True:
+                depth = self.queues[i].qsize()
+                item = self.get(i)
+                if item is _END:
+                    break
+                index, value = item
+                t1 = time.time()
+                value = stage.func(value)
+                self._record(stage.name, time.time() - t1, depth)
+                if not self.put(i + 1, (index, value)):
+                    return
+        except Exception as ex:
+            self.fail(ex)
+            return
+
+        with self._lock:
+            self._num_running[i] -= 1
+            is_last = self._num_running[i] == 0
+        if is_last:
+            num_ends = (
+                self.stages[i + 1].num_workers
+                if i + 1 < len(self.stages)
+                else 1
+            )
+            for _ in range(num_ends):
+                self.put(i + 1, _END)
+
+    def _record(self, name: str, busy_time: float, depth: int):
+        with self._lock:
+            stats = self.stats[name]
+            stats['items'] += 1
+            stats['busy_time'] += busy_time
+            stats['queue_depth_sum'] += depth
+            if depth > stats['queue_depth_max']:
+                stats['queue_depth_max'] = depth
@@ -0,0 +1,20 @@
+from .base import BaseProfiler
+from .cprofile import CProfileProfiler
+from .tracemalloc import TracemallocProfiler
+from .sampling import SamplingProfiler
+from typing import Union
+
+
+profiler_map = {
+    CProfileProfiler.NAME: CProfileProfiler,
+    TracemallocProfiler.NAME: TracemallocProfiler,
+    SamplingProfiler.NAME: SamplingProfiler,
+}
+
+
+def get_profiler(value: Union[str, 'BaseProfiler']):
+    if isinstance(value, str):
+        return profiler_map[value]()
+    elif value is None or isinstance(value, BaseProfiler):
+        return value
+    raise ValueError(f'invalid profiler, {value}')
@@ -0,0 +1,110 @@
+import os
+import threading
+import contextlib
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from ..helpers import expand_envvars
+from typing import Iterable
+
+
+__all__ = ['BaseProfiler']
+
+
+class BaseProfiler(ABC):
+    """Class supporting profilers scoped to FACET operations.
+
+    Args:
+        output (str): Output file for profiling data. The '{scope}' and
+            '{pid}' placeholders are replaced by the profiled scope and
+            the process ID. If None, a summary is printed to STDERR.
+
+        scopes (Iterable[str]): Operations to profile. Valid values are:
+            'match', 'install', 'server' (requests of network server).
+
+    Notes:
+        * Profiled operations are serialized, concurrent requests of a
+          server wait for the active profiled request to complete.
+
+        * Nested scopes are profiled as part of the outermost scope.
+
+        * Profiling data accumulates across operations, so the output
+          file always contains the data of all profiled operations.
+    """
+
+    SCOPES = ('match', 'install', 'server')
+
+    def __init__(
+        self,
+        output: str = None,
+        *,
+        scopes: Iterable[str] = SCOPES,
+    ):
+        self._output = output
+        self._scopes = set(scopes)
+        self._lock = threading.RLock()
+        self._depth = 0
+
+        invalid_scopes = self._scopes - set(type(self).SCOPES)
+        if invalid_scopes:
+            raise ValueError(f'invalid profiling scopes, {invalid_scopes}')
+
+    @property
+    def output(self):
+        return self._output
+
+    @property
+    def scopes(self):
+        return self._scopes
+
+    @contextlib.contextmanager
+    def profile(self, scope: str):
+        """Context manager that profiles a scoped operation."""
+        if scope not in self._scopes:
+            yield
+            return
+
+        with self._lock:
+            self._depth += 1
+            if self._depth > 1:
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            self._start()
+            try:
+                yield
+            finally:
+                self._stop()
+                self._depth -= 1
+                self.dump(scope)
+
+    def dump(self, scope: str = ''):
+        """Write profiling data to output file or summary to STDERR."""
+        if self._output:
+            output = expand_envvars(self._output).format(
+                scope=scope,
+                pid=os.getpid(),
+            )
+            self._dump(output)
+        else:
+            self._print()
+
+    @abstractmethod
+    def _start(self):
+        pass
+
+    @abstractmethod
+    def _stop(self):
+        pass
+
+    @abstractmethod
+    def _dump(self, output: str):
+        pass
+
+    @abstractmethod
+    def _print(self):
+        pass
@@ -0,0 +1,40 @@
+import sys
+import pstats
+import cProfile
+from .base import BaseProfiler
+
+
+__all__ = ['CProfileProfiler']
+
+
+class CProfileProfiler(BaseProfiler):
+    """Deterministic profiler, output is a '.pstats' file.
+
+    Args:
+        sort (str): Sort key for printed summary, see 'pstats.Stats'.
+
+        limit (int): Number of entries of printed summary.
+
+    Kwargs: Options forwarded to 'BaseProfiler()'.
+    """
+
+    NAME = 'cprofile'
+
+    def __init__(self, output: str = None, *, sort='time', limit=30, **kwargs):
+        super().__init__(output, **kwargs)
+        self._sort = sort
+        self._limit = limit
+        self._prof = cProfile.Profile(subcalls=True, builtins=True)
+
+    def _start(self):
+        self._prof.enable()
+
+    def _stop(self):
+        self._prof.disable()
+
+    def _dump(self, output: str):
+        self._prof.dump_stats(output)
+
+    def _print(self):
+        stats = pstats.Stats(self._prof, stream=sys.stderr)
+        stats.sort_stats(self._sort).print_stats(self._limit)
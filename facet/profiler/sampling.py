@@ -0,0 +1,79 @@
+import sys
+import threading
+import collections
+from .base import BaseProfiler
+
+
+__all__ = ['SamplingProfiler']
+
+
+class SamplingProfiler(BaseProfiler):
+    """Statistical profiler that periodically samples the call stack of
+    the profiled thread, output is a file of folded stacks (one
+    'frame;frame;... count' per line) for flame graph tools.
+
+    Args:
+        interval (float): Seconds between samples.
+
+        limit (int): Number of entries of printed summary.
+
+    Kwargs: Options forwarded to 'BaseProfiler()'.
+    """
+
+    NAME = 'sampling'
+
+    def __init__(
+        self,
+        output: str = None,
+        *,
+        interval: float = 0.005,
+        limit: int = 30,
+        **kwargs,
+    ):
+        super().__init__(output, **kwargs)
+        self._interval = interval
+        self._limit = limit
+        self._stacks = collections.Counter()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def _sample(self, thread_id: int):
+        while not self._stop_event.wait(self._interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f'{code.co_name} ({code.co_filename}:{frame.f_lineno})'
+                )
+                frame = frame.f_back
+            if stack:
+                self._stacks[';'.join(reversed(stack))] += 1
+
+    def _start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._sample,
+            args=(threading.get_ident(),),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _stop(self):
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _dump(self, output: str):
+        with open(output, 'w') as fd:
+            for stack, count in self._stacks.items():
+                fd.write(f'{stack} {count}\n')
+
+    def _print(self):
+        # Summary of functions at top of stacks
+        frames = collections.Counter()
+        for stack, count in self._stacks.items():
+            frames[stack.rsplit(';', 1)[-1]] += count
+        total = sum(frames.values())
+        for frame, count in frames.most_common(self._limit):
+            print(f'{count / total:8.2%} {count:8d} {frame}', file=sys.stderr)
@@ -0,0 +1,50 @@
+import sys
+import tracemalloc
+from .base import BaseProfiler
+
+
+__all__ = ['TracemallocProfiler']
+
+
+class TracemallocProfiler(BaseProfiler):
+    """Memory allocation profiler, output is a snapshot file that can be
+    loaded with 'tracemalloc.Snapshot.load()'.
+
+    Args:
+        nframes (int): Number of frames stored per allocation traceback.
+
+        limit (int): Number of entries of printed summary.
+
+    Kwargs: Options forwarded to 'BaseProfiler()'.
+
+    Notes:
+        * Snapshot is taken at the end of a profiled operation, so it
+          contains the allocations alive at that point.
+    """
+
+    NAME = 'tracemalloc'
+
+    def __init__(self, output: str = None, *, nframes=25, limit=30, **kwargs):
+        super().__init__(output, **kwargs)
+        self._nframes = nframes
+        self._limit = limit
+        self._snapshot = None
+        self._is_owner = False
+
+    def _start(self):
+        # NOTE: Do not stop tracing started by someone else.
+        self._is_owner = not tracemalloc.is_tracing()
+        if self._is_owner:
+            tracemalloc.start(self._nframes)
+
+    def _stop(self):
+        self._snapshot = tracemalloc.take_snapshot()
+        if self._is_owner:
+            tracemalloc.stop()
+
+    def _dump(self, output: str):
+        self._snapshot.dump(output)
+
+    def _print(self):
+        for stat in self._snapshot.statistics('lineno')[:self._limit]:
+            print(stat, file=sys.stderr)
@@ -0,0 +1,291 @@
+"""Compact match records and columnar match results.
+
+Matches are carried as `MatchRecord` objects, which store the common
+fields in slots and behave as mutable mappings, so they compare equal to
+the equivalent dictionaries. Dictionaries are only created by formatters
+that need them, see `to_builtin()`.
+
+Examples:
+
+>>> record = MatchRecord(0, 5, 'apollo', 'apollo', 1.0)
+>>> record['CUI'] = 'C0000000'
+>>> record.to_dict()
+{'begin': 0, 'end': 5, 'ngram': 'apollo', 'candidate': 'apollo',
+ 'similarity': 1.0, 'CUI': 'C0000000'}
+"""
+
+
+import pyarrow
+import collections.abc
+from typing import (
+    Any,
+    List,
+    Dict,
+    Tuple,
+    Union,
+    Iterable,
+    Iterator,
+)
+
+
+__all__ = [
+    'MatchRecord',
+    'MatchTable',
+    'to_builtin',
+    'json_default',
+]
+
+
+class MatchRecord(collections.abc.MutableMapping):
+    """Match of an N-gram, with fields stored in slots.
+
+    Args:
+        begin (int): Position of first character of N-gram in corpus.
+
+        end (int): Position of last character of N-gram in corpus.
+
+        ngram (str): N-gram text.
+
+        candidate (str): Matched term.
+
+        similarity (float): Similarity between N-gram and term.
+
+    Notes:
+        * Other fields (e.g., 'CUI', 'STY') are stored in a dictionary
+          created on first use.
+        * Fields in slots cannot be removed.
+    """
+
+    FIELDS = ('begin', 'end', 'ngram', 'candidate', 'similarity')
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(
+        self,
+        begin: int,
+        end: int,
+        ngram: str,
+        candidate: str,
+        similarity: float,
+        extra: Dict[str, Any] = None,
+    ):
+        self.begin = begin
+        self.end = end
+        self.ngram = ngram
+        self.candidate = candidate
+        self.similarity = similarity
+        self._extra = extra
+
+    @classmethod
+    def from_mapping(
+        cls,
+        mapping: Union['MatchRecord', Dict[str, Any]],
+    ) -> 'MatchRecord':
+        extra = {k: v for k, v in mapping.items() if k not in cls.FIELDS}
+        return cls(
+            *(mapping[field] for field in cls.FIELDS),
+            extra=extra if len(extra) > 0 else None,
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key in MatchRecord.FIELDS:
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in MatchRecord.FIELDS:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in MatchRecord.FIELDS:
+            raise TypeError(f'invalid deletion of match field, {key}')
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from MatchRecord.FIELDS
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(MatchRecord.FIELDS) + (
+            0 if self._extra is None else len(self._extra)
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return key in MatchRecord.FIELDS or (
+            self._extra is not None and key in self._extra
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, collections.abc.Mapping):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in MatchRecord.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]):
+        for name, value in zip(MatchRecord.__slots__, state):
+            setattr(self, name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            'begin': self.begin,
+            'end': self.end,
+            'ngram': self.ngram,
+            'candidate': self.candidate,
+            'similarity': self.similarity,
+        }
+        if self._extra is not None:
+            record.update(self._extra)
+        return record
+
+    def replace(self, **fields) -> 'MatchRecord':
+        """Copy of record with the given fields replaced."""
+        record = MatchRecord(
+            self.begin,
+            self.end,
+            self.ngram,
+            self.candidate,
+            self.similarity,
+            extra=None if self._extra is None else dict(self._extra),
+        )
+        for key, value in fields.items():
+            record[key] = value
+        return record
+
+
+class MatchTable:
+    """Columnar matches of multiple corpora.
+
+    Each row is a match, and matches of the same N-gram span share a
+    'group' number, which is unique within a corpus ('source'). Fields not
+    present in a match are None.
+
+    Args:
+        data (Union[Dict, Iterable[Tuple]]): Matches by corpus source, or
+            (source, matches) pairs as generated by 'imatch()'.
+
+    Examples:
+
+    >>> table = MatchTable(Facet().match(corpus, formatter=None))
+    >>> table['candidate'], table.to_arrow()
+    """
+
+    BASE_COLUMNS = ('source', 'group') + MatchRecord.FIELDS
+
+    def __init__(
+        self,
+        data: Union[
+            Dict[str, List[List['MatchRecord']]],
+            Iterable[Tuple[str, List[List['MatchRecord']]]],
+        ] = (),
+    ):
+        self._columns = {name: [] for name in type(self).BASE_COLUMNS}
+        self._num_rows = 0
+        self._num_groups = collections.Counter()
+        self.extend(data)
+
+    @property
+    def columns(self) -> Dict[str, List[Any]]:
+        return self._columns
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def __getitem__(self, name: str) -> List[Any]:
+        return self._columns[name]
+
+    def __repr__(self) -> str:
+        return (
+            f'{type(self).__name__}(rows={self._num_rows}, '
+            f'columns={list(self._columns)})'
+        )
+
+    def extend(
+        self,
+        data: Union[
+            Dict[str, List[List['MatchRecord']]],
+            Iterable[Tuple[str, List[List['MatchRecord']]]],
+        ],
+    ):
+        """Add matches by corpus source."""
+        if hasattr(data, 'items'):
+            data = data.items()
+        columns = self._columns
+        for source, matches in data:
+            for ngram_matches in matches:
+                group = self._num_groups[source]
+                self._num_groups[source] += 1
+                for ngram_match in ngram_matches:
+                    columns['source'].append(source)
+                    columns['group'].append(group)
+                    for name, value in ngram_match.items():
+                        column = columns.get(name)
+                        if column is None:
+                            column = [None] * self._num_rows
+                            columns[name] = column
+                        column.append(value)
+                    self._num_rows += 1
+                    # Fill fields not present in this match
+                    for column in columns.values():
+                        if len(column) < self._num_rows:
+                            column.append(None)
+
+    def to_arrow(self) -> 'pyarrow.Table':
+        return pyarrow.table(self._columns)
+
+    def to_dicts(self) -> Dict[str, List[List[Dict[str, Any]]]]:
+        """Matches by corpus source, see `MatchTable()`."""
+        matches = {}
+        names = [
+            name
+            for name in self._columns
+            if name not in ('source', 'group')
+        ]
+        prev_key = None
+        for i in range(self._num_rows):
+            source = self._columns['source'][i]
+            key = (source, self._columns['group'][i])
+            if key != prev_key:
+                matches.setdefault(source, []).append([])
+                prev_key = key
+            matches[source][-1].append({
+                name: self._columns[name][i]
+                for name in names
+                if self._columns[name][i] is not None
+                or name in MatchRecord.FIELDS
+            })
+        return matches
+
+
+def to_builtin(data: Any) -> Any:
+    """Copy of matches with records converted to dictionaries, for
+    serializers that only support builtin types."""
+    if isinstance(data, MatchRecord):
+        return data.to_dict()
+    if isinstance(data, collections.abc.Mapping):
+        return {k: to_builtin(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [to_builtin(v) for v in data]
+    return data
+
+
+def json_default(obj: Any) -> Any:
+    """Conversion of match records for 'json.dumps(default=...)'."""
+    if isinstance(obj, MatchRecord):
+        return obj.to_dict()
+    raise TypeError(
+        f'Object of type {type(obj).__name__} is not JSON serializable'
+    )
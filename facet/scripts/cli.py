@@ -42,6 +42,22 @@ def parse_dump_configuration(output: str, format='yaml'):
     return output, format
 
 
+def parse_profile(profile: str, profiler='cprofile') -> Dict[str, Any]:
+    """Parse argument of profile option.
+
+    A profile option consists of a file and/or profiler using the
+    following syntax:
+        * Profile to file using default profiler - "file"
+        * Profile to file with specified profiler - "file:profiler"
+        * Print summary to STDERR with specified profiler - "profiler"
+    """
+    if ':' in profile:
+        profile, profiler = profile.split(':')
+    elif profile in facet.profiler.profiler_map:
+        profile, profiler = None, profile
+    return {'class': profiler, 'output': profile}
+
+
 def dump_configuration(config: Dict[str, Any], output=None, format='yaml'):
     """Dump configuration data to a file or STDOUT."""
     # Run configuration through loader so that it gets parsed
@@ -119,7 +135,8 @@ def cli():
 )
 @click.option(
     '-f', '--formatter',
-    type=click.Choice(('json', 'yaml', 'xml', 'csv', 'pickle', 'null')),
+    type=click.Choice(('json', 'yaml', 'xml', 'csv', 'pickle', 'null',
+                       'jsonl', 'xmlstream', 'csvstream', 'columnar')),
     default='json',
     show_default=True,
     help='Format for match results.',
@@ -129,6 +146,13 @@ def cli():
     type=str,
     help='Output target for match results.',
 )
+@click.option(
+    '-M', '--manifest',
+    type=str,
+    help='Manifest file for incremental matching, unchanged documents '
+         'reuse their stored matches. If "auto", "<output>.manifest" '
+         'is used.',
+)
 @click.option(
     '-t', '--tokenizer',
     type=click.Choice(
@@ -158,6 +182,18 @@ def cli():
          'Option form: "file", "file:format", "format"'
          'Formats supported: json, yaml, xml',
 )
+@click.option(
+    '-m', '--metrics',
+    type=str,
+    help='Collect metrics and write them in JSON format to file.',
+)
+@click.option(
+    '-P', '--profile',
+    type=str,
+    help='Profile operations and write profiling data to file. '
+         'Option form: "file", "file:profiler", "profiler". '
+         'Profilers supported: cprofile, tracemalloc, sampling',
+)
 def run(
     config,
     query,
@@ -166,10 +202,13 @@ def run(
     ngram,
     formatter,
     output,
+    manifest,
     tokenizer,
     database,
     install,
     dump_config,
+    metrics,
+    profile,
 ):
     # Resolve settings for dumping configuration
     full_config = copy.deepcopy(config)
@@ -180,15 +219,19 @@ def run(
     # Support CLI shortcut options from configuration files
     query = config.pop('query', query)
     output = config.pop('output', output)
+    manifest = config.pop('manifest', manifest)
     install = config.pop('install', install)
     if isinstance(install, str):
         install = {'filename': install}
+    metrics = config.pop('metrics', metrics)
 
     # Prepare factory options from configuration
     factory_config = copy.deepcopy(config)
     factory_config['class'] = config.get('class', 'facet')
     factory_config['tokenizer'] = config.get('tokenizer', tokenizer)
     factory_config['formatter'] = config.get('formatter', formatter)
+    if profile:
+        factory_config['profile'] = parse_profile(profile)
     factory_config['matcher'] = config.get('matcher', {
         'class': 'simstring',
         'db': database,
@@ -202,13 +245,21 @@ def run(
         dump_configuration({'FACET': full_config}, dump_output, dump_format)
         return
 
+    if manifest == 'auto':
+        if not output:
+            raise click.UsageError('manifest "auto" requires an output')
+        manifest = output + '.manifest'
+
+    if metrics:
+        facet.metrics.enable()
+
     f = facet.FacetFactory(factory_config).create()
 
     if install:
         f.install(**install)
 
     if query:
-        matches = f.match(query, output=output)
+        matches = f.match(query, output=output, manifest=manifest)
         if matches is not None:
             print(matches)
     else:
@@ -216,6 +267,9 @@ def run(
 
     f.close()
 
+    if metrics:
+        facet.metrics.dump(metrics)
+
 
 @click.command(context_settings=CONTEXT_SETTINGS)
 @click.help_option(show_default=False)
@@ -268,7 +322,8 @@ def run(
 )
 @click.option(
     '-f', '--formatter',
-    type=click.Choice(('json', 'yaml', 'xml', 'csv', 'pickle', 'null')),
+    type=click.Choice(('json', 'yaml', 'xml', 'csv', 'pickle', 'null',
+                       'jsonl', 'xmlstream', 'csvstream')),
     default='json',
     show_default=True,
     help='Format for match results.',
@@ -302,6 +357,18 @@ def run(
          'Option form: "file", "file:format", "format"'
          'Formats supported: json, yaml, xml',
 )
+@click.option(
+    '-m', '--metrics',
+    type=str,
+    help='Collect metrics and write them in JSON format to file.',
+)
+@click.option(
+    '-P', '--profile',
+    type=str,
+    help='Profile operations and write profiling data to file. '
+         'Option form: "file", "file:profiler", "profiler". '
+         'Profilers supported: cprofile, tracemalloc, sampling',
+)
 def server(
     config,
     host,
@@ -315,6 +382,8 @@ def server(
     database,
     install,
     dump_config,
+    metrics,
+    profile,
 ):
     # Resolve settings for dumping configuration
     full_config = copy.deepcopy(config)
@@ -329,12 +398,15 @@ def server(
     install = config.pop('install', install)
     if isinstance(install, str):
         install = {'filename': install}
+    metrics = config.pop('metrics', metrics)
 
     # Prepare factory options from configuration
     factory_config = copy.deepcopy(config)
     factory_config['class'] = config.get('class', 'facet')
     factory_config['tokenizer'] = config.get('tokenizer', tokenizer)
     factory_config['formatter'] = config.get('formatter', formatter)
+    if profile:
+        factory_config['profile'] = parse_profile(profile)
     factory_config['matcher'] = config.get('matcher', {
         'class': 'simstring',
         'db': database,
@@ -348,6 +420,9 @@ def server(
         dump_configuration({'SERVER': full_config}, dump_output, dump_format)
         return
 
+    if metrics:
+        facet.metrics.enable()
+
     f = facet.FacetFactory(factory_config).create()
 
     if install:
@@ -357,11 +432,15 @@ def server(
         (host, port),
         facet.network.SocketServerHandler,
         served_object=f,
+        profiler=f.profiler,
     ) as server:
         server.serve_forever()
 
     f.close()
 
+    if metrics:
+        facet.metrics.dump(metrics)
+
 
 @click.command(context_settings=CONTEXT_SETTINGS)
 @click.help_option(show_default=False)
@@ -392,7 +471,8 @@ def server(
 )
 @click.option(
     '-f', '--formatter',
-    type=click.Choice(('json', 'yaml', 'xml', 'csv', 'pickle', 'null')),
+    type=click.Choice(('json', 'yaml', 'xml', 'csv', 'pickle', 'null',
+                       'jsonl', 'xmlstream', 'csvstream')),
     default='json',
     show_default=True,
     help='Format for match results.',
@@ -1,4 +1,5 @@
 import pyarrow
+from ..records import to_builtin
 from .base import BaseSerializer
 
 
@@ -11,7 +12,7 @@ class ArrowSerializer(BaseSerializer):
     NAME = 'arrow'
 
     def dumps(self, obj):
-        return pyarrow.serialize(obj).to_buffer().to_pybytes()
+        return pyarrow.serialize(to_builtin(obj)).to_buffer().to_pybytes()
 
     def loads(self, obj):
         return pyarrow.deserialize(obj)
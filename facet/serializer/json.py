@@ -1,4 +1,5 @@
 import json
+from ..records import json_default
 from .base import BaseSerializer
 
 
@@ -11,7 +12,7 @@ class JSONSerializer(BaseSerializer):
     NAME = 'json'
 
     def dumps(self, obj):
-        return json.dumps(obj)
+        return json.dumps(obj, default=json_default)
 
     def loads(self, obj):
         return json.loads(obj)
@@ -1,4 +1,5 @@
 import yaml
+from ..records import to_builtin
 from .base import BaseSerializer
 
 
@@ -11,7 +12,7 @@ class YAMLSerializer(BaseSerializer):
     NAME = 'yaml'
 
     def dumps(self, obj):
-        return yaml.dump(obj)
+        return yaml.dump(to_builtin(obj))
 
     def loads(self, obj):
         return yaml.safe_load(obj)
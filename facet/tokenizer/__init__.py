@@ -1,4 +1,8 @@
 from .base import BaseTokenizer
+from .normalizer import (
+    Normalizer,
+    get_normalizer,
+)
 from .nltk import NLTKTokenizer
 from .null import NullTokenizer
 from .spacy import SpaCyTokenizer
@@ -134,28 +134,58 @@ class BaseTokenizer(ABC):
             text = converter(text)
         return text
 
-    def sentencize(self, text: str) -> Iterator[Tuple[int, int, str]]:
-        if len(self._converters) == 0:
+    @property
+    def converters(self):
+        return tuple(self._converters)
+
+    def sentencize(
+        self,
+        text: str,
+        *,
+        convert: bool = True,
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        Args:
+            convert (bool): If set, apply converters to sentences. Disable
+                if text was already normalized, see 'Normalizer'.
+        """
+        if not convert or len(self._converters) == 0:
             yield from self._sentencize(text)
         else:
             for begin, end, sentence in self._sentencize(text):
                 yield begin, end, self.convert(sentence)
 
+    @property
+    def window(self):
+        return self._window
+
     def tokenize(
         self,
         text: Union[str, Tuple[int, int, str]],
+        *,
+        window: int = None,
     ) -> Iterator[Tuple[int, int, str]]:
+        """
+        Args:
+            text (str, Tuple[int, int, str]): Text or text with span.
+
+            window (int): Max number of tokens per span. If None, the
+                tokenizer's window is used.
+        """
         # NOTE: Support raw strings to allow invoking directly, that is,
         # it is not necessary to 'sentencize()' first.
         if isinstance(text, str):
             text = (0, len(text) - 1, text)
 
-        if self._window == 1:
+        if window is None:
+            window = self._window
+
+        if window == 1:
             yield from self._tokenize(text)
         else:
             tokens = list(self._tokenize(text))
             for i in range(len(tokens)):
-                for j in range(i + 1, min(i + self._window,
+                for j in range(i + 1, min(i + window,
                                           len(tokens)) + 1):
                     span = tokens[i:j]
                     yield (
@@ -97,6 +97,8 @@ class NLTKTokenizer(BaseTokenizer):
 
         self._sentencizer = type(self)._SENTENCIZER_MAP[sentencizer]()
         self._chunker = chunker_func_map[chunker]
+        # NOTE: Window only applies to window-based tokenization.
+        self._use_window = chunker is None
         self._tokenizer = type(self)._TOKENIZER_MAP[tokenizer]()
         # NOTE: Need to set 'language' before '_get_lemmatizer()'.
         self._language = language
@@ -150,13 +152,17 @@ class NLTKTokenizer(BaseTokenizer):
             and token not in self._stopwords
         )
 
-    def tokenize(self, text):
+    def tokenize(self, text, *, window: int = None):
+        kwargs = {} if window is None or not self._use_window else {
+            'window': window,
+        }
         # NOTE: Support raw strings to allow invoking directly, that is,
         # it is not necessary to 'sentencize()' first.
         yield from self._chunker(
             (0, len(text) - 1, text)
             if isinstance(text, str)
-            else text
+            else text,
+            **kwargs,
         )
 
     def _sentencize(self, text):
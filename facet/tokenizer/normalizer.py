@@ -0,0 +1,103 @@
+import re
+import functools
+from unidecode import unidecode
+from typing import (
+    List,
+    Tuple,
+    Union,
+    Callable,
+    Iterable,
+)
+
+
+__all__ = [
+    'Normalizer',
+    'get_normalizer',
+]
+
+
+_NON_ASCII_REGEX = re.compile(r'[^\x00-\x7f]')
+
+# Converters that do not modify ASCII text.
+_ASCII_IDENTITY_CONVERTERS = {str, unidecode}
+
+
+class Normalizer:
+    """Single-pass text normalization with offset mapping.
+
+    ASCII text is converted as a whole. Other text is converted per
+    character using a memoized table, and a map of offsets from
+    normalized text to original text is built if lengths change.
+
+    Args:
+        converters (Iterable[Callable]): Converter functions applied in
+            order, e.g., unidecode, str.lower.
+
+    Notes:
+        * Converters should operate character-wise. For example, casing
+          of non-ASCII text is resolved per character, so context-dependent
+          rules (final sigma) are not applied.
+    """
+
+    def __init__(self, converters: Iterable[Callable] = ()):
+        # NOTE: Consecutive duplicate converters have no effect.
+        self._converters = []
+        for converter in converters:
+            if converter is str:
+                continue
+            if not self._converters or self._converters[-1] != converter:
+                self._converters.append(converter)
+        self._ascii_converters = [
+            converter
+            for converter in self._converters
+            if converter not in _ASCII_IDENTITY_CONVERTERS
+        ]
+        self._table = {}
+
+    @property
+    def converters(self):
+        return tuple(self._converters)
+
+    def normalize(self, text: str) -> Tuple[str, Union[List[int], None]]:
+        """Normalize text.
+
+        Returns (Tuple[str, List[int]]): Normalized text and offsets of
+            its characters in original text. Offsets are None if they are
+            the same in both texts.
+        """
+        if _NON_ASCII_REGEX.search(text) is None:
+            normalized = text
+            for converter in self._ascii_converters:
+                normalized = converter(normalized)
+            if len(normalized) == len(text):
+                return normalized, None
+
+        table = self._table
+        chars = []
+        for char in text:
+            value = table.get(char)
+            if value is None:
+                value = char
+                for converter in self._converters:
+                    value = converter(value)
+                table[char] = value
+            chars.append(value)
+
+        normalized = ''.join(chars)
+        if len(normalized) == len(text) and all(
+            len(value) == 1 for value in chars
+        ):
+            return normalized, None
+
+        offsets = [
+            i
+            for i, value in enumerate(chars)
+            for _ in range(len(value))
+        ]
+        return normalized, offsets
+
+
+@functools.lru_cache(maxsize=32)
+def get_normalizer(converters: Tuple[Callable, ...]) -> 'Normalizer':
+    """Shared normalizer, so that memoized tables are reused."""
+    return Normalizer(converters)
@@ -83,6 +83,8 @@ class SpaCyTokenizer(BaseTokenizer):
         }
 
         self._chunker = chunker_func_map[chunker]
+        # NOTE: Window only applies to window-based tokenization.
+        self._use_window = chunker is None
         self._lemmatizer = lemmatizer
         self._language = language
 
@@ -96,6 +98,8 @@ class SpaCyTokenizer(BaseTokenizer):
         self,
         text: str,
         as_tuple: bool = False,
+        *,
+        convert: bool = True,
     ) -> Iterator[Union[Tuple[int, int, str], 'spacy.tokens.span.Span']]:
         # spaCy uses an object-model for NLP, so to support invoking
         # 'sentencize()' directly we convert the objects to span-text tuples.
@@ -106,7 +110,11 @@ class SpaCyTokenizer(BaseTokenizer):
                     sentence[-1].idx + len(sentence[-1]) - 1,
                     # NOTE: spaCy lemmatizes sentences, so we take
                     # advantage of it.
-                    self.convert(self._lemmatize(sentence)),
+                    (
+                        self.convert(self._lemmatize(sentence))
+                        if convert
+                        else self._lemmatize(sentence)
+                    ),
                 )
                 for sentence in self._sentencize(text)
             )
@@ -114,18 +122,26 @@ class SpaCyTokenizer(BaseTokenizer):
             # NOTE: Converters are applied to the input text because
             # we cannot modify spaCy objects and maintain consistency of
             # attributes.
-            yield from self._sentencize(self.convert(text))
+            yield from self._sentencize(
+                self.convert(text) if convert else text
+            )
 
     def tokenize(
         self,
         text: Union[str, 'spacy.tokens.span.Span'],
+        *,
+        window: int = None,
     ) -> Iterator[Tuple[int, int, str]]:
+        kwargs = {} if window is None or not self._use_window else {
+            'window': window,
+        }
         # NOTE: Support raw strings to allow invoking directly, that is,
         # it is not necessary to 'sentencize()' first.
         yield from self._chunker(
             self._nlp(text)
             if isinstance(text, str)
-            else text
+            else text,
+            **kwargs,
         )
 
     def _sentencize(self, text) -> Iterator['spacy.tokens.span.Span']:
@@ -1,3 +1,7 @@
+import os
+import numpy
+import pytest
+import pyarrow
 import facet
 
 
@@ -8,3 +12,744 @@ def test_facet():
     matches = f.match('beautiful window in Apollo spacecraft')
     print(matches)
     f.close()
+
+
+def test_facet_imatch():
+    f = facet.FacetFactory({'formatter': None}).create()
+    f.install('data/install/american-english', nrows=50000)
+    corpora = ['beautiful window\nin Apollo spacecraft', 'zzzzzz']
+    matches = list(f.imatch(corpora))
+    assert len(matches) == 2
+    assert len(matches[0][1]) > 0 and len(matches[1][1]) == 0
+    assert dict(f.match(corpora)) == {'__text__': matches[0][1]}
+    sentences = list(f.imatch(corpora, by_sentence=True))
+    assert len(sentences) == 2
+    f.close()
+
+
+def test_facet_stream_formatter(tmp_path):
+    f = facet.FacetFactory({'formatter': 'jsonl'}).create()
+    f.install('data/install/american-english', nrows=50000)
+    output = tmp_path / 'matches.jsonl'
+    f.match(['beautiful window', 'Apollo spacecraft'], output=str(output))
+    assert len(output.read_text().splitlines()) == 2
+    f.close()
+
+    # NOTE: Matches of later records can have fields not in the header.
+    matches = [
+        ('a', [[{'begin': 0, 'candidate': 'heart'}]]),
+        ('b', [[{'begin': 0, 'candidate': 'heart', 'CUI': 'C0018787'}]]),
+    ]
+    assert facet.CSVStreamFormatter()(matches).splitlines() == [
+        'source,begin,candidate', 'a,0,heart', 'b,0,heart',
+    ]
+
+
+def test_facet_chunked_corpus(tmp_path):
+    f = facet.FacetFactory({'formatter': None}).create()
+    f.install('data/install/american-english', nrows=50000)
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text('beautiful window in Apollo spacecraft\n' * 50)
+    matches = f.match(str(corpus))
+    chunked_matches = f.match(str(corpus), corpus_kwargs={'chunk_size': 64})
+    assert matches == chunked_matches
+
+    # NOTE: Chunks have the same newlines and offsets as text mode reads.
+    corpus.write_bytes(b'beautiful window\r\nin Apollo spacecraft\r\n' * 20)
+    text = ''.join(
+        text
+        for _, text, _ in facet.helpers.iread_corpus_file(str(corpus))
+    )
+    chunks = list(facet.helpers.iread_corpus_file(str(corpus), chunk_size=7))
+    assert ''.join(text for _, text, _ in chunks) == text
+    assert all(
+        text[offset:offset + len(chunk)] == chunk
+        for _, chunk, offset in chunks
+    )
+    assert f.match(str(corpus)) == f.match(
+        str(corpus),
+        corpus_kwargs={'chunk_size': 64, 'delimiter': '\r'},
+    )
+    f.close()
+
+
+def test_corpus_generator_records(tmp_path):
+    import gzip
+    corpus = tmp_path / 'notes.jsonl.gz'
+    with gzip.open(corpus, 'wt') as fd:
+        fd.write('{"note": "n1", "body": "window"}\n')
+        fd.write('{"note": "n2", "body": "spacecraft"}\n')
+    documents = list(facet.helpers.corpus_generator(
+        [str(corpus), ('n3', 'Apollo')],
+        id_field='note',
+        text_field='body',
+    ))
+    assert documents == [('n1', 'window'), ('n2', 'spacecraft'),
+                         ('n3', 'Apollo')]
+
+
+def test_facet_span_pruning():
+    f = facet.Facet(tokenizer=facet.AlphaNumericTokenizer(window=4))
+    f.install('data/install/american-english', nrows=50000)
+    min_size, max_size = f.matcher.query_feature_bounds()
+    assert 1 <= min_size <= max_size
+    assert f.max_term_tokens is not None
+    corpus = 'beautiful window in Apollo spacecraft'
+    assert (
+        f.match(corpus, window='auto')
+        == f.match(corpus, window=f.max_term_tokens)
+    )
+    f.close()
+
+
+def test_simstring_legacy_feature_bounds():
+    db = facet.database.get_database('dict')
+    matcher = facet.Simstring(db=db)
+    matcher.insert('spacecraft')
+    # NOTE: Databases installed by older versions only store the max bound.
+    db.delete('__GLOBAL_MIN_FEATURES__')
+    max_features = db.get('__GLOBAL_MAX_FEATURES__')
+
+    matcher = facet.Simstring(db=db)
+    matcher.insert('cat')
+    assert db.get('__GLOBAL_MAX_FEATURES__') == max_features
+    assert matcher.global_min_features == 1
+    assert [s for s, _ in matcher.search('spacecraft')] == ['spacecraft']
+
+
+def test_facet_overlap():
+    f = facet.Facet(tokenizer=facet.AlphaNumericTokenizer(window=3))
+    for term in ('heart', 'disease', 'heart disease', 'lung cancer'):
+        f.matcher.insert(term)
+    corpus = 'heart disease and lung cancers'
+    matches = f.match(corpus, overlap='longest')['__text__']
+    assert [terms[0]['ngram'] for terms in matches] == [
+        'heart disease', 'lung cancers',
+    ]
+    assert len(f.match(corpus)['__text__']) > len(matches)
+    f.close()
+
+
+def test_metrics(tmp_path):
+    facet.metrics.reset()
+    facet.metrics.enable()
+    try:
+        f = facet.Facet()
+        f.install('data/install/american-english', nrows=5000)
+        f.match('beautiful window in Apollo spacecraft')
+        f.close()
+        output = tmp_path / 'metrics.json'
+        facet.metrics.dump(str(output))
+        # NOTE: Timed iterables are not consumed in advance.
+        items = facet.metrics.timed_iter('test.iter', iter(range(3)))
+        assert next(items) == 0 and list(items) == [1, 2]
+    finally:
+        facet.metrics.disable()
+    snapshot = facet.metrics.snapshot()
+    assert snapshot['counters']['install.records'] == 5000
+    assert snapshot['counters']['matcher.get_strings.calls'] > 0
+    assert snapshot['histograms']['matcher.search']['count'] > 0
+    assert snapshot['histograms']['facet.tokenize']['count'] > 0
+    assert snapshot['histograms']['test.iter']['count'] == 1
+    assert 'install.records_per_second' in snapshot['gauges']
+    assert output.exists()
+    facet.metrics.reset()
+
+
+def test_facet_profile(tmp_path):
+    output = tmp_path / '{scope}.pstats'
+    f = facet.FacetFactory({
+        'formatter': None,
+        'profile': {'class': 'cprofile', 'output': str(output)},
+    }).create()
+    f.install('data/install/american-english', nrows=5000)
+    f.match('beautiful window in Apollo spacecraft')
+    f.match('window', profile=facet.SamplingProfiler(
+        str(tmp_path / 'match.folded'),
+    ))
+    assert (tmp_path / 'install.pstats').exists()
+    assert (tmp_path / 'match.pstats').exists()
+    assert (tmp_path / 'match.folded').exists()
+    f.close()
+
+    f = facet.FacetFactory({
+        'class': 'parallel',
+        'config': {'formatter': None},
+        'num_procs': 1,
+        'profile': {'class': 'cprofile', 'output': str(output)},
+    }).create()
+    assert isinstance(f.profiler, facet.CProfileProfiler)
+    (tmp_path / 'match.pstats').unlink()
+    f.match('beautiful window')
+    assert (tmp_path / 'match.pstats').exists()
+    f.close()
+
+
+def write_umls(path):
+    conso = [
+        ('C0018787', 'heart'),
+        ('C0012634', 'disease'),
+        ('C0018799', 'heart disease'),
+    ]
+    with open(path / 'MRCONSO.RRF', 'w') as fd:
+        for i, (cui, term) in enumerate(conso):
+            fd.write(f'{cui}|ENG|P|L{i}|PF|S{i}|Y|A{i}||||MSH|PT|D{i}|{term}'
+                     '|0|N||\n')
+    with open(path / 'MRSTY.RRF', 'w') as fd:
+        fd.write('C0018787|T023|A1.2.3.1|Body Part|AT1|256|\n')
+        fd.write('C0012634|T047|B2.2.1.2.1|Disease or Syndrome|AT2|256|\n')
+        fd.write('C0018799|T047|B2.2.1.2.1|Disease or Syndrome|AT3|256|\n')
+
+
+def test_umls_facet(tmp_path):
+    write_umls(tmp_path)
+    # NOTE: Concepts keep their first CUI with accepted semantic types.
+    mrconso = tmp_path / 'MRCONSO.RRF'
+    mrconso.write_text(
+        'C9999999|ENG|P|L9|PF|S9|Y|A9||||MSH|PT|D9|heart|0|N||\n'
+        'C9999999|ENG|P|L9|PF|S9|Y|A9||||MSH|PT|D9|cardiac|0|N||\n'
+        + mrconso.read_text()
+    )
+    f = facet.UMLSFacet(
+        tokenizer=facet.AlphaNumericTokenizer(window=2),
+        conso_db='dict',
+        cuisty_db=facet.SQLiteDatabase(),
+        cui_cache_size=1,
+    )
+    f.install(str(tmp_path))
+    matches = f.match('heart disease', formatter=None)['__text__']
+    stys = {
+        match['candidate']: (match['CUI'], match['STY'])
+        for terms in matches
+        for match in terms
+    }
+    assert stys['heart disease'] == ('C0018799', ['T047'])
+    assert stys['heart'] == ('C0018787', ['T023'])
+    assert f.cuisty_db.mget(['C0012634', 'C0']) == [['T047'], None]
+    assert f.conso_db.get('cardiac') is None
+    f._preload_cuisty = True
+    assert f.match('heart disease', formatter=None)['__text__'] == matches
+    f.close()
+
+
+def test_umls_facet_joined(tmp_path):
+    write_umls(tmp_path)
+    f = facet.UMLSFacet(
+        tokenizer=facet.AlphaNumericTokenizer(window=2),
+        conso_db='dict',
+        cuisty_db=facet.SQLiteDatabase(),
+    )
+    f.install(str(tmp_path))
+    matches = f.match('heart disease', formatter=None)
+    f.close()
+
+    f = facet.UMLSFacet(
+        tokenizer=facet.AlphaNumericTokenizer(window=2),
+        conso_db='dict',
+    )
+    f.install(str(tmp_path), join_concepts=True)
+    assert f.conso_db.get('heart') == {'CUI': 'C0018787', 'STY': ['T023']}
+    assert f.match('heart disease', formatter=None) == matches
+    f.close()
+
+
+def test_iload_data_chunks(tmp_path):
+    write_umls(tmp_path)
+    headers = facet.facets.umls.HEADERS_MRCONSO
+    chunks = list(facet.helpers.iload_data_chunks(
+        str(tmp_path / 'MRCONSO.RRF'),
+        keys=['str'],
+        values=['cui'],
+        headers=headers,
+        valids={'cui': {'C0018787': 'heart', 'C0018799': 'heart disease'}},
+        invalids={'sab': ['SNOMEDCT_US']},
+        converters={'str': [str.upper]},
+        delimiter='|',
+        chunksize=2,
+    ))
+    assert [chunk[0].tolist() for chunk in chunks] == [
+        ['HEART'], ['HEART DISEASE'],
+    ]
+    assert facet.helpers.load_data(
+        str(tmp_path / 'MRCONSO.RRF'),
+        keys=['cui'],
+        values=['lat', 'str'],
+        headers=headers,
+        delimiter='|',
+    )['C0012634'] == ('ENG', 'disease')
+
+    chunks = [
+        (numpy.array(['a', 'b']), numpy.array([1, 2])),
+        (pyarrow.array(['c', None]), pyarrow.array([3, 4])),
+    ]
+    assert list(facet.helpers.iter_chunk_rows(chunks)) == [
+        ('a', 1), ('b', 2), ('c', 3), (None, 4),
+    ]
+    assert list(facet.helpers.iter_chunk_rows(chunks, num_keys=2)) == [
+        ('a', 1), ('b', 2), ('c', 3), (None, 4),
+    ]
+
+
+def test_load_data_parallel(tmp_path, monkeypatch):
+    filename = 'data/install/american-english'
+    ranges = facet.helpers.split_file(filename, 3)
+    assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(filename)
+    assert (
+        facet.helpers.load_data(filename, num_procs=3)
+        == facet.helpers.load_data(filename)
+    )
+    # NOTE: Files that cannot be split are loaded sequentially.
+    single_line = tmp_path / 'single_line.txt'
+    single_line.write_text('a|1\n')
+    options = {'values': [1], 'delimiter': '|', 'multiple_values': True}
+    with monkeypatch.context() as m:
+        m.setattr(facet.helpers.multiprocessing, 'Pool', None)
+        assert (
+            facet.helpers.load_data(str(single_line), num_procs=3, **options)
+            == facet.helpers.load_data(str(single_line), **options)
+        )
+
+    write_umls(tmp_path)
+    f = facet.UMLSFacet(conso_db='dict', cuisty_db='dict')
+    f.install(str(tmp_path), num_procs=2)
+    assert f.conso_db.get('heart disease') == 'C0018799'
+    assert f.cuisty_db.get('C0018787') == ['T023']
+    f.close()
+
+
+def test_external_groups(tmp_path):
+    filename = 'data/install/american-english'
+    pairs = [(word[:2], word) for word in facet.helpers.iload_data(
+        filename, nrows=2000)]
+    groups = facet.helpers.ExternalGroups(pairs, memory_budget=2**14)
+    assert groups.num_runs > 1
+    expected = {}
+    for key, value in pairs:
+        expected.setdefault(key, []).append(value)
+    assert dict(groups) == expected and dict(groups) == expected
+    groups.close()
+
+    write_umls(tmp_path)
+    f = facet.UMLSFacet(conso_db='dict', cuisty_db='dict')
+    f.install(str(tmp_path), memory_budget=100)
+    assert f.conso_db.get('heart disease') == 'C0018799'
+    assert f.cuisty_db.get('C0018787') == ['T023']
+    assert f.matcher.search('heart') == [('heart', 1.0)]
+    f.close()
+
+    f = facet.UMLSFacet(conso_db='dict', use_proxy_install=True)
+    with pytest.raises(FileNotFoundError):
+        f.install(str(tmp_path / 'missing'), memory_budget=100)
+    assert f._use_proxy_install
+    f.close()
+
+
+def test_facet_sentence_cache_spacy():
+    import asyncio
+    pytest.importorskip('spacy')
+    try:
+        tokenizer = facet.SpaCyTokenizer()
+    except OSError:
+        pytest.skip('spaCy model is not installed')
+    corpus = 'Apollo spacecraft window. Apollo spacecraft window.'
+    words = facet.Facet(tokenizer=tokenizer)
+    words.install('data/install/american-english', nrows=5000)
+    expected = words.match(corpus, formatter=None)
+    words.close()
+
+    f = facet.Facet(tokenizer=tokenizer, sentence_cache_size=8)
+    f.install('data/install/american-english', nrows=5000)
+    assert f.match(corpus, formatter=None) == expected
+    assert asyncio.run(f.amatch(corpus, formatter=None)) == expected
+    assert f.match(corpus, formatter=None, pipeline={'search': 2}) == \
+        expected
+    f.close()
+
+
+def test_facet_resume(tmp_path):
+    import json
+    filename = 'data/install/american-english'
+    checkpoint = str(tmp_path / 'install.checkpoint')
+    f = facet.Facet()
+    insert = f.matcher.insert
+    inserts = []
+
+    def failing_insert(term):
+        inserts.append(term)
+        if len(inserts) > 12000:
+            raise RuntimeError('install failed')
+        insert(term)
+
+    f.matcher.insert = failing_insert
+    try:
+        f.install(filename, nrows=15000, checkpoint=checkpoint)
+    except RuntimeError:
+        pass
+    with open(checkpoint) as fd:
+        assert json.load(fd)['stages'] == {'0:matcher': 10000}
+
+    inserts.clear()
+    f.install(filename, nrows=15000, resume=True, checkpoint=checkpoint)
+    assert len(inserts) == 5000
+    assert not os.path.exists(checkpoint)
+
+    g = facet.Facet()
+    g.install(filename, nrows=15000, resume=True)
+    assert dict(g.matcher.db.items()) == dict(f.matcher.db.items())
+    f.close()
+    g.close()
+
+
+def test_facet_arrow_install(tmp_path):
+    import pyarrow
+    import pyarrow.parquet
+    filename = 'data/install/american-english'
+    words = facet.helpers.load_data(filename, nrows=5000)
+    pyarrow.parquet.write_table(
+        pyarrow.table({'id': list(range(len(words))), 'term': words}),
+        str(tmp_path / 'words.parquet'),
+    )
+    with open(tmp_path / 'words.jsonl', 'w') as fd:
+        for word in words:
+            fd.write(f'{{"term": "{word}"}}\n')
+
+    def db_items(f):
+        items = dict(f.matcher.db.items())
+        del items[facet.facets.base.INDEX_VERSION_KEY]
+        return items
+
+    f = facet.Facet()
+    f.install(filename, nrows=5000)
+    for source in ('words.parquet', 'words.jsonl'):
+        g = facet.Facet()
+        g.install(str(tmp_path / source), cols='term', chunksize=1000)
+        assert db_items(g) == db_items(f)
+        g.close()
+    assert list(facet.helpers.iload_data(
+        str(tmp_path / 'words.parquet'),
+        keys=[1],
+        values=['id'],
+        valids={'id': [3, 5]},
+        filetype='parquet',
+    )) == [(words[3], 3), (words[5], 5)]
+    f.close()
+
+
+def test_facet_amatch():
+    import asyncio
+    db = facet.LatencyDictDatabase(latency=0)
+    f = facet.Facet(
+        matcher=facet.Simstring(db=db),
+        tokenizer=facet.AlphaNumericTokenizer(window=3),
+    )
+    f.install('data/install/american-english', nrows=5000)
+    db.latency = 0.002
+    corpus = 'beautiful window in Apollo spacecraft'
+    matches = f.match(corpus, formatter=None)
+    db.reset_in_flight()
+    assert asyncio.run(f.amatch(corpus, formatter=None)) == matches
+    assert db.max_in_flight > 1
+    assert (
+        asyncio.run(f.amatch(corpus, formatter=None, overlap='longest'))
+        == f.match(corpus, formatter=None, overlap='longest')
+    )
+    assert (
+        asyncio.run(f.matcher.asearch('window'))
+        == f.matcher.search('window')
+    )
+    f.close()
+
+
+def test_simstring_threads():
+    db = facet.LatencyDictDatabase(latency=0)
+    matcher = facet.Simstring(db=db, num_threads=8, max_pending=8)
+    f = facet.Facet(matcher=matcher)
+    f.install('data/install/american-english', nrows=5000)
+    db.latency = 0.002
+    db.reset_in_flight()
+    strings = matcher.search('windows', rank=False, executor=None)
+    assert db.max_in_flight == 1
+    db.reset_in_flight()
+    assert matcher.search('windows', rank=False) == strings
+    assert 1 < db.max_in_flight <= 8
+    f.close()
+
+
+def test_normalizer_offsets():
+    normalizer = facet.tokenizer.Normalizer((str.lower, str.lower))
+    assert normalizer.converters == (str.lower,)
+    assert normalizer.normalize('Apollo') == ('apollo', None)
+
+    f = facet.Facet(tokenizer=facet.AlphaNumericTokenizer(window=2))
+    for term in ('strasse', 'spacecraft', 'window'):
+        f.matcher.insert(term)
+    corpus = 'Straße … Spacecraft windows'
+    matches = f.match(corpus, formatter=None)['__text__']
+    assert {
+        terms[0]['ngram']: corpus[terms[0]['begin']:terms[0]['end'] + 1]
+        for terms in matches
+    } == {
+        'strasse': 'Straße',
+        'spacecraft': 'Spacecraft',
+        'windows': 'windows',
+    }
+    f.close()
+
+
+def test_facet_sentence_cache():
+    import asyncio
+    corpus = 'Apollo spacecraft windows\nApollo spacecraft windows'
+    f = facet.Facet()
+    f.install('data/install/american-english', nrows=5000)
+    expected = f.match(corpus, formatter=None)
+
+    db = facet.database.get_database('dict')
+    f = facet.Facet(
+        matcher=f.matcher,
+        sentence_cache_size=1,
+        sentence_cache_db=db,
+    )
+    assert f.match(corpus, formatter=None) == expected
+    info = f.sentence_cache_info()
+    assert (info['hits'], info['misses'], info['size']) == (1, 1, 1)
+
+    # Shared cache database
+    f2 = facet.Facet(matcher=f.matcher, sentence_cache_db=db)
+    assert asyncio.run(f2.amatch(corpus, formatter=None)) == expected
+    assert f2.sentence_cache_info()['misses'] == 0
+
+    assert f.match(corpus, formatter=None, alpha=0.99) != expected
+    f.clear_caches()
+    assert f.sentence_cache_info()['size'] == 0
+    f.close()
+
+
+def test_facet_memoize_searches():
+    import asyncio
+    corpus = 'Apollo window. Apollo windows.\nApollo window'
+    f = facet.Facet()
+    f.install('data/install/american-english', nrows=5000)
+    facet.metrics.reset()
+    facet.metrics.enable()
+    try:
+        expected = f.match(corpus, formatter=None, memoize_searches=False)
+        num_searches = facet.metrics.snapshot()['counters']['facet.searches']
+        facet.metrics.reset()
+        assert f.match(corpus, formatter=None) == expected
+        assert facet.metrics.snapshot()['counters']['facet.searches'] == 3
+        facet.metrics.reset()
+        assert asyncio.run(f.amatch(corpus, formatter=None)) == expected
+        assert facet.metrics.snapshot()['counters']['facet.searches'] == 3
+    finally:
+        facet.metrics.disable()
+        facet.metrics.reset()
+    assert num_searches == 6
+    f.close()
+
+
+def test_facet_manifest(tmp_path, monkeypatch):
+    corpora = []
+    for i, text in enumerate(('Apollo window', 'beautiful spacecraft')):
+        corpus = tmp_path / f'corpus{i}.txt'
+        corpus.write_text(text)
+        corpora.append(str(corpus))
+    manifest = str(tmp_path / 'matches.manifest')
+
+    f = facet.Facet()
+    f.install('data/install/american-english', nrows=5000)
+    expected = f.match(corpora, formatter=None)
+    facet.metrics.reset()
+    facet.metrics.enable()
+    try:
+        assert f.match(corpora, formatter=None, manifest=manifest) == expected
+        matches = f.match(corpora, formatter=None, manifest=manifest)
+        assert matches == expected
+        assert facet.metrics.snapshot()['counters'][
+            'facet.corpora_reused'] == 2
+        assert all(
+            isinstance(ngram_match, facet.MatchRecord)
+            for corpus_matches in matches.values()
+            for ngram_matches in corpus_matches
+            for ngram_match in ngram_matches
+        )
+
+        # Changed document is matched again
+        with open(corpora[0], 'a') as fd:
+            fd.write(' spacecraft')
+        expected = f.match(corpora, formatter=None)
+        facet.metrics.reset()
+        assert f.match(corpora, formatter=None, manifest=manifest) == expected
+        assert facet.metrics.snapshot()['counters'][
+            'facet.corpora_reused'] == 1
+
+        # Texts are recorded separately
+        texts = ['Apollo window', 'beautiful spacecraft']
+        text_manifest = str(tmp_path / 'texts.manifest')
+        expected_texts = f.match(texts, formatter=None)
+        assert f.match(texts, formatter=None, manifest=text_manifest) == \
+            expected_texts
+        facet.metrics.reset()
+        assert f.match(texts, formatter=None, manifest=text_manifest) == \
+            expected_texts
+        assert facet.metrics.snapshot()['counters'][
+            'facet.corpora_reused'] == 2
+
+        # Manifest is invalidated by different match options
+        facet.metrics.reset()
+        f.match(corpora, formatter=None, manifest=manifest, alpha=0.9)
+        assert facet.metrics.snapshot()['counters'][
+            'facet.corpora_reused'] == 0
+    finally:
+        facet.metrics.disable()
+        facet.metrics.reset()
+
+    # Changed text document is hashed once
+    text_manifest = facet.facets.MatchManifest(str(tmp_path / 'text.manifest'))
+    text_manifest.update('doc', [], text='Apollo window')
+    hashes = []
+    _hash = facet.facets.MatchManifest._hash
+
+    def counting_hash(**kwargs):
+        hashes.append(kwargs)
+        return _hash(**kwargs)
+
+    monkeypatch.setattr(
+        facet.facets.MatchManifest, '_hash', staticmethod(counting_hash))
+    assert text_manifest.lookup('doc', text='Apollo') is None
+    text_manifest.update('doc', [], text='Apollo')
+    assert len(hashes) == 1
+    assert text_manifest.lookup('doc', text='Apollo') == []
+    f.close()
+
+
+def test_federated_facet():
+    import asyncio
+    corpus = 'Apollo spacecraft windows.\nBeautiful Apollo spacecraft'
+    words = facet.Facet()
+    terms = facet.Facet(matcher=facet.Simstring(alpha=0.5))
+    for term in ('spacecraft', 'apollo program'):
+        terms.matcher.insert(term)
+
+    f = facet.FederatedFacet(facets={'words': words, 'terms': terms})
+    f.install('data/install/american-english', dictionary='words',
+              nrows=5000)
+    assert words.index_version is not None
+    with pytest.raises(ValueError, match='invalid dictionary'):
+        f.install('data/install/american-english', dictionary='other')
+    matches = f.match(corpus, formatter=None)['__text__']
+    for name, dictionary in f.facets.items():
+        assert [
+            [
+                {k: v for k, v in term.items() if k != 'dictionary'}
+                for term in ngram_matches
+            ]
+            for ngram_matches in matches
+            if ngram_matches[0]['dictionary'] == name
+        ] == dictionary.match(corpus, formatter=None)['__text__']
+    assert asyncio.run(f.amatch(corpus, formatter=None))['__text__'] == matches
+    f.close()
+
+
+def test_facet_pipeline():
+    corpus = [
+        (f'doc{i}', f'Apollo spacecraft {i}.\nBeautiful windows of Apollo')
+        for i in range(20)
+    ]
+    f = facet.Facet(sentence_cache_size=8)
+    f.install('data/install/american-english', nrows=5000)
+    for overlap in (None, 'longest'):
+        expected = f.match(corpus, formatter=None, overlap=overlap)
+        assert f.match(
+            corpus,
+            formatter=None,
+            overlap=overlap,
+            pipeline={'search': 4, 'lookup': 2, 'queue_size': 4},
+        ) == expected
+
+    pipeline = facet.pipeline.Pipeline([('inverse', lambda x: 1 / x, 2)])
+    assert list(pipeline.run([1, 2, 4])) == [1, 0.5, 0.25]
+    assert pipeline.stats['inverse']['items'] == 3
+    with pytest.raises(ZeroDivisionError):
+        list(pipeline.run([1, 0, 2]))
+    f.close()
+
+
+def test_match_records(tmp_path):
+    f = facet.FacetFactory({'formatter': None}).create()
+    f.install('data/install/american-english', nrows=50000)
+    corpora = ['beautiful window\nin Apollo spacecraft', 'Apollo']
+    matches = f.match(corpora)
+    record = matches['__text__'][0][0]
+    assert isinstance(record, facet.MatchRecord)
+    assert record == record.to_dict() and not hasattr(record, '__dict__')
+    record['CUI'] = 'C0000000'
+    assert record.replace(begin=1) == {**record.to_dict(), 'begin': 1}
+
+    csv_matches = facet.CSVFormatter()(matches)
+    assert 'source' not in record and 'CUI' in csv_matches.splitlines()[0]
+    assert f'"{record["ngram"]}"' in f.match(corpora, formatter='json')
+
+    table = facet.ColumnarFormatter()(matches)
+    num_matches = sum(len(m) for ms in matches.values() for m in ms)
+    assert len(table) == num_matches == len(table['candidate'])
+    assert table.to_dicts() == dict(matches)
+    output = tmp_path / 'matches.parquet'
+    f.match(corpora, formatter='columnar', output=str(output))
+    assert output.stat().st_size > 0
+    f.close()
+
+
+def test_umls_facet_partitions(tmp_path):
+    write_umls(tmp_path)
+    with open(tmp_path / 'MRCONSO.RRF', 'a') as fd:
+        fd.write('C0018787|ENG|P|L3|PF|S3|Y|A3||||SNOMEDCT_US|PT|D3|heart'
+                 '|0|N||\n')
+    f = facet.UMLSFacet(
+        tokenizer=facet.AlphaNumericTokenizer(window=2),
+        conso_db='dict',
+        cuisty_db='dict',
+    )
+    f.install(str(tmp_path), partition_by=['sty', 'sab'])
+    assert f.partitions == {'sty': ['T023', 'T047'],
+                            'sab': ['MSH', 'SNOMEDCT_US']}
+
+    def candidates(**kwargs):
+        return {
+            match['candidate']
+            for terms in f.match('heart disease', formatter=None, **kwargs)
+            .get('__text__', [])
+            for match in terms
+        }
+
+    assert candidates() == {'heart', 'disease', 'heart disease'}
+    assert candidates(sty='T047') == {'disease', 'heart disease'}
+    assert candidates(sty=['T023', 'T047']) == candidates()
+    assert candidates(sab='SNOMEDCT_US') == {'heart'}
+    assert candidates(sty='T047', sab=['SNOMEDCT_US']) == set()
+    assert candidates(sty='T000') == set()
+    assert candidates(sty='T047', pipeline={'search': 2}) == \
+        candidates(sty='T047')
+    f.close()
+
+    f = facet.UMLSFacet(conso_db='dict')
+    f.install(str(tmp_path), partition_by='sty')
+    with pytest.raises(ValueError, match='not partitioned'):
+        f.match('heart', sab='MSH')
+    f.close()
+
+    # Partitions do not filter concepts of the index
+    with open(tmp_path / 'MRCONSO.RRF', 'a') as fd:
+        fd.write('C9999999|ENG|P|L9|PF|S9|Y|A9||||MSH|PT|D9|cardiac'
+                 '|0|N||\n')
+    matches = []
+    for partition_by in (None, 'sty'):
+        f = facet.UMLSFacet(conso_db='dict')
+        f.install(str(tmp_path), partition_by=partition_by)
+        matches.append(f.match('cardiac heart', formatter=None))
+        f.close()
+    assert matches[0] == matches[1]
+    assert any(
+        match['candidate'] == 'cardiac'
+        for terms in matches[1]['__text__']
+        for match in terms
+    )